@@ -0,0 +1,357 @@
+"""Synthetic audio dataset generator for benchmarks.
+
+Creates a reproducible folder tree of audio files covering the cases that
+stress different parts of `sndls`:
+
+- `tiny`: many very short clips (per-file overhead).
+- `long`: a few very long multichannel files (decoding and statistics).
+- `mixed`: the same material written in different formats and subtypes.
+- `deep`: files spread across a deeply nested folder structure (discovery).
+- `corrupt`: truncated and garbage files (error handling).
+
+Example:
+
+    python benchmarks/generate_dataset.py /tmp/sndls-bench --scale 1.0
+"""
+import os
+import json
+import argparse
+import numpy as np
+import soundfile as sf
+from typing import (
+    List,
+    Tuple
+)
+
+# Format, subtype and extension of the files of the `mixed` profile
+_MIXED_FORMATS = (
+    ("WAV", "PCM_16", ".wav"),
+    ("WAV", "PCM_24", ".wav"),
+    ("WAV", "FLOAT", ".wav"),
+    ("AIFF", "PCM_16", ".aiff"),
+    ("FLAC", "PCM_16", ".flac"),
+    ("OGG", "VORBIS", ".ogg"),
+    ("MP3", "MPEG_LAYER_III", ".mp3")
+)
+
+
+def _synth(
+        rng: np.random.Generator,
+        num_samples: int,
+        num_channels: int,
+        fs: int
+) -> np.ndarray:
+    """Synthesizes a noisy multi-tone signal with occasional clipped and
+    silent files, so that every statistic has something to detect.
+
+    Args:
+        rng (np.random.Generator): Random number generator.
+        num_samples (int): Number of samples per channel.
+        num_channels (int): Number of channels.
+        fs (int): Sample rate.
+
+    Returns:
+        np.ndarray: Audio data in (num_samples, num_channels) format.
+    """
+    t = np.arange(num_samples, dtype=np.float32) / fs
+    x = np.empty((num_samples, num_channels), dtype=np.float32)
+
+    for ch in range(num_channels):
+        freq = rng.uniform(50.0, fs / 4.0)
+        x[:, ch] = 0.3 * np.sin(2.0 * np.pi * freq * t)
+        x[:, ch] += 0.05 * rng.standard_normal(num_samples, dtype=np.float32)
+
+    kind = rng.uniform()
+
+    if kind < 0.05:
+        x *= 4.0  # Clipped
+
+    elif kind < 0.10:
+        x *= 1e-6  # Silent
+
+    return x
+
+
+def _write(
+        file: str,
+        x: np.ndarray,
+        fs: int,
+        fmt: str = "WAV",
+        subtype: str = "PCM_16"
+) -> bool:
+    """Writes an audio file, creating its parent folder if needed.
+
+    Args:
+        file (str): Output file.
+        x (np.ndarray): Audio data in (num_samples, num_channels) format.
+        fs (int): Sample rate.
+        fmt (str): File format.
+        subtype (str): File subtype.
+
+    Returns:
+        bool: `False` if the format is not supported by the installed
+            `libsndfile`, `True` otherwise.
+    """
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+
+    if not sf.check_format(fmt, subtype):
+        return False
+
+    sf.write(file, x, fs, format=fmt, subtype=subtype)
+    return True
+
+
+def generate_tiny(
+        root: str,
+        rng: np.random.Generator,
+        scale: float
+) -> List[str]:
+    """Generates many very short mono clips.
+
+    Args:
+        root (str): Output folder.
+        rng (np.random.Generator): Random number generator.
+        scale (float): Multiplier applied to the size of the profile.
+
+    Returns:
+        List[str]: Generated files.
+    """
+    files = []
+
+    for idx in range(int(2000 * scale)):
+        fs = 16000
+        file = os.path.join(
+            root, "tiny", f"{idx // 500:03d}", f"{idx:06d}.wav"
+        )
+        _write(file, _synth(rng, int(fs * rng.uniform(0.1, 1.0)), 1, fs), fs)
+        files.append(file)
+
+    return files
+
+
+def generate_long(
+        root: str,
+        rng: np.random.Generator,
+        scale: float
+) -> List[str]:
+    """Generates a few very long multichannel files.
+
+    Args:
+        root (str): Output folder.
+        rng (np.random.Generator): Random number generator.
+        scale (float): Multiplier applied to the size of the profile.
+
+    Returns:
+        List[str]: Generated files.
+    """
+    files = []
+
+    for idx, (num_channels, fs) in enumerate(((2, 48000), (8, 48000))):
+        file = os.path.join(root, "long", f"{idx:03d}.wav")
+        num_samples = int(fs * 600 * scale)
+
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+
+        # Write in blocks to keep memory usage bounded
+        with sf.SoundFile(
+            file,
+            mode="w",
+            samplerate=fs,
+            channels=num_channels,
+            subtype="PCM_24"
+        ) as f:
+            for start in range(0, num_samples, fs * 10):
+                f.write(
+                    _synth(
+                        rng,
+                        min(fs * 10, num_samples - start),
+                        num_channels,
+                        fs
+                    )
+                )
+
+        files.append(file)
+
+    return files
+
+
+def generate_mixed(
+        root: str,
+        rng: np.random.Generator,
+        scale: float
+) -> List[str]:
+    """Generates the same kind of material in different formats.
+
+    Args:
+        root (str): Output folder.
+        rng (np.random.Generator): Random number generator.
+        scale (float): Multiplier applied to the size of the profile.
+
+    Returns:
+        List[str]: Generated files.
+    """
+    files = []
+
+    for idx in range(int(200 * scale)):
+        fmt, subtype, ext = _MIXED_FORMATS[idx % len(_MIXED_FORMATS)]
+        fs = (16000, 22050, 44100, 48000)[idx % 4]
+        file = os.path.join(root, "mixed", f"{idx:05d}{ext}")
+        x = _synth(rng, int(fs * rng.uniform(1.0, 10.0)), 1 + idx % 2, fs)
+
+        if _write(file, np.clip(x, -1.0, 1.0), fs, fmt=fmt, subtype=subtype):
+            files.append(file)
+
+    return files
+
+
+def generate_deep(
+        root: str,
+        rng: np.random.Generator,
+        scale: float
+) -> List[str]:
+    """Generates short files spread across a deeply nested tree.
+
+    Args:
+        root (str): Output folder.
+        rng (np.random.Generator): Random number generator.
+        scale (float): Multiplier applied to the size of the profile.
+
+    Returns:
+        List[str]: Generated files.
+    """
+    files = []
+
+    for idx in range(int(500 * scale)):
+        fs = 16000
+        depth = 1 + idx % 12
+        dirs = [f"d{(idx >> level) % 4}" for level in range(depth)]
+        file = os.path.join(root, "deep", *dirs, f"{idx:05d}.wav")
+        _write(file, _synth(rng, int(fs * rng.uniform(0.5, 2.0)), 1, fs), fs)
+        files.append(file)
+
+    return files
+
+
+def generate_corrupt(
+        root: str,
+        rng: np.random.Generator,
+        scale: float
+) -> List[str]:
+    """Generates truncated, empty and garbage audio files.
+
+    Args:
+        root (str): Output folder.
+        rng (np.random.Generator): Random number generator.
+        scale (float): Multiplier applied to the size of the profile.
+
+    Returns:
+        List[str]: Generated files.
+    """
+    files = []
+
+    for idx in range(max(1, int(50 * scale))):
+        fs = 16000
+        file = os.path.join(root, "corrupt", f"{idx:04d}.wav")
+        kind = idx % 3
+
+        if kind == 0:
+            # Valid header, truncated data
+            _write(file, _synth(rng, fs, 1, fs), fs)
+
+            with open(file, "r+b") as f:
+                f.truncate(os.path.getsize(file) // 3)
+
+        elif kind == 1:
+            # Random bytes
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+
+            with open(file, "wb") as f:
+                f.write(rng.bytes(4096))
+
+        else:
+            # Empty file
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            open(file, "wb").close()
+
+        files.append(file)
+
+    return files
+
+
+PROFILES = {
+    "tiny": generate_tiny,
+    "long": generate_long,
+    "mixed": generate_mixed,
+    "deep": generate_deep,
+    "corrupt": generate_corrupt
+}
+
+
+def generate_dataset(
+        root: str,
+        profiles: Tuple[str] = tuple(PROFILES),
+        scale: float = 1.0,
+        seed: int = 1234
+) -> dict:
+    """Generates a synthetic dataset and writes a `manifest.json` file
+    describing it in `root`.
+
+    Args:
+        root (str): Output folder.
+        profiles (Tuple[str]): Profiles to generate.
+        scale (float): Multiplier applied to the number of files and
+            duration of long files of every profile.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Manifest with the files of each profile.
+    """
+    rng = np.random.default_rng(seed)
+    manifest = {"seed": seed, "scale": scale, "profiles": {}}
+
+    for profile in profiles:
+        manifest["profiles"][profile] = PROFILES[profile](root, rng, scale)
+
+    with open(os.path.join(root, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=str, help="output folder")
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=list(PROFILES),
+        default=list(PROFILES),
+        help="dataset profiles to generate"
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplier applied to the size of every profile"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1234,
+        help="random seed"
+    )
+    args = parser.parse_args()
+
+    manifest = generate_dataset(
+        args.output,
+        profiles=tuple(args.profiles),
+        scale=args.scale,
+        seed=args.seed
+    )
+
+    for profile, files in manifest["profiles"].items():
+        print(f"{profile}: {len(files)} file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Import time regression benchmark.
+
+Measures how long it takes to start `sndls` in a fresh interpreter and
+checks that heavy dependencies are only imported by the code paths that need
+them. Exits with a non-zero code if any check fails, so it can be used in CI:
+
+    python benchmarks/import_time.py --max-version-ms 150
+"""
+import sys
+import argparse
+import subprocess
+from time import perf_counter
+from typing import List
+
+# Modules that must not be imported by a given statement
+_LAZY_MODULES = {
+    "import sndls.cli.main": (
+        "numpy",
+        "polars",
+        "scipy",
+        "soundfile",
+        "tqdm"
+    ),
+    "import sndls.cli.cmd": (
+        "polars",
+        "scipy"
+    )
+}
+
+
+def _run(code: str) -> str:
+    """Runs python code in a fresh interpreter.
+
+    Args:
+        code (str): Code to run.
+
+    Returns:
+        str: Standard output of the interpreter.
+    """
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+
+
+def _time_cmd(cmd: List[str], repeats: int) -> float:
+    """Returns the best wall time of a command over several runs.
+
+    Args:
+        cmd (List[str]): Command to run.
+        repeats (int): Number of runs.
+
+    Returns:
+        float: Best wall time in seconds.
+    """
+    best_time = float("inf")
+
+    for _ in range(repeats):
+        start_time = perf_counter()
+        subprocess.run(cmd, check=True, capture_output=True)
+        best_time = min(best_time, perf_counter() - start_time)
+
+    return best_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="number of runs per measurement (the best one is reported)"
+    )
+    parser.add_argument(
+        "--max-version-ms",
+        type=float,
+        help="fail if `sndls --version` takes longer than this"
+    )
+    parser.add_argument(
+        "--max-import-ms",
+        type=float,
+        help="fail if `import sndls.cli.cmd` takes longer than this"
+    )
+    args = parser.parse_args()
+    failed = False
+
+    # Check heavy modules are imported lazily
+    for statement, modules in _LAZY_MODULES.items():
+        imported = _run(
+            f"import sys; {statement}; "
+            f"print(' '.join(m for m in {modules!r} if m in sys.modules))"
+        ).split()
+
+        if len(imported) > 0:
+            print(f"FAIL '{statement}' imports: {', '.join(imported)}")
+            failed = True
+
+        else:
+            print(f"OK   '{statement}' imports none of: {', '.join(modules)}")
+
+    # Measure start-up times
+    baseline_time = _time_cmd([sys.executable, "-c", "pass"], args.repeats)
+    timings = {
+        "version": _time_cmd(
+            [
+                sys.executable,
+                "-c",
+                "import sys; sys.argv = ['sndls', '--version']; "
+                "from sndls.cli.main import main; main()"
+            ],
+            args.repeats
+        ),
+        "import": _time_cmd(
+            [sys.executable, "-c", "import sndls.cli.cmd"],
+            args.repeats
+        )
+    }
+    limits = {"version": args.max_version_ms, "import": args.max_import_ms}
+
+    print(f"     interpreter start-up: {baseline_time * 1e3:.1f} ms")
+
+    for name, timing in timings.items():
+        # NOTE: Interpreter start-up time is not attributable to sndls
+        timing_ms = (timing - baseline_time) * 1e3
+        status = "OK  "
+
+        if limits[name] is not None and timing_ms > limits[name]:
+            status = "FAIL"
+            failed = True
+
+        print(f"{status} {name}: {timing_ms:.1f} ms")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+"""Stage-by-stage benchmark suite.
+
+Times every stage of the `sndls` pipeline separately on a dataset created
+with `benchmarks/generate_dataset.py`, and reports the throughput of each
+stage in files/s, MB/s and hours of audio per second. Results can be stored
+as a named baseline and compared against later runs:
+
+    python benchmarks/generate_dataset.py /tmp/sndls-bench
+    python benchmarks/run.py /tmp/sndls-bench --save-baseline main
+    python benchmarks/run.py /tmp/sndls-bench --compare main
+
+Baselines are stored in `benchmarks/baselines` and are not committed, since
+timings are only comparable on the machine they were recorded on.
+"""
+import os
+import io
+import sys
+import json
+import shutil
+import argparse
+import platform
+import tempfile
+from contextlib import redirect_stdout
+from time import perf_counter
+from typing import (
+    Callable,
+    List,
+    Tuple
+)
+from sndls import __version__
+from sndls.cli.main import get_parser
+from sndls.analysis import (
+    get_output_cols,
+    matches_filter,
+    preload_file
+)
+from sndls.cli.cmd import (
+    _perform_post_action,
+    _write_csv_row
+)
+from sndls.utils.audio import (
+    is_anomalous,
+    is_clipped,
+    is_silent,
+    peak_db,
+    rms_db,
+    spectral_rolloff
+)
+from sndls.utils.hash import generate_sha256_from_file
+from sndls.utils.spectral import SpectralRolloffBatch
+from sndls.utils.store import ResultStore
+from sndls.utils.io import (
+    get_dir_files,
+    read_audio,
+    read_audio_metadata
+)
+
+_BASELINES_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+_EXTENSIONS = [".aif", ".aiff", ".flac", ".mp3", ".ogg", ".wav"]
+
+# A stage receives the benchmark context and returns the number of files,
+# bytes and seconds of audio it processed
+Stage = Callable[[dict], Tuple[int, int, float]]
+
+
+def _valid_files(ctx: dict) -> List[dict]:
+    """Returns the metadata of all files that can be parsed.
+
+    Args:
+        ctx (dict): Benchmark context.
+
+    Returns:
+        List[dict]: Metadata of every valid file.
+    """
+    if "valid" not in ctx:
+        ctx["valid"] = []
+
+        for file in ctx["files"]:
+            try:
+                meta = read_audio_metadata(file)
+
+            except Exception:
+                continue
+
+            meta["file"] = file
+            meta["filename"] = os.path.basename(file)
+            meta["size_bytes"] = os.path.getsize(file)
+            ctx["valid"].append(meta)
+
+    return ctx["valid"]
+
+
+def _totals(files: List[dict]) -> Tuple[int, int, float]:
+    """Returns the number of files, bytes and seconds of audio of a set of
+    files.
+
+    Args:
+        files (List[dict]): Files metadata.
+
+    Returns:
+        Tuple[int, int, float]: Number of files, bytes and seconds of audio.
+    """
+    return (
+        len(files),
+        sum(f["size_bytes"] for f in files),
+        sum(f["duration_seconds"] for f in files)
+    )
+
+
+def stage_get_dir_files(ctx: dict) -> Tuple[int, int, float]:
+    """Discovers all audio files of the dataset."""
+    files = get_dir_files(ctx["root"], ext=_EXTENSIONS, recursive=True)
+    return len(files), 0, 0.0
+
+
+def stage_read_audio_metadata(ctx: dict) -> Tuple[int, int, float]:
+    """Reads the metadata of every file."""
+    num_files = 0
+
+    for file in ctx["files"]:
+        try:
+            read_audio_metadata(file)
+            num_files += 1
+
+        except Exception:
+            pass
+
+    return num_files, 0, 0.0
+
+
+def stage_read_audio_and_stats(ctx: dict) -> Tuple[int, int, float]:
+    """Decodes every valid file and computes its statistics."""
+    files = _valid_files(ctx)
+
+    for f in files:
+        x, fs = read_audio(f["file"], dtype="float32")
+        peak_db(x)
+        rms_db(x)
+        is_clipped(x)
+        is_anomalous(x)
+        is_silent(x, frame_size=int(0.05 * fs), hop_size=0.5)
+
+    return _totals(files)
+
+
+def stage_spectral_rolloff(ctx: dict) -> Tuple[int, int, float]:
+    """Decodes every valid file and computes its spectral rolloff."""
+    files = _valid_files(ctx)
+
+    for f in files:
+        x, fs = read_audio(f["file"], dtype="float32")
+        spectral_rolloff(x, fs, 2048, 512, rolloff=0.9)
+
+    return _totals(files)
+
+
+def stage_spectral_rolloff_batch(ctx: dict) -> Tuple[int, int, float]:
+    """Decodes every valid file and computes its spectral rolloff in
+    batches of frames of many files."""
+    files = _valid_files(ctx)
+    batch = SpectralRolloffBatch(2048, 512, rolloff=0.9)
+
+    for f in files:
+        x, fs = read_audio(f["file"], dtype="float32")
+        batch.add(x, fs, lambda r: None)
+
+    batch.flush()
+
+    return _totals(files)
+
+
+def stage_sha256(ctx: dict) -> Tuple[int, int, float]:
+    """Computes the SHA-256 hash of every valid file."""
+    files = _valid_files(ctx)
+
+    for f in files:
+        generate_sha256_from_file(f["file"])
+
+    return _totals(files)
+
+
+def stage_filter(ctx: dict) -> Tuple[int, int, float]:
+    """Evaluates a --filter expression for every valid file."""
+    files = _valid_files(ctx)
+
+    for f in files:
+        matches_filter(f, None, "duration_seconds > 1.0")
+
+    return _totals(files)
+
+
+def stage_filter_preload(ctx: dict) -> Tuple[int, int, float]:
+    """Evaluates a --filter expression using --preload for every valid
+    file."""
+    files = _valid_files(ctx)
+    preload_csv = os.path.join(ctx["tmp_dir"], "preload.csv")
+
+    with open(preload_csv, "w") as f:
+        f.write("\n".join(os.path.basename(f["file"]) for f in files))
+
+    preload = preload_file(preload_csv)
+
+    for f in files:
+        matches_filter(
+            f,
+            preload,
+            "(preload[preload.columns[0]] == filename).any()"
+        )
+
+    return _totals(files)
+
+
+def stage_csv(ctx: dict) -> Tuple[int, int, float]:
+    """Writes a --csv row for every valid file."""
+    files = _valid_files(ctx)
+    args = get_parser().parse_args([ctx["root"], "--meta"])
+    cols = get_output_cols(args)
+    csv_file = os.path.join(ctx["tmp_dir"], "output.csv")
+
+    with open(csv_file, "w") as f:
+        f.write(",".join(cols) + "\n")
+
+    for f in files:
+        _write_csv_row(csv_file, cols, f)
+
+    return _totals(files)
+
+
+def _post_action_output(ctx: dict, post_action: str) -> str:
+    """Returns the output folder of a post action stage.
+
+    Args:
+        ctx (dict): Benchmark context.
+        post_action (str): Post action.
+
+    Returns:
+        str: Output folder.
+    """
+    return os.path.join(ctx["tmp_dir"], f"post_action_{post_action}")
+
+
+def _post_action_stage(post_action: str) -> Stage:
+    """Returns a stage running a post action over all valid files.
+
+    Args:
+        post_action (str): Post action to run.
+
+    Returns:
+        Stage: Benchmark stage.
+    """
+    def _stage(ctx: dict) -> Tuple[int, int, float]:
+        files = ctx["post_action_files"]
+        args = get_parser().parse_args(
+            [
+                ctx["root"],
+                "--recursive",
+                "--unattended",
+                "--post-action", post_action,
+                "--post-action-output", _post_action_output(ctx, post_action),
+                "--post-action-workers", str(ctx["workers"])
+            ]
+        )
+
+        with redirect_stdout(io.StringIO()):
+            _perform_post_action(ctx["post_action_store"], args)
+
+        return _totals(files)
+
+    return _stage
+
+
+def _post_action_setup(post_action: str) -> Callable[[dict], None]:
+    """Returns a function preparing a post action stage. It removes the
+    output of previous runs and, for destructive post actions (`mv` and
+    `rm`), creates hard links to all valid files so that the dataset itself
+    is not modified.
+
+    Args:
+        post_action (str): Post action.
+
+    Returns:
+        Callable[[dict], None]: Setup function.
+    """
+    def _setup(ctx: dict) -> None:
+        shutil.rmtree(
+            _post_action_output(ctx, post_action),
+            ignore_errors=True
+        )
+        ctx["post_action_files"] = [dict(f) for f in _valid_files(ctx)]
+
+        if post_action not in ("mv", "rm"):
+            return
+
+        links_dir = os.path.join(ctx["tmp_dir"], "links")
+        shutil.rmtree(links_dir, ignore_errors=True)
+        os.makedirs(links_dir)
+
+        for idx, f in enumerate(ctx["post_action_files"]):
+            link = os.path.join(links_dir, f"{idx}_{f['filename']}")
+            os.link(f["file"], link)
+            f["file"] = link
+
+    def _setup_store(ctx: dict) -> None:
+        _setup(ctx)
+        ctx["post_action_store"] = ResultStore(
+            get_output_cols(get_parser().parse_args([ctx["root"]]))
+        )
+
+        for f in ctx["post_action_files"]:
+            ctx["post_action_store"].append(f)
+
+    return _setup_store
+
+
+STAGES = {
+    "get_dir_files": stage_get_dir_files,
+    "read_audio_metadata": stage_read_audio_metadata,
+    "read_audio+stats": stage_read_audio_and_stats,
+    "spectral_rolloff": stage_spectral_rolloff,
+    "spectral_rolloff_batch": stage_spectral_rolloff_batch,
+    "sha256": stage_sha256,
+    "filter": stage_filter,
+    "filter+preload": stage_filter_preload,
+    "csv": stage_csv,
+    "post_action_cp": _post_action_stage("cp"),
+    "post_action_ln": _post_action_stage("ln"),
+    "post_action_mv": _post_action_stage("mv"),
+    "post_action_rm": _post_action_stage("rm")
+}
+
+# Untimed functions called before every run of a stage
+SETUPS = {
+    name: _post_action_setup(name.replace("post_action_", ""))
+    for name in STAGES
+    if name.startswith("post_action_")
+}
+
+
+def run_stage(name: str, ctx: dict, repeats: int) -> dict:
+    """Runs a stage several times and returns its best timing.
+
+    Args:
+        name (str): Stage to run.
+        ctx (dict): Benchmark context.
+        repeats (int): Number of runs.
+
+    Returns:
+        dict: Best elapsed time and the corresponding throughput.
+    """
+    stage = STAGES[name]
+    best_time = float("inf")
+
+    for _ in range(repeats):
+        if name in SETUPS:
+            SETUPS[name](ctx)
+
+        start_time = perf_counter()
+        num_files, num_bytes, num_seconds = stage(ctx)
+        best_time = min(best_time, perf_counter() - start_time)
+
+    elapsed_time = max(best_time, 1e-9)
+
+    return {
+        "seconds": best_time,
+        "files": num_files,
+        "files_per_s": num_files / elapsed_time,
+        "mb_per_s": num_bytes / 1024 ** 2 / elapsed_time,
+        "audio_hours_per_s": num_seconds / 3600.0 / elapsed_time
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> bool:
+    """Prints the relative change of every stage with respect to a baseline.
+
+    Args:
+        results (dict): Current results.
+        baseline (dict): Baseline results.
+        max_regression (float): Maximum allowed slowdown as a fraction of
+            the baseline time (e.g. 0.2 for 20 percent).
+
+    Returns:
+        bool: `True` if no stage regressed more than `max_regression`.
+    """
+    ok = True
+
+    for name, result in results.items():
+        if name not in baseline["results"]:
+            continue
+
+        baseline_time = baseline["results"][name]["seconds"]
+        change = result["seconds"] / max(baseline_time, 1e-9) - 1.0
+        status = "OK  "
+
+        if change > max_regression:
+            status = "FAIL"
+            ok = False
+
+        print(
+            f"{status} {name:<22} {baseline_time * 1e3:>10.1f} ms -> "
+            f"{result['seconds'] * 1e3:>10.1f} ms ({change:+.1%})"
+        )
+
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "root",
+        type=str,
+        help="dataset folder created with generate_dataset.py"
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=list(STAGES),
+        default=list(STAGES),
+        help="stages to run"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="number of runs per stage (the best one is reported)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="--post-action-workers used by post action stages"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=str,
+        help="store results as a baseline with this name"
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        help="compare results against the baseline with this name"
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="maximum slowdown allowed by --compare as a fraction of the "
+             "baseline time"
+    )
+    args = parser.parse_args()
+    baseline = None
+
+    # NOTE: Baselines depend on the machine they were recorded on, so none
+    # are committed. A missing one is reported before running any stage
+    if args.compare is not None:
+        baseline_file = os.path.join(_BASELINES_DIR, f"{args.compare}.json")
+
+        if not os.path.isfile(baseline_file):
+            parser.error(
+                f"baseline '{args.compare}' not found in '{_BASELINES_DIR}'. "
+                f"Record it first with --save-baseline {args.compare}"
+            )
+
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory(
+        dir=os.path.dirname(os.path.abspath(args.root))
+    ) as tmp_dir:
+        # NOTE: The temporary folder is in the same filesystem as the
+        # dataset, so that link post actions do not fall back to copies
+        ctx = {
+            "root": args.root,
+            "tmp_dir": tmp_dir,
+            "workers": args.workers,
+            "files": get_dir_files(
+                args.root,
+                ext=_EXTENSIONS,
+                recursive=True
+            )
+        }
+        results = {}
+
+        print(
+            f"{'stage':<22} {'time':>10} {'files/s':>10} {'MB/s':>10} "
+            f"{'audio h/s':>10}"
+        )
+
+        for name in args.stages:
+            results[name] = run_stage(name, ctx, args.repeats)
+            print(
+                f"{name:<22} {results[name]['seconds'] * 1e3:>8.1f}ms "
+                f"{results[name]['files_per_s']:>10.1f} "
+                f"{results[name]['mb_per_s']:>10.1f} "
+                f"{results[name]['audio_hours_per_s']:>10.2f}"
+            )
+
+    ok = True
+
+    if baseline is not None:
+        print(f"\nComparison against baseline '{args.compare}':")
+        ok = compare(results, baseline, args.max_regression)
+
+    if args.save_baseline is not None:
+        os.makedirs(_BASELINES_DIR, exist_ok=True)
+        baseline_file = os.path.join(
+            _BASELINES_DIR,
+            f"{args.save_baseline}.json"
+        )
+
+        with open(baseline_file, "w") as f:
+            json.dump(
+                {
+                    "sndls_version": __version__,
+                    "python_version": platform.python_version(),
+                    "platform": platform.platform(),
+                    "root": os.path.abspath(args.root),
+                    "results": results
+                },
+                f,
+                indent=2
+            )
+
+        print(f"\nBaseline saved to '{baseline_file}'")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,3 +7,14 @@ __version_repr__ = (
     f"sndls version {__version__} 2025-{datetime.now().year} developed by "
     "Esteban Gómez (Speech Interaction Technology, Aalto University)"
 )
+
+
+def __getattr__(name: str):
+    # NOTE: The analysis API is imported lazily so that importing the package
+    # (e.g. to get its version) does not import numpy or soundfile
+    if name in ("Analyzer", "analyze"):
+        from . import analysis
+
+        return getattr(analysis, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
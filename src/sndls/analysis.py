@@ -0,0 +1,1687 @@
+"""Python API to analyze audio files without going through the command line.
+
+Example:
+
+    from sndls import Analyzer
+
+    analyzer = Analyzer(recursive=True, spectral_rolloff=0.85)
+
+    for record in analyzer.analyze("/path/to/audio/dir"):
+        print(record["file"], record["peak_db"])
+
+    df = analyzer.to_dataframe("/path/to/audio/dir")
+
+Options have the same names and defaults as the command line options (e.g.
+`--skip-invalid-files` becomes `skip_invalid_files`). Post actions and
+options that only affect how results are printed or saved are ignored.
+"""
+from __future__ import annotations
+import os
+import math
+import random
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import (
+    lru_cache,
+    reduce
+)
+from typing import (
+    TYPE_CHECKING,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+from .utils.collections import flatten_nested_list
+from .utils.config import get_allowed_audio_file_extensions
+from .utils.exceptions import (
+    FilterExpressionError,
+    InvalidAudioFileError,
+    PreloadError,
+    WorkerError,
+    WorkerTimeoutError
+)
+from .utils.guards import is_file_with_ext
+from .utils.hash import generate_sha256_from_file
+from .utils.manifest import (
+    ManifestReader,
+    is_manifest
+)
+from .utils.io import (
+    get_dir_files,
+    get_native_dtype,
+    get_read_order,
+    read_audio,
+    read_audio_metadata,
+    read_audio_mmap,
+    read_audio_windows
+)
+from .utils.profile import profile_stage
+from .utils.store import ResultStore
+from .utils.audio import (
+    amp_to_db,
+    frame_rms_db,
+    is_integer_audio,
+    ms_to_samples,
+    is_anomalous,
+    is_clipped,
+    is_silent,
+    is_silent_frames,
+    peak_amp,
+    peak_db,
+    rms_db,
+    spectral_rolloff,
+    sum_of_squares,
+    to_float
+)
+from .utils.spectral import SpectralRolloffBatch
+from .utils.workers import WorkerPool
+
+if TYPE_CHECKING:
+    import polars as pl
+    from argparse import Namespace
+    from types import CodeType
+
+# Maximum number of STFT frames transformed at once by each FFT call
+_FFT_BLOCK_SIZE = 1024
+
+
+def get_default_options() -> Namespace:
+    """Returns the default analysis options, which are the same as the
+    defaults of the command line options.
+
+    Returns:
+        Namespace: Default options.
+    """
+    # NOTE: The parser is the single source of truth for option defaults
+    from .cli.main import get_parser
+
+    return get_parser().parse_args([])
+
+
+@lru_cache(maxsize=16)
+def _compile_filter(expr: str) -> CodeType:
+    """Compiles a filter expression once, so that it is not parsed again for
+    every file.
+
+    Args:
+        expr (str): Filter expression.
+
+    Returns:
+        CodeType: Compiled expression.
+    """
+    return compile(expr, "<string>", "eval")
+
+
+def matches_filter(
+        data: dict,
+        preload: Optional[pl.DataFrame],
+        expr: str
+) -> bool:
+    """Matches a filter expression against a set of file specifications.
+
+    Args:
+        data (dict): Audio file specifications.
+        preload (Optional[pl.DataFrame]): Preloaded data, available as
+            `preload` inside the expression.
+        expr (str): Filter expression.
+
+    Returns:
+        bool: `True` of the filter matches the contents of `data`, `False`
+            otherwise.
+
+    Raises:
+        FilterExpressionError: If the expression cannot be evaluated or does
+            not return a `bool`.
+    """
+    try:
+        # Set constrained globals and locals. Values are either scalars or
+        # lists of scalars, so copying lists is enough to keep the
+        # expression from modifying `data`
+        local_vars = {
+            k: list(v) if isinstance(v, list) else v for k, v in data.items()
+        }
+
+        if preload is not None:
+            local_vars["preload"] = preload
+
+        result = eval(_compile_filter(expr), {}, local_vars)
+
+        if not isinstance(result, bool):
+            raise ValueError("Invalid return type")
+
+    except Exception as e:
+        fields_repr = ", ".join(k for k in data)
+
+        raise FilterExpressionError(
+            f"Invalid filter expression '{expr}': {e}.\n"
+            "Only python expressions returning a bool value are valid. To "
+            "create a filter expression you can access any of the following "
+            f"fields of each file: {fields_repr}"
+        ) from e
+
+    return result
+
+
+def preload_file(
+        file: str,
+        has_header: bool = False,
+        truncate_ragged_lines: bool = False,
+        ignore_errors: bool = False
+) -> pl.DataFrame:
+    """Preloads a file in memory to be used in filter expressions.
+
+    Args:
+        file (str): File to be loaded in memory as a `pl.DataFrame`.
+        has_header (bool): If `True`, the first column of the preloaded file
+            is assumed to be a header and will be ignored.
+        truncate_ragged_lines (bool): If `True`, lines with more fields than
+            the first one are truncated.
+        ignore_errors (bool): If `True`, rows that cannot be parsed are
+            ignored.
+
+    Returns:
+        pl.DataFrame: Preloaded data.
+
+    Raises:
+        PreloadError: If the file does not exist, has an unsupported
+            extension or cannot be parsed.
+    """
+    # NOTE: polars is only imported if needed since it is slow to import
+    import polars as pl
+
+    if not os.path.isfile(file):
+        raise PreloadError(f"Preload file '{file}' not found")
+
+    elif not is_file_with_ext(file, ext=[".csv", ".tsv", ".txt"]):
+        raise PreloadError("Only .csv, .tsv or .txt files can be preloaded")
+
+    elif is_file_with_ext(file, ext=".csv"):
+        separator = ","
+
+    elif is_file_with_ext(file, ext=".txt"):
+        separator = " "
+
+    elif is_file_with_ext(file, ext=".tsv"):
+        separator = "\t"
+
+    else:
+        raise AssertionError
+
+    try:
+        preload = pl.read_csv(
+            file,
+            separator=separator,
+            has_header=has_header,
+            truncate_ragged_lines=truncate_ragged_lines,
+            ignore_errors=ignore_errors
+        )
+
+    except pl.exceptions.ComputeError as e:
+        raise PreloadError(
+            f"The following error occurred while opening '{file}': {e}"
+        ) from e
+
+    return preload
+
+
+def get_output_cols(options: Namespace) -> List[str]:
+    """Returns the fields of each file written to .csv files and other
+    tabular outputs.
+
+    Args:
+        options (Namespace): Analysis options.
+
+    Returns:
+        List[str]: Output fields.
+    """
+    if options.meta:
+        return [
+            "file",
+            "size_bytes",
+            "subtype",
+            "fmt",
+            "fs",
+            "num_channels",
+            "num_samples_per_channel",
+            "duration_seconds",
+            "is_invalid"
+        ]
+
+    # Header cols (mandatory fields)
+    cols = [
+        "file",
+        "size_bytes",
+        "subtype",
+        "fmt",
+        "fs",
+        "num_channels",
+        "num_samples_per_channel",
+        "duration_seconds",
+        "peak_db",
+        "rms_db",
+        "is_clipped",
+        "is_anomalous",
+        "is_silent",
+        "is_invalid"
+    ]
+
+    if options.spectral_rolloff:
+        if options.spectral_rolloff_detail:
+            for c in (
+                "spectral_rolloff_min",
+                "spectral_rolloff",
+                "spectral_rolloff_max"
+            ):
+                cols.insert(-4, c)
+
+        else:
+            cols.insert(-4, "spectral_rolloff")
+
+    # Optional fields
+    if options.probe:
+        cols.insert(
+            cols.index("duration_seconds") + 1,
+            "probe_duration_seconds"
+        )
+
+    if options.sha256 or options.sha256_short:
+        cols.insert(1, "sha256")
+
+    return cols
+
+
+def read_file_meta(file: str, skip_invalid_files: bool = False) -> dict:
+    """Reads the metadata of an audio file.
+
+    Args:
+        file (str): Input audio file.
+        skip_invalid_files (bool): If `True`, files that cannot be parsed are
+            marked as invalid instead of raising an exception.
+
+    Returns:
+        dict: Audio file metadata.
+
+    Raises:
+        InvalidAudioFileError: If the file cannot be parsed and
+            `skip_invalid_files` is `False`.
+    """
+    try:
+        audio_meta = read_audio_metadata(file)
+        audio_meta["is_invalid"] = False
+
+    except Exception as e:
+        if not skip_invalid_files:
+            raise InvalidAudioFileError(
+                f"File '{file}' could not be parsed due to the following "
+                f"error: {e}"
+            ) from e
+
+        return _get_invalid_file_meta(file)
+
+    audio_meta["file"] = file
+    audio_meta["filename"] = os.path.basename(file)
+    audio_meta["size_bytes"] = os.path.getsize(file)
+
+    return audio_meta
+
+
+def _get_invalid_file_meta(file: str) -> dict:
+    """Returns the metadata of an audio file that cannot be parsed.
+
+    Args:
+        file (str): Input audio file.
+
+    Returns:
+        dict: Audio file metadata marked as invalid.
+    """
+    return {
+        "fs": None,
+        "num_channels": 0,
+        "num_samples_per_channel": 0,
+        "duration_seconds": 0,
+        "fmt": None,
+        "subtype": None,
+        "is_invalid": True,
+        "file": file,
+        "filename": os.path.basename(file),
+        "size_bytes": os.path.getsize(file)
+    }
+
+
+def _convert_mapped_audio(
+        audio: np.ndarray,
+        options: Namespace
+) -> np.ndarray:
+    """Converts memory-mapped samples to `float64` if `dtype` is `float64`.
+    Otherwise they keep their native data type, which is analyzed with at
+    least `float32` precision (see `analyze_file`).
+
+    Args:
+        audio (np.ndarray): Memory-mapped audio data or a chunk of it.
+        options (Namespace): Analysis options.
+
+    Returns:
+        np.ndarray: Audio data.
+    """
+    if options.dtype != "float64":
+        return audio
+
+    if is_integer_audio(audio):
+        return to_float(audio, dtype="float64")
+
+    return audio.astype(np.float64)
+
+
+def _read_audio(
+        file: str,
+        dtype: str,
+        options: Namespace,
+        start: int = 0,
+        stop: Optional[int] = None
+) -> Tuple[np.ndarray, int]:
+    """Reads an audio file or audio file chunk, memory-mapping it instead of
+    decoding it if `mmap` is enabled and the file format allows it.
+
+    Args:
+        file (str): Audio file.
+        dtype (str): Data type used if the file is decoded.
+        options (Namespace): Analysis options.
+        start (int): Start frame.
+        stop (Optional[int]): Stop frame.
+
+    Returns:
+        Tuple[np.ndarray, int]: Audio data in (num_channels, num_samples)
+            format and sample rate.
+    """
+    if options.mmap:
+        mapped = read_audio_mmap(file)
+
+        if mapped is not None:
+            audio, fs = mapped
+            return _convert_mapped_audio(audio[:, start:stop], options), fs
+
+    return read_audio(file, start=start, stop=stop, dtype=dtype)
+
+
+def _read_audio_windows(
+        file: str,
+        windows: List[Tuple[int, int]],
+        dtype: str,
+        options: Namespace
+) -> Tuple[List[np.ndarray], int]:
+    """Reads several chunks of an audio file, memory-mapping it instead of
+    decoding it if `mmap` is enabled and the file format allows it.
+
+    Args:
+        file (str): Audio file.
+        windows (List[Tuple[int, int]]): Start and stop frame of each chunk.
+        dtype (str): Data type used if the file is decoded.
+        options (Namespace): Analysis options.
+
+    Returns:
+        Tuple[List[np.ndarray], int]: Audio data of each chunk and sample
+            rate.
+    """
+    if options.mmap:
+        mapped = read_audio_mmap(file)
+
+        if mapped is not None:
+            audio, fs = mapped
+            return [
+                _convert_mapped_audio(audio[:, start:stop], options)
+                for start, stop in windows
+            ], fs
+
+    return read_audio_windows(file, windows, dtype=dtype)
+
+
+def get_probe_windows(
+        file: str,
+        num_samples: int,
+        fs: int,
+        options: Namespace
+) -> List[Tuple[int, int]]:
+    """Returns the regions of an audio file analyzed in probe mode: its head,
+    its tail and `probe_num_random_windows` random windows of
+    `probe_window_size` seconds each. Random windows are drawn from a
+    generator seeded with `random_seed` and the file path, so the same file
+    is always probed at the same positions. Overlapping windows are merged.
+
+    Args:
+        file (str): Input audio file.
+        num_samples (int): Number of samples per channel of the file.
+        fs (int): Sample rate.
+        options (Namespace): Analysis options.
+
+    Returns:
+        List[Tuple[int, int]]: Sorted start and stop sample of each window.
+    """
+    window_size = max(1, int(options.probe_window_size * fs))
+
+    if num_samples <= window_size:
+        return [(0, num_samples)]
+
+    last_start = num_samples - window_size
+    rng = random.Random(f"{options.random_seed}:{file}")
+    starts = [0, last_start]
+    starts.extend(
+        rng.randint(0, last_start)
+        for _ in range(options.probe_num_random_windows)
+    )
+
+    windows = []
+
+    for start in sorted(starts):
+        stop = start + window_size
+
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], stop))
+
+        else:
+            windows.append((start, stop))
+
+    return windows
+
+
+def _get_silent_frame_size(fs: int, options: Namespace) -> Optional[int]:
+    """Returns the frame size in samples used to detect silence.
+
+    Args:
+        fs (int): Sample rate.
+        options (Namespace): Analysis options.
+
+    Returns:
+        Optional[int]: Frame size in samples or `None` if silence is not
+            detected framewise.
+    """
+    if options.silent_frame_size_ms is None:
+        return None
+
+    return ms_to_samples(options.silent_frame_size_ms, fs=fs, truncate=True)
+
+
+def get_audio_stats(
+        audio: Union[np.ndarray, List[np.ndarray]],
+        fs: int,
+        options: Namespace
+) -> dict:
+    """Computes the level, clipping, anomaly and silence statistics of an
+    audio signal.
+
+    Args:
+        audio (Union[np.ndarray, List[np.ndarray]]): Audio data in
+            (..., time) format, or a `list` of non-contiguous chunks of it
+            (e.g. probe windows). Frames used to detect silence never span
+            two chunks.
+        fs (int): Sample rate.
+        options (Namespace): Analysis options.
+
+    Returns:
+        dict: Audio statistics.
+    """
+    chunks = audio if isinstance(audio, list) else [audio]
+    audio = chunks[0] if len(chunks) == 1 else np.concatenate(chunks, axis=-1)
+    silent_frame_size_samples = _get_silent_frame_size(fs, options)
+
+    if silent_frame_size_samples is None or len(chunks) == 1:
+        _is_silent = is_silent(
+            x=audio,
+            thresh_db=options.silent_thresh,
+            frame_size=silent_frame_size_samples,
+            hop_size=options.silent_hop_size,
+            axis=-1,
+            mode=options.silent_frame_mode
+        )
+
+    else:
+        _is_silent = is_silent_frames(
+            np.concatenate(
+                [
+                    frame_rms_db(
+                        c,
+                        silent_frame_size_samples,
+                        hop_size=options.silent_hop_size
+                    )
+                    for c in chunks
+                ],
+                axis=-1
+            ),
+            thresh_db=options.silent_thresh,
+            mode=options.silent_frame_mode
+        )
+
+    return {
+        "peak_db": flatten_nested_list(peak_db(audio, axis=-1).tolist()),
+        "rms_db": flatten_nested_list(rms_db(audio, axis=-1).tolist()),
+        "is_clipped": is_clipped(audio),
+        "is_anomalous": is_anomalous(audio),
+        "is_silent": _is_silent
+    }
+
+
+def get_spectral_rolloff_stats(
+        audio: Union[np.ndarray, List[np.ndarray]],
+        fs: int,
+        options: Namespace
+) -> dict:
+    """Computes the spectral rolloff of an audio signal averaged over time
+    and, if `spectral_rolloff_detail` is enabled, its minimum and maximum.
+
+    Args:
+        audio (Union[np.ndarray, List[np.ndarray]]): Audio data in
+            (..., time) format, or a `list` of non-contiguous chunks of it.
+            Frames never span two chunks.
+        fs (int): Sample rate.
+        options (Namespace): Analysis options.
+
+    Returns:
+        dict: Spectral rolloff statistics.
+    """
+    _spectral_rolloff = np.concatenate(
+        [
+            spectral_rolloff(
+                to_float(c),
+                fs,
+                options.fft_size,
+                options.hop_size,
+                rolloff=options.spectral_rolloff,
+                workers=options.fft_workers,
+                max_frames=_FFT_BLOCK_SIZE
+            )
+            for c in (audio if isinstance(audio, list) else [audio])
+        ],
+        axis=-1
+    )
+
+    return _summarize_spectral_rolloff(_spectral_rolloff, options)
+
+
+def _summarize_spectral_rolloff(
+        _spectral_rolloff: np.ndarray,
+        options: Namespace
+) -> dict:
+    """Summarizes the framewise spectral rolloff of an audio signal.
+
+    Args:
+        _spectral_rolloff (np.ndarray): Framewise spectral rolloff as
+            returned by `spectral_rolloff`.
+        options (Namespace): Analysis options.
+
+    Returns:
+        dict: Spectral rolloff statistics.
+    """
+    stats = {
+        "spectral_rolloff": flatten_nested_list(
+            np.mean(_spectral_rolloff, axis=-1, keepdims=True).tolist()
+        )
+    }
+
+    if options.spectral_rolloff_detail:
+        stats["spectral_rolloff_min"] = flatten_nested_list(
+            np.min(_spectral_rolloff, axis=-1, keepdims=True).tolist()
+        )
+        stats["spectral_rolloff_max"] = flatten_nested_list(
+            np.max(_spectral_rolloff, axis=-1, keepdims=True).tolist()
+        )
+
+    return stats
+
+
+def _get_read_dtype(audio_meta: dict, options: Namespace) -> str:
+    """Returns the data type an audio file is read with.
+
+    Args:
+        audio_meta (dict): Audio file metadata as returned by
+            `read_file_meta`.
+        options (Namespace): Analysis options.
+
+    Returns:
+        str: Data type.
+    """
+    if options.dtype == "native":
+        return get_native_dtype(audio_meta["subtype"])
+
+    return options.dtype
+
+
+def _get_bytes_per_sample(
+        num_channels: int,
+        dtype: str,
+        options: Namespace
+) -> float:
+    """Returns an upper bound of the memory needed to analyze each sample
+    (per channel) of an audio signal.
+
+    It accounts for the audio data, the largest temporary array used to
+    compute level statistics and, if `spectral_rolloff` is enabled, the
+    floating point and zero padded copies of the audio data and the
+    rolloff of each STFT frame. The STFT itself is computed in blocks of
+    frames whose size does not depend on the length of the audio data (see
+    `_get_fft_block_bytes`).
+
+    Args:
+        num_channels (int): Number of channels.
+        dtype (str): Data type the audio data is read with.
+        options (Namespace): Analysis options.
+
+    Returns:
+        float: Memory in bytes.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    is_float = np.issubdtype(np.dtype(dtype), np.floating)
+    bytes_per_sample = itemsize * (2 if is_float else 1)
+
+    # NOTE: Integer frames are summed in float64 to detect silence
+    if not is_float and options.silent_frame_size_ms is not None:
+        bytes_per_sample += 8
+
+    if options.spectral_rolloff is not None:
+        # NOTE: Integer audio data is converted to float32 first
+        float_size = itemsize if is_float else 4
+
+        if not is_float:
+            bytes_per_sample += float_size
+
+        # NOTE: Frequency bin index and frequency of each frame
+        bytes_per_sample += float_size + 16 / options.hop_size
+
+    return bytes_per_sample * max(1, num_channels)
+
+
+def _get_fft_block_bytes(dtype: str, options: Namespace) -> int:
+    """Returns the memory needed to compute the spectral rolloff of a block
+    of STFT frames: the windowed frames and, for each STFT bin, the complex
+    spectrum, its magnitude and two boolean masks.
+
+    Args:
+        dtype (str): Data type the audio data is read with.
+        options (Namespace): Analysis options.
+
+    Returns:
+        int: Memory in bytes (0 if `spectral_rolloff` is disabled).
+    """
+    if options.spectral_rolloff is None:
+        return 0
+
+    # NOTE: Integer audio data is converted to float32 first
+    float_size = (
+        np.dtype(dtype).itemsize
+        if np.issubdtype(np.dtype(dtype), np.floating) else 4
+    )
+    num_bins = options.fft_size // 2 + 1
+
+    return _FFT_BLOCK_SIZE * (
+        options.fft_size * float_size + num_bins * (3 * float_size + 2)
+    )
+
+
+def _get_segment_overlap(fs: int, options: Namespace) -> int:
+    """Returns the maximum number of samples read by `analyze_segment` past
+    the boundaries of a segment.
+
+    Args:
+        fs (int): Sample rate.
+        options (Namespace): Analysis options.
+
+    Returns:
+        int: Number of samples.
+    """
+    overlap = _get_silent_frame_size(fs, options) or 0
+
+    if options.spectral_rolloff is not None:
+        overlap += options.fft_size + options.hop_size
+
+    return overlap
+
+
+def get_segments(
+        num_samples: int,
+        fs: int,
+        options: Namespace,
+        num_channels: int = 1,
+        dtype: str = "float32"
+) -> List[Tuple[int, int]]:
+    """Returns the segments an audio file is split into to be analyzed by
+    `segment_workers` threads in parallel. Segments are `segment_size`
+    seconds long, rounded to a multiple of the silence and spectral rolloff
+    hop sizes so that every frame starts in exactly one segment.
+
+    If `memory_budget` is set and the file cannot be analyzed at once within
+    it, the file is always split (even if `segment_workers` is 1) into
+    segments short enough for `segment_workers` of them to fit in the
+    budget, so that it is streamed instead of being read at once.
+
+    Args:
+        num_samples (int): Number of samples per channel of the file.
+        fs (int): Sample rate.
+        options (Namespace): Analysis options.
+        num_channels (int): Number of channels of the file.
+        dtype (str): Data type the audio data is read with.
+
+    Returns:
+        List[Tuple[int, int]]: Start and stop sample of each segment. A
+            single segment is returned if the file is not split.
+    """
+    silent_frame_size = _get_silent_frame_size(fs, options)
+    align = 1
+
+    if silent_frame_size is not None:
+        align = math.lcm(
+            align,
+            max(1, int(silent_frame_size * options.silent_hop_size))
+        )
+
+    if options.spectral_rolloff is not None:
+        align = math.lcm(align, options.hop_size)
+
+    segment_size = max(align, int(options.segment_size * fs) // align * align)
+    bytes_per_sample = _get_bytes_per_sample(num_channels, dtype, options)
+    block_bytes = _get_fft_block_bytes(dtype, options)
+    is_streamed = (
+        options.memory_budget is not None
+        and num_samples * bytes_per_sample + block_bytes
+        > options.memory_budget
+    )
+
+    if is_streamed:
+        max_segment_size = int(
+            (options.memory_budget - options.segment_workers * block_bytes)
+            / (options.segment_workers * bytes_per_sample)
+        ) - _get_segment_overlap(fs, options)
+        segment_size = min(
+            segment_size,
+            max(align, max_segment_size // align * align)
+        )
+
+    if (
+        (options.segment_workers < 2 and not is_streamed)
+        or num_samples <= segment_size
+        or (silent_frame_size is not None and num_samples <= silent_frame_size)
+    ):
+        return [(0, num_samples)]
+
+    return [
+        (start, min(start + segment_size, num_samples))
+        for start in range(0, num_samples, segment_size)
+    ]
+
+
+def analyze_segment(
+        file: str,
+        start: int,
+        stop: int,
+        num_samples: int,
+        fs: int,
+        dtype: str,
+        options: Namespace
+) -> dict:
+    """Reads a segment of an audio file and computes partial statistics that
+    can be merged exactly with those of the other segments (see
+    `merge_segment_stats`). Framewise statistics are computed for the frames
+    starting inside the segment, so the segment is read with the overlap
+    needed to complete them.
+
+    Args:
+        file (str): Input audio file.
+        start (int): Start sample of the segment.
+        stop (int): Stop sample of the segment.
+        num_samples (int): Number of samples per channel of the file.
+        fs (int): Sample rate.
+        dtype (str): Data type used to read the audio data.
+        options (Namespace): Analysis options.
+
+    Returns:
+        dict: Partial statistics of the segment.
+    """
+    silent_frame_size = _get_silent_frame_size(fs, options)
+    read_start, read_stop = start, stop
+
+    if silent_frame_size is not None:
+        silent_hop = int(silent_frame_size * options.silent_hop_size)
+        silent_stop = min(num_samples, stop - silent_hop + silent_frame_size)
+        read_stop = max(read_stop, silent_stop)
+
+    if options.spectral_rolloff is not None:
+        # NOTE: Rolloff frames are centered at multiples of hop_size, and the
+        # last segment also owns the frames centered past the last sample
+        half_fft_size = options.fft_size // 2
+        frames_stop = (
+            stop if stop < num_samples
+            else (num_samples // options.hop_size + 1) * options.hop_size
+        )
+        rolloff_start = start - half_fft_size
+        rolloff_stop = frames_stop - options.hop_size + half_fft_size
+        read_start = min(read_start, max(0, rolloff_start))
+        read_stop = max(read_stop, min(num_samples, rolloff_stop))
+
+    audio, _ = _read_audio(
+        file,
+        dtype,
+        options,
+        start=read_start,
+        stop=read_stop
+    )
+    x = audio[:, start - read_start:stop - read_start]
+    stats = {
+        "num_samples": stop - start,
+        "peak": peak_amp(x, axis=-1),
+        "energy": sum_of_squares(x, axis=-1),
+        "is_clipped": is_clipped(x),
+        "is_anomalous": is_anomalous(x)
+    }
+
+    if silent_frame_size is not None:
+        x = audio[:, start - read_start:silent_stop - read_start]
+        stats["silent_frames_db"] = (
+            frame_rms_db(
+                x,
+                silent_frame_size,
+                hop_size=options.silent_hop_size
+            )
+            if x.shape[-1] >= silent_frame_size else np.empty(0)
+        )
+
+    if options.spectral_rolloff is not None:
+        x = to_float(
+            audio[
+                :,
+                max(0, rolloff_start) - read_start:
+                min(num_samples, rolloff_stop) - read_start
+            ]
+        )
+        # Zero padding past the file boundaries, as done by
+        # spectral_rolloff for the whole file
+        x = np.pad(
+            x,
+            (
+                (0, 0),
+                (max(0, -rolloff_start), max(0, rolloff_stop - num_samples))
+            )
+        )
+        stats["spectral_rolloff"] = spectral_rolloff(
+            x,
+            fs,
+            options.fft_size,
+            options.hop_size,
+            rolloff=options.spectral_rolloff,
+            boundary=None,
+            workers=options.fft_workers,
+            max_frames=_FFT_BLOCK_SIZE
+        )
+
+    return stats
+
+
+def merge_segment_stats(segments: List[dict], options: Namespace) -> dict:
+    """Merges the partial statistics of all segments of an audio file into
+    the same statistics returned by `get_audio_stats` and
+    `get_spectral_rolloff_stats` for the whole file.
+
+    Args:
+        segments (List[dict]): Partial statistics of each segment in time
+            order, as returned by `analyze_segment`.
+        options (Namespace): Analysis options.
+
+    Returns:
+        dict: Audio statistics.
+    """
+    num_samples = sum(s["num_samples"] for s in segments)
+    peak = reduce(np.maximum, (s["peak"] for s in segments))
+    energy = reduce(np.add, (s["energy"] for s in segments))
+    _rms_db = amp_to_db(np.sqrt(energy / num_samples))
+
+    if options.silent_frame_size_ms is not None:
+        _is_silent = is_silent_frames(
+            np.concatenate([s["silent_frames_db"] for s in segments]),
+            thresh_db=options.silent_thresh,
+            mode=options.silent_frame_mode
+        )
+
+    else:
+        _is_silent = bool(np.all(_rms_db < options.silent_thresh))
+
+    stats = {
+        "peak_db": flatten_nested_list(amp_to_db(peak).tolist()),
+        "rms_db": flatten_nested_list(_rms_db.tolist()),
+        "is_clipped": any(s["is_clipped"] for s in segments),
+        "is_anomalous": any(s["is_anomalous"] for s in segments),
+        "is_silent": _is_silent
+    }
+
+    if options.spectral_rolloff is not None:
+        stats.update(
+            _summarize_spectral_rolloff(
+                np.concatenate(
+                    [s["spectral_rolloff"] for s in segments],
+                    axis=-1
+                ),
+                options
+            )
+        )
+
+    return stats
+
+
+def analyze_segments(
+        file: str,
+        segments: List[Tuple[int, int]],
+        num_samples: int,
+        fs: int,
+        dtype: str,
+        options: Namespace
+) -> dict:
+    """Analyzes the segments of an audio file using `segment_workers`
+    threads and merges their statistics.
+
+    Args:
+        file (str): Input audio file.
+        segments (List[Tuple[int, int]]): Segments as returned by
+            `get_segments`.
+        num_samples (int): Number of samples per channel of the file.
+        fs (int): Sample rate.
+        dtype (str): Data type used to read the audio data.
+        options (Namespace): Analysis options.
+
+    Returns:
+        dict: Audio statistics.
+    """
+    def _analyze_segment(segment: Tuple[int, int]) -> dict:
+        with profile_stage("segment", file=file):
+            return analyze_segment(
+                file,
+                *segment,
+                num_samples=num_samples,
+                fs=fs,
+                dtype=dtype,
+                options=options
+            )
+
+    with ThreadPoolExecutor(max_workers=options.segment_workers) as pool:
+        stats = list(pool.map(_analyze_segment, segments))
+
+    return merge_segment_stats(stats, options)
+
+
+def estimate_memory_usage(audio_meta: dict, options: Namespace) -> int:
+    """Estimates an upper bound of the memory used by `analyze_file` to
+    analyze an audio file, from its metadata.
+
+    The estimate accounts for the decoded audio data (number of samples,
+    channels and `dtype`), the temporary arrays used to compute its
+    statistics and, if `spectral_rolloff` is enabled, the STFT. Files
+    analyzed in segments only count the `segment_workers` largest
+    segments, and probed files only their probe windows.
+
+    Args:
+        audio_meta (dict): Audio file metadata as returned by
+            `read_file_meta`.
+        options (Namespace): Analysis options.
+
+    Returns:
+        int: Memory in bytes.
+    """
+    if audio_meta["is_invalid"]:
+        return 0
+
+    num_samples = audio_meta["num_samples_per_channel"]
+    fs = audio_meta["fs"]
+    dtype = _get_read_dtype(audio_meta, options)
+    bytes_per_sample = _get_bytes_per_sample(
+        audio_meta["num_channels"],
+        dtype,
+        options
+    )
+    block_bytes = _get_fft_block_bytes(dtype, options)
+
+    if options.probe:
+        window_size = max(1, int(options.probe_window_size * fs))
+        num_samples = min(
+            num_samples,
+            (options.probe_num_random_windows + 2) * window_size
+        )
+        return int(num_samples * bytes_per_sample) + block_bytes
+
+    segments = get_segments(
+        num_samples,
+        fs,
+        options,
+        num_channels=audio_meta["num_channels"],
+        dtype=dtype
+    )
+
+    if len(segments) == 1:
+        return int(num_samples * bytes_per_sample) + block_bytes
+
+    overlap = _get_segment_overlap(fs, options)
+    segment_sizes = sorted(
+        (stop - start + overlap for start, stop in segments),
+        reverse=True
+    )[:options.segment_workers]
+
+    return int(
+        sum(segment_sizes) * bytes_per_sample
+        + len(segment_sizes) * block_bytes
+    )
+
+
+def get_spectral_rolloff_batch(
+        options: Namespace
+) -> Optional[SpectralRolloffBatch]:
+    """Returns a batch that computes the spectral rolloff of many files at
+    once (see `analyze_file`).
+
+    Args:
+        options (Namespace): Analysis options.
+
+    Returns:
+        Optional[SpectralRolloffBatch]: Spectral rolloff batch, or `None` if
+            `spectral_rolloff` is disabled.
+    """
+    if options.spectral_rolloff is None:
+        return None
+
+    return SpectralRolloffBatch(
+        options.fft_size,
+        options.hop_size,
+        rolloff=options.spectral_rolloff,
+        workers=options.fft_workers,
+        max_frames=_FFT_BLOCK_SIZE
+    )
+
+
+def analyze_file(
+        audio_meta: dict,
+        options: Namespace,
+        spectral_batch: Optional[SpectralRolloffBatch] = None
+) -> None:
+    """Reads an audio file and adds its statistics to its metadata.
+
+    If `dtype` is `native`, integer PCM files are read and analyzed in their
+    native integer data type, and only converted to floating point to
+    compute the spectral rolloff. Other files are read as `float32`. If
+    `mmap` is enabled, uncompressed WAV and AIFF files are memory-mapped
+    instead (see `sndls.utils.io.read_audio_mmap`), which also keeps their
+    native data type unless `dtype` is `float64`, in which case the mapped
+    samples are converted to `float64`.
+
+    If `probe` is enabled, only the windows returned by `get_probe_windows`
+    are decoded and analyzed, and the number of seconds analyzed is added as
+    `probe_duration_seconds`. Otherwise, files longer than `segment_size`
+    seconds are analyzed in segments by `segment_workers` threads if
+    `segment_workers` is greater than 1 (see `analyze_segments`), and files
+    that do not fit in `memory_budget` are streamed in segments (see
+    `get_segments`).
+
+    If `spectral_batch` is given, the spectral rolloff of files that are not
+    analyzed in segments is added to the batch instead, and their metadata
+    is only complete once the batch is flushed.
+
+    Args:
+        audio_meta (dict): Audio file metadata as returned by
+            `read_file_meta`. It is updated in place.
+        options (Namespace): Analysis options.
+        spectral_batch (Optional[SpectralRolloffBatch]): Batch the spectral
+            rolloff is computed with (see `get_spectral_rolloff_batch`).
+
+    Raises:
+        InvalidAudioFileError: If the file cannot be read and
+            `skip_invalid_files` is disabled.
+    """
+    file = audio_meta["file"]
+    dtype = _get_read_dtype(audio_meta, options)
+
+    try:
+        segments = (
+            get_segments(
+                audio_meta["num_samples_per_channel"],
+                audio_meta["fs"],
+                options,
+                num_channels=audio_meta["num_channels"],
+                dtype=dtype
+            )
+            if not options.probe and not audio_meta["is_invalid"] else []
+        )
+
+        if len(segments) > 1:
+            audio_meta.update(
+                analyze_segments(
+                    file,
+                    segments,
+                    audio_meta["num_samples_per_channel"],
+                    audio_meta["fs"],
+                    dtype,
+                    options
+                )
+            )
+
+        else:
+            with profile_stage("decode", file=file):
+                if options.probe and not audio_meta["is_invalid"]:
+                    windows = get_probe_windows(
+                        file,
+                        audio_meta["num_samples_per_channel"],
+                        audio_meta["fs"],
+                        options
+                    )
+                    audio, fs = _read_audio_windows(
+                        file,
+                        windows,
+                        dtype,
+                        options
+                    )
+                    audio_meta["probe_duration_seconds"] = (
+                        sum(stop - start for start, stop in windows) / fs
+                    )
+
+                else:
+                    audio, fs = _read_audio(file, dtype, options)
+
+            with profile_stage("stats", file=file):
+                audio_meta.update(get_audio_stats(audio, fs, options))
+
+            if options.spectral_rolloff is not None:
+                with profile_stage("spectral_rolloff", file=file):
+                    if spectral_batch is not None:
+                        spectral_batch.add(
+                            audio,
+                            fs,
+                            lambda r: audio_meta.update(
+                                _summarize_spectral_rolloff(r, options)
+                            )
+                        )
+
+                    else:
+                        audio_meta.update(
+                            get_spectral_rolloff_stats(audio, fs, options)
+                        )
+
+        audio_meta["is_invalid"] = False
+
+    except Exception as e:
+        if not options.skip_invalid_files:
+            raise InvalidAudioFileError(
+                f"File '{file}' could not be parsed due to the following "
+                f"error: {e}"
+            ) from e
+
+        _set_invalid_stats(audio_meta, options)
+
+    if options.sha256 or options.sha256_short:
+        with profile_stage("sha256", file=file):
+            audio_meta["sha256"] = generate_sha256_from_file(file)
+
+
+def _set_invalid_stats(audio_meta: dict, options: Namespace) -> None:
+    """Marks an audio file that cannot be analyzed as invalid and sets its
+    statistics to empty values.
+
+    Args:
+        audio_meta (dict): Audio file metadata. It is updated in place.
+        options (Namespace): Analysis options.
+    """
+    audio_meta["peak_db"] = None
+    audio_meta["rms_db"] = None
+    audio_meta["is_clipped"] = False
+    audio_meta["is_anomalous"] = False
+    audio_meta["is_silent"] = False
+    audio_meta["is_invalid"] = True
+
+    if options.probe:
+        audio_meta["probe_duration_seconds"] = None
+
+    if options.spectral_rolloff is not None:
+        audio_meta["spectral_rolloff"] = None
+
+        if options.spectral_rolloff_detail:
+            audio_meta["spectral_rolloff_min"] = None
+            audio_meta["spectral_rolloff_max"] = None
+
+
+def _analyze_file_task(audio_meta: dict, options: Namespace) -> dict:
+    """Runs `analyze_file` in a worker process of a `WorkerPool`.
+
+    Args:
+        audio_meta (dict): Audio file metadata.
+        options (Namespace): Analysis options.
+
+    Returns:
+        dict: Audio file metadata updated with its statistics.
+    """
+    analyze_file(audio_meta, options)
+
+    return audio_meta
+
+
+def _get_worker_error(
+        file: str,
+        e: WorkerError,
+        options: Namespace
+) -> InvalidAudioFileError:
+    """Returns the error raised when the worker process reading an audio
+    file hangs or crashes.
+
+    Args:
+        file (str): Input audio file.
+        e (WorkerError): Error raised by the worker pool.
+        options (Namespace): Analysis options.
+
+    Returns:
+        InvalidAudioFileError: Error.
+    """
+    reason = (
+        f"{e} after {options.timeout:g} second(s)"
+        if isinstance(e, WorkerTimeoutError) else str(e)
+    )
+
+    return InvalidAudioFileError(
+        f"File '{file}' could not be parsed due to the following error: "
+        f"{reason}"
+    )
+
+
+def read_file_meta_isolated(
+        file: str,
+        options: Namespace,
+        workers: WorkerPool,
+        deadline: float
+) -> dict:
+    """Reads the metadata of an audio file in a supervised worker process
+    (see `read_file_meta`).
+
+    Args:
+        file (str): Input audio file.
+        options (Namespace): Analysis options.
+        workers (WorkerPool): Worker processes.
+        deadline (float): `time.monotonic()` value by which the metadata
+            must be read.
+
+    Returns:
+        dict: Audio file metadata. Files whose worker process hangs or
+            crashes are marked as invalid.
+
+    Raises:
+        InvalidAudioFileError: If the file cannot be parsed (or its worker
+            process hangs or crashes) and `skip_invalid_files` is disabled.
+    """
+    try:
+        return workers.run(
+            read_file_meta,
+            (file, options.skip_invalid_files),
+            timeout=deadline - time.monotonic()
+        )
+
+    except WorkerError as e:
+        if not options.skip_invalid_files:
+            raise _get_worker_error(file, e, options) from e
+
+        return _get_invalid_file_meta(file)
+
+
+def analyze_file_isolated(
+        audio_meta: dict,
+        options: Namespace,
+        workers: WorkerPool,
+        deadline: float
+) -> None:
+    """Analyzes an audio file in a supervised worker process (see
+    `analyze_file`).
+
+    Files whose worker process hangs past `deadline` or crashes (e.g. due to
+    a segmentation fault in the decoder) are handled as files that cannot
+    be parsed. The worker process is replaced by a new one, so that the
+    remaining files are not affected.
+
+    Args:
+        audio_meta (dict): Audio file metadata as returned by
+            `read_file_meta_isolated`. It is updated in place.
+        options (Namespace): Analysis options.
+        workers (WorkerPool): Worker processes.
+        deadline (float): `time.monotonic()` value by which the analysis
+            must be finished.
+
+    Raises:
+        InvalidAudioFileError: If the file cannot be parsed (or its worker
+            process hangs or crashes) and `skip_invalid_files` is disabled.
+    """
+    file = audio_meta["file"]
+
+    # NOTE: Files whose metadata could not be parsed are not read again,
+    # since reading them may hang again
+    if not audio_meta["is_invalid"]:
+        try:
+            with profile_stage("worker", file=file):
+                audio_meta.update(
+                    workers.run(
+                        _analyze_file_task,
+                        (audio_meta, options),
+                        timeout=deadline - time.monotonic()
+                    )
+                )
+
+            return
+
+        except WorkerError as e:
+            if not options.skip_invalid_files:
+                raise _get_worker_error(file, e, options) from e
+
+    _set_invalid_stats(audio_meta, options)
+
+    if options.sha256 or options.sha256_short:
+        with profile_stage("sha256", file=file):
+            audio_meta["sha256"] = generate_sha256_from_file(file)
+
+
+class Analyzer:
+    """Analyzes audio files using the same per-file pipeline as the `sndls`
+    command.
+
+    If `timeout` is set, files are read and analyzed in a supervised worker
+    process, one at a time (see `analyze_file_isolated`).
+
+    Args:
+        **options: Analysis options named after the command line options
+            (e.g. `recursive=True` or `spectral_rolloff=0.85`). Options that
+            are not given take the same default value as in the command line.
+
+    Raises:
+        TypeError: If an unknown option is given.
+        ValueError: If an option has an invalid value.
+    """
+    def __init__(self, **options) -> None:
+        self.options = get_default_options()
+
+        for name, value in options.items():
+            if not hasattr(self.options, name):
+                raise TypeError(f"Unknown option '{name}'")
+
+            setattr(self.options, name, value)
+
+        self._check_options()
+        self._preload = None
+        self._workers = None
+
+    def _check_options(self) -> None:
+        """Checks that the analysis options are valid.
+
+        Raises:
+            ValueError: If an option has an invalid value.
+        """
+        options = self.options
+
+        if isinstance(options.extension, str):
+            options.extension = [options.extension]
+
+        for ext in options.extension:
+            if ext not in get_allowed_audio_file_extensions():
+                raise ValueError(
+                    "Currently only the following extensions are supported: "
+                    f"{', '.join(get_allowed_audio_file_extensions())}"
+                )
+
+        if options.filter is not None and options.select is not None:
+            raise ValueError("filter and select cannot be used together")
+
+        if (
+            options.spectral_rolloff is not None
+            and not 0.0 <= options.spectral_rolloff <= 1.0
+        ):
+            raise ValueError(
+                "spectral_rolloff should be a value between 0.0 and 1.0"
+            )
+
+        if options.silent_hop_size <= 0.0 or options.silent_hop_size > 1.0:
+            raise ValueError(
+                "silent_hop_size must be greater than 0.0 and less than or "
+                "equal to 1.0"
+            )
+
+        if options.segment_workers < 1:
+            raise ValueError("segment_workers must be 1 or greater")
+
+        if options.fft_workers < 1:
+            raise ValueError("fft_workers must be 1 or greater")
+
+        if options.segment_size <= 0.0:
+            raise ValueError("segment_size must be greater than 0.0")
+
+        if options.memory_budget is not None and options.memory_budget <= 0:
+            raise ValueError("memory_budget must be greater than 0")
+
+        if options.timeout is not None and options.timeout <= 0.0:
+            raise ValueError("timeout must be greater than 0.0")
+
+        if options.probe:
+            if options.probe_window_size <= 0.0:
+                raise ValueError("probe_window_size must be greater than 0.0")
+
+            if options.probe_num_random_windows < 0:
+                raise ValueError(
+                    "probe_num_random_windows must be 0 or greater"
+                )
+
+    def _get_preload(self) -> Optional[pl.DataFrame]:
+        """Returns the preloaded data, loading it the first time.
+
+        Returns:
+            Optional[pl.DataFrame]: Preloaded data or `None` if `preload` is
+                not set.
+        """
+        if self.options.preload is not None and self._preload is None:
+            with profile_stage("preload"):
+                self._preload = preload_file(
+                    file=self.options.preload,
+                    has_header=self.options.preload_has_header,
+                    truncate_ragged_lines=(
+                        self.options.preload_truncate_ragged_lines
+                    ),
+                    ignore_errors=self.options.csv_ignore_errors
+                )
+
+        return self._preload
+
+    def _get_workers(self) -> Optional[WorkerPool]:
+        """Returns the worker process files are analyzed in, starting it the
+        first time.
+
+        Returns:
+            Optional[WorkerPool]: Worker pool or `None` if `timeout` is not
+                set.
+        """
+        if self.options.timeout is not None and self._workers is None:
+            self._workers = WorkerPool(1)
+
+        return self._workers
+
+    def get_files(self, paths: Union[str, List[str]]) -> List[str]:
+        """Returns the audio files to analyze.
+
+        Args:
+            paths (Union[str, List[str]]): Audio files, folders containing
+                audio files or .csv or .parquet files with a column listing
+                audio files (see the `csv_input_file_col` option).
+
+        Returns:
+            List[str]: Audio files.
+
+        Raises:
+            FileNotFoundError: If a path or a file listed in a .csv or
+                .parquet file does not exist or does not have a valid
+                extension.
+        """
+        options = self.options
+        files = []
+
+        for path in [paths] if isinstance(paths, str) else paths:
+            if is_file_with_ext(file=path, ext=options.extension):
+                files.append(path)
+
+            elif is_manifest(path):
+                manifest = ManifestReader(
+                    path,
+                    col=options.csv_input_file_col,
+                    ext=options.extension,
+                    ignore_errors=options.csv_ignore_errors
+                )
+                files.extend(manifest)
+
+                if len(manifest.invalid_rows) > 0:
+                    row_idx, file = manifest.invalid_rows[0]
+                    raise FileNotFoundError(
+                        f"Invalid filename '{file}' found in row #{row_idx} "
+                        f"of '{path}' ({len(manifest.invalid_rows)} invalid "
+                        "row(s) in total)"
+                    )
+
+            elif os.path.isdir(path):
+                with profile_stage("discovery"):
+                    files.extend(
+                        get_dir_files(
+                            dir=path,
+                            ext=options.extension,
+                            recursive=options.recursive
+                        )
+                    )
+
+            else:
+                raise FileNotFoundError(
+                    f"Invalid input file or folder '{path}'"
+                )
+
+        return files
+
+    def analyze_file(self, file: str) -> Optional[dict]:
+        """Analyzes a single audio file.
+
+        Args:
+            file (str): Input audio file.
+
+        Returns:
+            Optional[dict]: File record, or `None` if the file is longer than
+                `max_duration` or excluded by `filter`/`select`.
+
+        Raises:
+            InvalidAudioFileError: If the file cannot be parsed and
+                `skip_invalid_files` is disabled.
+            FilterExpressionError: If `filter`/`select` is invalid.
+        """
+        options = self.options
+        workers = self._get_workers()
+        deadline = (
+            time.monotonic() + options.timeout
+            if options.timeout is not None else None
+        )
+
+        with profile_stage("metadata", file=file):
+            if workers is not None:
+                audio_meta = read_file_meta_isolated(
+                    file,
+                    options,
+                    workers,
+                    deadline
+                )
+
+            else:
+                audio_meta = read_file_meta(
+                    file,
+                    skip_invalid_files=options.skip_invalid_files
+                )
+
+        if options.meta:
+            return audio_meta
+
+        if audio_meta["duration_seconds"] > options.max_duration:
+            return None
+
+        if workers is not None:
+            analyze_file_isolated(audio_meta, options, workers, deadline)
+
+        else:
+            analyze_file(audio_meta, options)
+
+        with profile_stage("filter", file=file):
+            if (
+                options.filter is not None
+                and matches_filter(
+                    audio_meta,
+                    self._get_preload(),
+                    options.filter
+                )
+            ) or (
+                options.select is not None
+                and not matches_filter(
+                    audio_meta,
+                    self._get_preload(),
+                    options.select
+                )
+            ):
+                return None
+
+        return audio_meta
+
+    def analyze(self, paths: Union[str, List[str]]) -> Iterator[dict]:
+        """Analyzes audio files lazily.
+
+        Args:
+            paths (Union[str, List[str]]): Audio files, folders containing
+                audio files or .csv or .parquet files listing audio files.
+
+        Files are read in `read_order` (see `sndls.utils.io.get_read_order`),
+        but records are always yielded in input order.
+
+        Yields:
+            dict: Record of each file that is not longer than `max_duration`
+                nor excluded by `filter`/`select`, in input order.
+        """
+        files = self.get_files(paths)
+
+        with profile_stage("read_order"):
+            read_order = get_read_order(files, self.options.read_order)
+
+        pending = {}
+        next_idx = 0
+
+        for idx in read_order:
+            pending[idx] = self.analyze_file(files[idx])
+
+            while next_idx in pending:
+                record = pending.pop(next_idx)
+                next_idx += 1
+
+                if record is not None:
+                    yield record
+
+    def to_dataframe(self, paths: Union[str, List[str]]) -> pl.DataFrame:
+        """Analyzes audio files and collects their records in a
+        `pl.DataFrame` with the same columns written by the `--csv` option.
+
+        Args:
+            paths (Union[str, List[str]]): Audio files, folders containing
+                audio files or .csv or .parquet files listing audio files.
+
+        Returns:
+            pl.DataFrame: One row per analyzed file.
+        """
+        store = ResultStore(get_output_cols(self.options))
+
+        for record in self.analyze(paths):
+            store.append(record)
+
+        return store.to_polars()
+
+
+def analyze(paths: Union[str, List[str]], **options) -> Iterator[dict]:
+    """Analyzes audio files lazily. Shortcut for
+    `Analyzer(**options).analyze(paths)`.
+
+    Args:
+        paths (Union[str, List[str]]): Audio files, folders containing audio
+            files or .csv or .parquet files listing audio files.
+        **options: Analysis options named after the command line options.
+
+    Returns:
+        Iterator[dict]: Record of each file.
+    """
+    return Analyzer(**options).analyze(paths)
@@ -1,29 +1,64 @@
+from __future__ import annotations
 import os
+import sys
 import csv
 import random
+import queue
 import shutil
+import threading
 import numpy as np
-import polars as pl
-from copy import deepcopy
-from time import perf_counter
+from time import (
+    monotonic,
+    perf_counter
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait
+)
 from decimal import Decimal
-from numbers import Number
-from argparse import Namespace
+from functools import partial
+from itertools import (
+    chain,
+    compress
+)
+from contextlib import (
+    nullcontext,
+    redirect_stdout
+)
 from tqdm import tqdm
-from typing import List
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+    Union
+)
 from ..utils.config import (
     get_allowed_audio_file_extensions,
-    get_sppbar_color
+    get_sppbar_color,
+    set_color_enabled
 )
 from ..utils.io import (
     ask_confirmation,
+    copy_file,
     get_dir_files,
-    read_audio,
-    read_audio_metadata
+    get_read_order
+)
+from ..utils.collections import partition_by_weight
+from ..utils.diff import (
+    DIFF_CHANGES,
+    diff_results,
+    get_diff_summary
 )
-from ..utils.collections import flatten_nested_list
 from ..utils.fmt import (
     bytes_to_str,
+    dict_to_json,
     exit_error,
     exit_warning,
     printc as print,
@@ -32,107 +67,61 @@ from ..utils.fmt import (
     time_to_str
 )
 from ..utils.guards import is_file_with_ext
-from ..utils.hash import generate_sha256_from_file
-from ..utils.audio import (
-    ms_to_samples,
-    is_anomalous,
-    is_clipped,
-    is_silent,
-    peak_db,
-    rms_db,
-    spectral_rolloff
+from ..utils.index import (
+    DirIndex,
+    DirScan
+)
+from ..utils.manifest import (
+    ManifestReader,
+    is_manifest
+)
+from ..utils.memory import (
+    MemoryBudget,
+    MemoryTracker
+)
+from ..utils.store import (
+    ResultStore,
+    read_results,
+    read_results_dataframe
+)
+from ..utils.profile import (
+    Profiler,
+    get_profiler,
+    profile_fn,
+    profile_stage,
+    set_profiler
+)
+from ..utils.workers import WorkerPool
+from ..utils.transfer import (
+    get_tar_member_size,
+    get_tar_size,
+    make_dst_dirs,
+    run_transfers,
+    write_tar
+)
+from ..utils.exceptions import (
+    FilterExpressionError,
+    InvalidAudioFileError,
+    PreloadError,
+    ResultsError
+)
+from .. import __version__
+from ..analysis import (
+    analyze_file,
+    analyze_file_isolated,
+    estimate_memory_usage,
+    get_output_cols,
+    get_spectral_rolloff_batch,
+    matches_filter,
+    preload_file,
+    read_file_meta,
+    read_file_meta_isolated
 )
 
-
-def _matches_filter(
-        data: dict,
-        preload: pl.DataFrame,
-        expr: str
-) -> bool:
-    """Matches a filter expression against a set of file specifications.
-    
-    Args:
-        data (dict): Audio file specifications.
-        preload (pl.DataFrame): Preloaded data.
-        expr (str): Filter expression.
-    
-    Returns:
-        bool: `True` of the filter matches the contents of `data`, `False`
-            otherwise.
-    """
-    try:
-        # Set constrained globals and locals
-        if preload is not None:
-            data["preload"] = preload
-
-        result = eval(expr, {}, deepcopy(data))
-
-        if not isinstance(result, bool):
-            raise ValueError("Invalid return type")
-    
-    except Exception as e:
-        fields_repr = ", ".join(k for k in data)
-
-        exit_error(
-            f"Invalid --filter/--select expression '{expr}': {e}.\n"
-            "Only python expressions returning a bool value are valid. To "
-            "create a filter expression you can access any of the following "
-            f"fields of each file: {fields_repr}. "
-            "Please look at the repository README.md for further details",
-            writer=tqdm
-        )
-    
-    return result
-
-
-def _preload_file(
-        file: str,
-        has_header: bool = False,
-        truncate_ragged_lines: bool = False,
-        ignore_errors: bool = False
-) -> pl.DataFrame:
-    """Preloads a file in memory to be used with --filter/--select option.
-    
-    Args:
-        file (str): File to be loaded in memory as a `pl.DataFrame`.
-        has_header (bool): If `True`, the first column of the preloaded file
-            is assumed to be a header and will be ignored.
-    """
-    if not os.path.isfile(file):
-        exit_error(f"--preload file '{file}' not found")
-    
-    elif not is_file_with_ext(file, ext=[".csv", ".tsv", ".txt"]):
-        exit_error("--preload option only supports .csv, .tsv or .txt files")
-    
-    elif is_file_with_ext(file, ext=".csv"):
-        separator = ","
-    
-    elif is_file_with_ext(file, ext=".txt"):
-        separator = " "
-    
-    elif is_file_with_ext(file, ext=".tsv"):
-        separator = "\t"
-    
-    else:
-        raise AssertionError
-    
-    try:
-        preload = pl.read_csv(
-            file,
-            separator=separator,
-            has_header=has_header,
-            truncate_ragged_lines=truncate_ragged_lines,
-            ignore_errors=ignore_errors
-        )
-        
-    except pl.exceptions.ComputeError as e:
-        exit_error(
-            f"The following error occurred while opening '{file}': {e}\n\n"
-            "If the issue was caused by 'truncate_ragged_lines', please "
-            "consider using --preload-truncate-ragged-lines"
-        )
-    
-    return preload
+if TYPE_CHECKING:
+    import polars as pl
+    from argparse import Namespace
+    from ..utils.spectral import SpectralRolloffBatch
 
 
 def _audio_file_meta_repr_from_dict(data: dict, max_fname_chars: int) -> str:
@@ -316,6 +305,11 @@ def _audio_file_repr_from_dict(
             f"{db_repr}"
         )
 
+    # NOTE: Stats of probed files only cover the probed windows
+    if data.get("probe_duration_seconds") is not None:
+        probe_repr = time_to_str(data["probe_duration_seconds"], abbrev=True)
+        repr = f"{repr}  probe:{probe_repr}"
+
     if (
         data["is_clipped"]
         or data["is_anomalous"]
@@ -343,119 +337,475 @@ def _create_dir_if_missing(dir: str) -> None:
             exit_error(f"An unexpected error ocurred: {e}")
 
 
-def _perform_post_action(files: List[str], args: Namespace) -> None:
+def _get_copy_mode(args: Namespace) -> str:
+    """Returns the copy mode used by copy and link post actions.
+
+    Args:
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        str: One of `copy`, `hardlink`, `symlink` or `reflink`.
+    """
+    if args.copy_mode is not None:
+        return args.copy_mode
+
+    return "hardlink" if args.post_action in ("ln", "ln+sp") else "copy"
+
+
+def _print_copy_fallback(fallback_files: int, verb: str) -> None:
+    """Warns the user about files that were copied instead of linked.
+
+    Args:
+        fallback_files (int): Number of files that were copied instead.
+        verb (str): Verb describing the requested action.
+    """
+    if fallback_files > 0:
+        print_warning(
+            f"{fallback_files} file(s) could not be {verb} (e.g. because "
+            "they are in a different device) and were copied instead"
+        )
+
+
+def _get_post_action_dst(file: str, output: str, args: Namespace) -> str:
+    """Returns the destination of a file copied, linked or moved by a post
+    action.
+
+    Args:
+        file (str): Source file.
+        output (str): Output folder.
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        str: Destination file.
+    """
+    if args.recursive and args.post_action_preserve_subfolders:
+        # Get relative path
+        dst = file.replace(args.input[0], "", 1)
+        dst = dst.split(os.sep)  # Avoid double-slashes xplatform
+        return os.path.join(output, *dst)
+
+    return os.path.join(output, os.path.basename(file))
+
+
+def _get_post_action_tasks(
+        store: ResultStore,
+        idxs: List[int],
+        outputs: List[str],
+        args: Namespace
+) -> List[Tuple[str, str, int]]:
+    """Creates the transfer tasks of a post action. All destination folders
+    are created once beforehand, and files whose destination already exists
+    are skipped.
+
+    Args:
+        store (ResultStore): Targeted files specifications.
+        idxs (List[int]): Indices of the files to transfer in `store`.
+        outputs (List[str]): Output folder of each file.
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        List[Tuple[str, str, int]]: Source file, destination file and size in
+            bytes of each transfer.
+    """
+    srcs = [store.get_file(idx) for idx in idxs]
+    dsts = [
+        _get_post_action_dst(src, output, args)
+        for src, output in zip(srcs, outputs)
+    ]
+    sizes = store.get_column("size_bytes")
+
+    try:
+        existing_dsts = make_dst_dirs(dsts)
+
+    except Exception as e:
+        exit_error(f"An unexpected error ocurred: {e}")
+
+    tasks = []
+
+    # Warn user if a file already exists
+    for idx, src, dst in zip(idxs, srcs, dsts):
+        dst_key = os.path.normpath(dst)
+
+        if dst_key in existing_dsts:
+            print_warning(f"File '{dst}' already exists")
+            continue
+
+        existing_dsts.add(dst_key)
+        tasks.append((src, dst, int(sizes[idx])))
+
+    return tasks
+
+
+def _run_post_action_tasks(
+        tasks: List[Tuple[str, Optional[str], int]],
+        fn: Callable,
+        desc: str,
+        action_repr: str,
+        args: Namespace,
+        on_done: Optional[Callable] = None
+) -> int:
+    """Runs the transfer tasks of a post action using
+    --post-action-workers threads and prints the resulting throughput.
+
+    Args:
+        tasks (List[Tuple[str, Optional[str], int]]): Transfer tasks.
+        fn (Callable): Function called as `fn(src, dst)` for every task.
+        desc (str): Progress bar description.
+        action_repr (str): Action description used in error messages (e.g.
+            `copying`).
+        args (Namespace): Main namespace containing user provided input.
+        on_done (Optional[Callable]): Function called as
+            `on_done(src, dst, result)` after every successful task.
+
+    Returns:
+        int: Number of successful tasks.
+    """
+    def _on_error(src: str, dst: Optional[str], e: Exception) -> None:
+        dst_repr = "" if dst is None else f" to '{dst}'"
+        print_warning(
+            f"An error ocurred while {action_repr} '{src}'{dst_repr}: {e}",
+            writer=tqdm
+        )
+
+    done_files, done_bytes, elapsed_time = run_transfers(
+        tasks,
+        fn=profile_fn("transfer", fn),
+        num_workers=args.post_action_workers,
+        on_done=on_done,
+        on_error=_on_error,
+        desc=desc,
+        colour=get_sppbar_color()
+    )
+    _print_throughput(done_files, done_bytes, elapsed_time)
+
+    return done_files
+
+
+def _print_throughput(
+        done_files: int,
+        done_bytes: int,
+        elapsed_time: float
+) -> None:
+    """Prints the throughput of a post action.
+
+    Args:
+        done_files (int): Number of processed files.
+        done_bytes (int): Number of processed bytes.
+        elapsed_time (float): Elapsed time in seconds.
+    """
+    elapsed_time = max(elapsed_time, 1e-9)
+    print(
+        f"Post action throughput: {done_files / elapsed_time:.1f} file(s)/s, "
+        f"{done_bytes / 1024 ** 2 / elapsed_time:.1f} MB/s "
+        f"({time_to_str(elapsed_time, abbrev=True)})"
+    )
+
+
+def _get_splits(
+        store: ResultStore,
+        args: Namespace,
+        shuffle: bool = True
+) -> List[List[int]]:
+    """Shuffles a set of files and splits them into
+    --post-action-num-splits partitions. If --split-balance is `duration` or
+    `size`, files are assigned to partitions so that all of them have
+    approximately the same total duration or size, respectively. Otherwise,
+    all partitions have approximately the same number of files.
+
+    Args:
+        store (ResultStore): Targeted files specifications.
+        args (Namespace): Main namespace containing user provided input.
+        shuffle (bool): If `True`, files are shuffled using --random-seed
+            before being split.
+
+    Returns:
+        List[List[int]]: Indices in `store` of the files of each partition.
+    """
+    idxs = list(range(len(store)))
+
+    if shuffle:
+        random.seed(args.random_seed)
+        random.shuffle(idxs)
+
+    if args.split_balance == "count":
+        splits_idxs = np.array_split(
+            np.arange(len(idxs)),
+            args.post_action_num_splits
+        )
+    
+    else:
+        weight_col = (
+            "duration_seconds" if args.split_balance == "duration"
+            else "size_bytes"
+        )
+        splits_idxs = partition_by_weight(
+            store.get_column(weight_col)[idxs].tolist(),
+            args.post_action_num_splits
+        )
+
+    splits = [[idxs[idx] for idx in split_idxs] for split_idxs in splits_idxs]
+    
+    if args.split_balance == "duration":
+        durations = store.get_column("duration_seconds")
+        split_durations = [durations[split].sum() for split in splits]
+        print(
+            "Partition duration(s) between "
+            f"{time_to_str(min(split_durations))} and "
+            f"{time_to_str(max(split_durations))}"
+        )
+    
+    elif args.split_balance == "size":
+        sizes = store.get_column("size_bytes")
+        split_sizes = [int(sizes[split].sum()) for split in splits]
+        print(
+            f"Partition size(s) between {bytes_to_str(min(split_sizes))} and "
+            f"{bytes_to_str(max(split_sizes))}"
+        )
+
+    return splits
+
+
+def _get_split_dirs(args: Namespace) -> List[str]:
+    """Creates the output folder of each partition.
+
+    Args:
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        List[str]: Output folder of each partition.
+    """
+    split_dirname_zfill = len(str(args.post_action_num_splits - 1))
+    split_dirs = []
+
+    for split_idx in range(args.post_action_num_splits):
+        split_dir = os.path.join(
+            args.post_action_output,
+            f"{args.post_action_split_dirname}"
+            f"{str(split_idx).zfill(split_dirname_zfill)}"
+        )
+        _create_dir_if_missing(split_dir)
+        split_dirs.append(split_dir)
+
+    return split_dirs
+
+
+def _get_shards(
+        store: ResultStore,
+        args: Namespace
+) -> List[List[Tuple[str, int]]]:
+    """Groups files into .tar shards of at most --post-action-shard-size
+    megabytes. Each file is assigned a WebDataset key, that is, its path
+    relative to the input folder it belongs to without extension, where dots
+    in the filename are replaced by underscores because WebDataset uses them
+    to separate keys from extensions.
+
+    Args:
+        store (ResultStore): Targeted files specifications.
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        List[List[Tuple[str, int]]]: Key and index in `store` of the files of
+            each shard.
+    """
+    max_shard_size = args.post_action_shard_size * 1024 ** 2
+    sizes = store.get_column("size_bytes")
+    shards = [[]]
+    shard_size = 0
+    keys = set()
+    input_dirs = [i for i in args.input if os.path.isdir(i)]
+
+    for idx in range(len(store)):
+        file = store.get_file(idx)
+        rel_keys = (os.path.relpath(file, d) for d in input_dirs)
+        key = next(
+            (k for k in rel_keys if not k.startswith(os.pardir)),
+            os.path.basename(file)
+        )
+
+        key_dirname, key_basename = os.path.split(os.path.splitext(key)[0])
+        key = "/".join(
+            [*key_dirname.split(os.sep), key_basename.replace(".", "_")]
+        ).lstrip("/")
+
+        # Avoid files with different extensions to be grouped as one sample
+        if key in keys:
+            key_idx = 1
+
+            while f"{key}_{key_idx}" in keys:
+                key_idx += 1
+
+            key = f"{key}_{key_idx}"
+
+        keys.add(key)
+
+        member_size = get_tar_member_size(
+            int(sizes[idx]),
+            name=f"{key}{os.path.splitext(file)[1].lower()}"
+        )
+
+        if args.post_action_shard_meta:
+            member_size += get_tar_member_size(
+                len(dict_to_json(store[idx]).encode("utf-8")),
+                name=f"{key}.json"
+            )
+
+        if len(shards[-1]) > 0 and (
+            get_tar_size(shard_size + member_size) > max_shard_size
+        ):
+            shards.append([])
+            shard_size = 0
+
+        shards[-1].append((key, idx))
+        shard_size += member_size
+
+    return shards
+
+
+def _get_shard_members(
+        shard: List[Tuple[str, int]],
+        store: ResultStore,
+        args: Namespace
+) -> Iterator[Tuple[str, Union[str, bytes]]]:
+    """Yields the members of a .tar shard, adding a .json sidecar with the
+    specifications of each file if --post-action-shard-meta is enabled.
+
+    Args:
+        shard (List[Tuple[str, int]]): Key and index in `store` of each file.
+        store (ResultStore): Targeted files specifications.
+        args (Namespace): Main namespace containing user provided input.
+
+    Yields:
+        Tuple[str, Union[str, bytes]]: Name of the member and its content.
+    """
+    for key, idx in shard:
+        file = store.get_file(idx)
+        yield f"{key}{os.path.splitext(file)[1].lower()}", file
+
+        if args.post_action_shard_meta:
+            yield f"{key}.json", dict_to_json(store[idx]).encode("utf-8")
+
+
+def _perform_post_action(store: ResultStore, args: Namespace) -> None:
     """Perform post actions such as copying, moving or deleting files that
     match a certain filter.
     
     Args:
-        files (List[str]): List of targeted files.
+        store (ResultStore): Targeted files specifications.
         args (Namespace): Main namespace containing user provided input.
     """
-    if args.post_action == "cp":
+    if args.post_action in ("cp", "ln", "cp+sp", "ln+sp"):
         output = args.post_action_output
-        print(f"\n{len(files)} file(s) will be copied to '{output}'")
+        copy_mode = _get_copy_mode(args)
+        verb = "copied" if copy_mode == "copy" else "linked"
+        fallback_files = 0
+
+        if args.post_action in ("cp+sp", "ln+sp"):
+            # Check splits are possible without 0 files in any of them
+            if len(store) < args.post_action_num_splits:
+                exit_error(
+                    "The number of requested splits "
+                    f"({args.post_action_num_splits}) is bigger than the "
+                    f"number of file(s) ({len(store)})"
+                )
+
+            print(
+                f"\n{len(store)} file(s) will be {verb} and split into "
+                f"{args.post_action_num_splits} partition(s)"
+            )
+        
+        else:
+            print(f"\n{len(store)} file(s) will be {verb} to '{output}'")
 
         if not args.unattended:
             ask_confirmation()
         
-        _create_dir_if_missing(args.post_action_output)
-
-        copied_files = 0
-
-        # Copy files and warn user if a file already exists
-        for f in tqdm(
-            files,
-            desc="Copying files",
-            leave=False,
-            unit="file",
-            colour=get_sppbar_color()
-        ):
-            try:
-                if args.recursive and args.post_action_preserve_subfolders:
-                    # Get relative path
-                    dst = f.replace(args.input, "", 1)
-                    dst = dst.split(os.sep)  # Avoid double-slashes xplatform
-                    dst = os.path.join(args.post_action_output, *dst)
-
-                    # Create subfolders if structure does not exist yet
-                    os.makedirs(os.path.dirname(dst), exist_ok=True)
-                
-                else:
-                    dst = os.path.join(output, os.path.basename(f))
-
-                if os.path.exists(dst):
-                    print_warning(
-                        f"File '{dst}' already exists",
-                        writer=tqdm
-                    )
-                    continue
+        _create_dir_if_missing(output)
+
+        if args.post_action in ("cp+sp", "ln+sp"):
+            # Shuffle files and create splits specs
+            splits = _get_splits(store, args)
+            idxs = [idx for split in splits for idx in split]
+            outputs = [
+                split_dir
+                for split, split_dir in zip(splits, _get_split_dirs(args))
+                for _ in split
+            ]
 
-                else:
-                    shutil.copy(f, dst)
-                    copied_files += 1
-            
-            except Exception as e:
-                print_warning(
-                    f"An error ocurred while copying '{f}' to '{dst}': {e}",
-                    writer=tqdm
-                )
-            
-        print_fn = (print_warning if copied_files != len(files) else print)
-        print_fn(f"{copied_files}/{len(files)} file(s) copied to '{output}'")
+        else:
+            idxs = list(range(len(store)))
+            outputs = [output] * len(store)
+
+        def _copy(src: str, dst: str) -> bool:
+            return copy_file(src, dst, mode=copy_mode) != copy_mode
+
+        def _count_fallback(src: str, dst: str, is_fallback: bool) -> None:
+            nonlocal fallback_files
+            fallback_files += int(is_fallback)
+
+        copied_files = _run_post_action_tasks(
+            _get_post_action_tasks(store, idxs, outputs, args),
+            fn=_copy,
+            desc="Copying files" if copy_mode == "copy" else "Linking files",
+            action_repr="copying",
+            args=args,
+            on_done=_count_fallback
+        )
+        print_fn = (print_warning if copied_files != len(store) else print)
+        print_fn(f"{copied_files}/{len(store)} file(s) {verb} to '{output}'")
+        _print_copy_fallback(fallback_files, verb)
     
-    elif args.post_action == "mv":
+    elif args.post_action in ("mv", "mv+sp"):
         output = args.post_action_output
-        print(f"\n{len(files)} file(s) will be moved to '{output}'")
+
+        if args.post_action == "mv+sp":
+            # Check splits are possible without 0 files in any of them
+            if len(store) < args.post_action_num_splits:
+                exit_error(
+                    "The number of requested splits "
+                    f"({args.post_action_num_splits}) is bigger than the "
+                    f"number of file(s) ({len(store)})"
+                )
+
+            print(
+                f"\n{len(store)} file(s) will be moved and split into "
+                f"{args.post_action_num_splits} partition(s)"
+            )
+        
+        else:
+            print(f"\n{len(store)} file(s) will be moved to '{output}'")
 
         if not args.unattended:
             ask_confirmation()
         
-        _create_dir_if_missing(args.post_action_output)
-    
-        # Move files and warn user if a file already exists
-        moved_files = 0
+        _create_dir_if_missing(output)
+
+        if args.post_action == "mv+sp":
+            # Shuffle files and create splits specs
+            splits = _get_splits(store, args)
+            idxs = [idx for split in splits for idx in split]
+            outputs = [
+                split_dir
+                for split, split_dir in zip(splits, _get_split_dirs(args))
+                for _ in split
+            ]
 
-        # Move audio files and warn user if a file already exists
-        for f in tqdm(
-            files,
+        else:
+            idxs = list(range(len(store)))
+            outputs = [output] * len(store)
+    
+        moved_files = _run_post_action_tasks(
+            _get_post_action_tasks(store, idxs, outputs, args),
+            fn=shutil.move,
             desc="Moving audio files",
-            leave=False,
-            unit="file",
-            colour=get_sppbar_color()
-        ):
-            try:
-                if args.recursive and args.post_action_preserve_subfolders:
-                    # Get relative path
-                    dst = f.replace(args.input, "", 1)
-                    dst = dst.split(os.sep)  # Avoid double-slashes xplatform
-                    dst = os.path.join(args.post_action_output, *dst)
-
-                    # Create subfolders if structure does not exist yet
-                    os.makedirs(os.path.dirname(dst), exist_ok=True)
-                
-                else:
-                    dst = os.path.join(output, os.path.basename(f))
-
-                if os.path.exists(dst):
-                    print_warning(f"File '{dst}' already exists", writer=tqdm)
-                    continue
-                    
-                else:
-                    shutil.move(f, dst)
-                    moved_files += 1
-            
-            except Exception as e:
-                print_warning(
-                    f"An error ocurred while moving '{f}' to '{dst}': {e}",
-                    writer=tqdm
-                )
-            
-        print_fn = (print_warning if moved_files != len(files) else print)
-        print_fn(f"{moved_files}/{len(files)} file(s) moved to '{output}'")
+            action_repr="moving",
+            args=args
+        )
+        print_fn = (print_warning if moved_files != len(store) else print)
+        print_fn(f"{moved_files}/{len(store)} file(s) moved to '{output}'")
     
     elif args.post_action == "rm":
         print(
-            f"\n{len(files)} file(s) will be deleted. This action cannot be "
+            f"\n{len(store)} file(s) will be deleted. This action cannot be "
             "undone"
         )
 
@@ -463,238 +813,1327 @@ def _perform_post_action(files: List[str], args: Namespace) -> None:
             ask_confirmation()
         
         # Delete files
-        for f in tqdm(
-            files,
+        deleted_files = _run_post_action_tasks(
+            [
+                (store.get_file(idx), None, int(size))
+                for idx, size in enumerate(store.get_column("size_bytes"))
+            ],
+            fn=lambda src, _: os.remove(src),
             desc="Deleting files",
-            leave=False,
-            unit="file",
-            colour=get_sppbar_color()
-        ):
-            try:
-                os.remove(f)
-            
-            except Exception as e:
-                print_warning(
-                    f"An error ocurred while deleting '{f}': {e}",
-                    writer=tqdm
-                )
-    
-    elif args.post_action == "cp+sp":
-        # Check splits are possible without 0 files in any of them
-        if len(files) < args.post_action_num_splits:
-            exit_error(
-                "The number of requested splits "
-                f"({args.post_action_num_splits}) is bigger than the number of"
-                f" file(s) ({len(files)})"
-            )
+            action_repr="deleting",
+            args=args
+        )
+        print_fn = (print_warning if deleted_files != len(store) else print)
+        print_fn(f"{deleted_files}/{len(store)} file(s) deleted")
 
+    elif args.post_action == "tar":
+        output = args.post_action_output
+        shards = _get_shards(store, args)
         print(
-            f"\n{len(files)} file(s) will be copied and split into "
-            f"{args.post_action_num_splits} partition(s)"
+            f"\n{len(store)} file(s) will be packed into {len(shards)} .tar "
+            f"shard(s) in '{output}'"
         )
 
         if not args.unattended:
             ask_confirmation()
-        
-        _create_dir_if_missing(args.post_action_output)
 
-        # Shuffle files and create splits specs
-        random.seed(args.random_seed)
-        random.shuffle(files)
-        splits = np.array_split(files, args.post_action_num_splits)
-        split_dirname_zfill = len(str(args.post_action_num_splits - 1))
-        copied_files = 0
-
-        for split_idx, split_data in enumerate(splits):
-            split_files = split_data.tolist()
-            split_dir = os.path.join(
-                args.post_action_output,
-                f"{args.post_action_split_dirname}"
-                f"{str(split_idx).zfill(split_dirname_zfill)}"
-            )
-            _create_dir_if_missing(split_dir)
-
-            # Copy files and warn user if a file already exists
-            for f in tqdm(
-                split_files,
-                desc=(
-                    f"Copying files of partition {split_idx + 1}/"
-                    f"{args.post_action_num_splits}"
-                ),
-                leave=False,
-                unit="file",
-                colour=get_sppbar_color()
-            ):
-                try:
-                    if args.recursive and args.post_action_preserve_subfolders:
-                        # Get relative path
-                        dst = f.replace(args.input, "", 1)
-                        dst = dst.split(os.sep)  # Avoid double-slashes
-                        dst = os.path.join(split_dir, *dst)
-
-                        # Create subfolders if structure does not exist yet
-                        os.makedirs(os.path.dirname(dst), exist_ok=True)
-                    
-                    else:
-                        dst = os.path.join(split_dir, os.path.basename(f))
-                    
-                    if os.path.exists(dst):
-                        print_warning(
-                            f"File '{dst}' already exists",
-                            writer=tqdm
-                        )
-                        continue
+        _create_dir_if_missing(output)
+
+        shard_zfill = max(6, len(str(len(shards) - 1)))
+        shard_files = [
+            os.path.join(output, f"shard_{str(idx).zfill(shard_zfill)}.tar")
+            for idx in range(len(shards))
+        ]
+
+        for shard_file in shard_files:
+            if os.path.exists(shard_file):
+                exit_error(
+                    f"File '{shard_file}' already exists. Please choose an "
+                    "empty --post-action-output folder"
+                )
 
-                    else:
-                        shutil.copy(f, dst)
-                        copied_files += 1
+        sizes = store.get_column("size_bytes")
+        packed_files = 0
+        packed_bytes = 0
+        start_time = perf_counter()
+
+        # Write shards in parallel and stream files from disk into them
+        pbar = tqdm(
+            total=len(store),
+            desc="Packing files",
+            leave=False,
+            unit="file",
+            colour=get_sppbar_color()
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=args.post_action_workers
+        ) as executor:
+            futures = {
+                executor.submit(
+                    profile_fn("transfer", write_tar),
+                    shard_file,
+                    _get_shard_members(shard, store, args)
+                ): (shard_file, shard)
+                for shard_file, shard in zip(shard_files, shards)
+            }
+
+            for future in as_completed(futures):
+                shard_file, shard = futures[future]
+
+                try:
+                    future.result()
+                    packed_files += len(shard)
+                    packed_bytes += sum(int(sizes[idx]) for _, idx in shard)
                 
                 except Exception as e:
                     print_warning(
-                        f"An error ocurred while copying '{f}' to '{dst}': {e}",
+                        f"An error ocurred while writing '{shard_file}': {e}",
                         writer=tqdm
                     )
-
-        print_fn = (print_warning if copied_files != len(files) else print)
+                
+                pbar.update(len(shard))
+        
+        pbar.close()
+        _print_throughput(
+            packed_files,
+            packed_bytes,
+            perf_counter() - start_time
+        )
+        print_fn = (print_warning if packed_files != len(store) else print)
         print_fn(
-           f"{copied_files}/{len(files)} file(s) copied to "
-           f"'{args.post_action_output}'"
+            f"{packed_files}/{len(store)} file(s) packed into {len(shards)} "
+            f".tar shard(s) in '{output}'"
+        )
+
+    elif args.post_action == "dump":
+        print(
+            f"\n{len(store)} file path(s) will be dumped to "
+            f"'{args.post_action_output}'"
+        )
+
+        if not args.unattended:
+            ask_confirmation()
+
+        with open(args.post_action_output, "w") as f:
+            f.write("\n".join(store.get_column("file")))
+        
+        print(
+            f"\n{len(store)} file path(s) dumped to "
+            f"'{args.post_action_output}'"
+        )
+
+    elif args.post_action == "dump+sp":
+        if args.post_action_num_splits > len(store):
+            exit_error(
+                "--post-action-num-splits should be equal or smaller than "
+                "the number of files"
+            )
+        
+        split_file_repr, ext = os.path.splitext(args.post_action_output)
+        split_file_repr += f"_*{ext}"
+        
+        print(
+            f"\n{len(store)} file path(s) will be dumped to "
+            f"{args.post_action_num_splits} file(s) '{split_file_repr}'"
+        )
+
+        if not args.unattended:
+            ask_confirmation()
+        
+        # NOTE: Files are only shuffled if splits are balanced
+        splits = _get_splits(
+            store,
+            args,
+            shuffle=args.split_balance != "count"
+        )
+        zfill = len(str(len(splits)))
+
+        for split_idx, split in enumerate(splits):
+            filename, ext = os.path.splitext(args.post_action_output)
+            filename += f"_{str(split_idx).zfill(zfill)}{ext}"
+
+            with open(filename, "w") as f:
+                f.write("\n".join(store.get_file(idx) for idx in split))
+         
+        print(
+            f"\n{len(store)} file(s) dumped to "
+            f"{args.post_action_num_splits} file(s) '{split_file_repr}'"
+        )
+
+    else:
+        raise AssertionError
+
+
+def _write_csv_row(file: str, cols: List[str], data: dict) -> None:
+    """Appends the specifications of an audio file to a .csv file.
+
+    Args:
+        file (str): Output .csv file.
+        cols (List[str]): Columns of the .csv file.
+        data (dict): Audio file specifications.
+    """
+    with open(file, "a") as f:
+        writer = csv.DictWriter(f, fieldnames=cols, extrasaction="ignore")
+        writer.writerow(data)
+
+
+def _print_profile(profiler: Profiler) -> None:
+    """Prints the time spent in each processing stage.
+
+    !!! note
+        Stages run by several threads (e.g. post action transfers) may add
+        up to more than the elapsed time.
+
+    Args:
+        profiler (Profiler): Profiler containing the stage timers.
+    """
+    elapsed_time = max(profiler.get_elapsed_time(), 1e-9)
+    print("\nProfile:")
+    print(
+        "stage".ljust(18)
+        + "count".rjust(9)
+        + "total".rjust(11)
+        + "%".rjust(7)
+        + "mean".rjust(11)
+        + "p50".rjust(11)
+        + "p90".rjust(11)
+        + "p99".rjust(11)
+        + "max".rjust(11)
+    )
+
+    for name, stats in profiler.get_stats():
+        print(
+            name.ljust(18)
+            + str(stats["count"]).rjust(9)
+            + f"{stats['total']:.3f}s".rjust(11)
+            + f"{100.0 * stats['total'] / elapsed_time:.1f}".rjust(7)
+            + "".join(
+                f"{stats[k] * 1e3:.2f}ms".rjust(11)
+                for k in ("mean", "p50", "p90", "p99", "max")
+            )
+        )
+    
+    print(f"Profiled time: {time_to_str(elapsed_time, abbrev=False)}")
+
+
+def _is_concurrent(args: Namespace) -> bool:
+    """Returns whether several files, or several parts of a file, may be
+    analyzed at the same time.
+
+    Args:
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        bool: `True` if files may be analyzed concurrently.
+    """
+    return (
+        len(args.input) > 1
+        or args.segment_workers > 1
+        or (args.timeout is not None and args.process_workers > 1)
+    )
+
+
+def _print_memory(memory: MemoryTracker) -> None:
+    """Prints the memory used by each processing stage and the files using
+    the most memory.
+
+    Args:
+        memory (MemoryTracker): Memory tracker.
+    """
+    def _bytes_repr(size: Optional[int]) -> str:
+        return "-" if size is None else bytes_to_str(size)
+
+    print("\nMemory:")
+
+    # NOTE: Peaks are process-wide, so they cannot be attributed to stages
+    # or files analyzed at the same time
+    if not memory.per_stage:
+        print(
+            "Per-stage and per-file usage is not tracked while files are "
+            "analyzed concurrently"
+        )
+        print(f"Peak memory: {bytes_to_str(memory.get_peak_rss())}")
+
+        if memory.get_peak_alloc() is not None:
+            print(
+                f"Peak allocated memory: "
+                f"{bytes_to_str(memory.get_peak_alloc())}"
+            )
+
+        return
+
+    print(
+        "stage".ljust(18)
+        + "count".rjust(9)
+        + "peak rss".rjust(11)
+        + "max rss +".rjust(11)
+        + "max alloc".rjust(11)
+    )
+
+    for name, stats in memory.get_stats():
+        print(
+            name.ljust(18)
+            + str(stats["count"]).rjust(9)
+            + _bytes_repr(stats["peak_rss_bytes"]).rjust(11)
+            + _bytes_repr(stats["max_rss_increase_bytes"]).rjust(11)
+            + _bytes_repr(stats["max_alloc_peak_bytes"]).rjust(11)
+        )
+    
+    top_files = memory.get_top_files()
+
+    if len(top_files) > 0:
+        print("\nTop memory consumers:")
+        print(
+            "rss +".rjust(9)
+            + "alloc".rjust(9)
+            + "  "
+            + "stage".ljust(18)
+            + "file"
         )
+
+        for usage in top_files:
+            print(
+                _bytes_repr(usage["rss_increase_bytes"]).rjust(9)
+                + _bytes_repr(usage["alloc_peak_bytes"]).rjust(9)
+                + "  "
+                + usage["stage"].ljust(18)
+                + usage["file"]
+            )
     
-    elif args.post_action == "mv+sp":
-        # Check splits are possible without 0 files in any of them
-        if len(files) < args.post_action_num_splits:
+    print(f"Peak memory: {bytes_to_str(memory.get_peak_rss())}")
+
+
+def _get_glob_stats(
+        store: ResultStore,
+        skipped_files: int,
+        args: Namespace,
+        rows: slice = slice(None)
+) -> dict:
+    """Computes the global stats shown in the summary.
+
+    Args:
+        store (ResultStore): Results of all files shown in the output.
+        skipped_files (int): Number of files skipped due to --max-duration.
+        args (Namespace): Main namespace containing user provided input.
+        rows (slice): Results of `store` the stats are computed from.
+
+    Returns:
+        dict: Global stats.
+    """
+    def _get_column(field: str) -> np.ndarray:
+        return store.get_column(field)[rows]
+
+    duration = _get_column("duration_seconds")
+    fs = _get_column("fs")
+    fs_is_known = ~_get_column("is_invalid")
+
+    # NOTE: Files whose metadata could be read but that could not be
+    # analyzed (e.g. due to --timeout) are only counted as invalid files
+    num_channels = np.where(fs_is_known, _get_column("num_channels"), 0)
+
+    # Sample rates in order of appearance (unknown for invalid files)
+    fs_values, fs_idxs = np.unique(
+        np.where(fs_is_known, fs, -1),
+        return_index=True
+    )
+    fs_list = [
+        None if v < 0 else int(v) for _, v in sorted(zip(fs_idxs, fs_values))
+    ]
+
+    glob_stats = {
+        "fs": fs_list,
+        "mono_files": int(np.count_nonzero(num_channels == 1)),
+        "stereo_files": int(np.count_nonzero(num_channels == 2)),
+        "multichannel_files": int(np.count_nonzero(num_channels > 2)),
+        "skipped_files": skipped_files,
+        "invalid_files": 0,
+        "anomalous_files": 0,
+        "clipped_files": 0,
+        "silent_files": 0,
+        "min_duration": float(duration.min()) if len(duration) > 0 else None,
+        "max_duration": float(duration.max()) if len(duration) > 0 else None,
+        "total_duration": float(duration.sum()),
+        "probe_duration": (
+            float(np.nansum(_get_column("probe_duration_seconds")))
+            if "probe_duration_seconds" in store.fields else None
+        ),
+        "total_size_bytes": int(_get_column("size_bytes").sum())
+    }
+
+    if not args.meta:
+        for stat, col in (
+            ("invalid_files", "is_invalid"),
+            ("anomalous_files", "is_anomalous"),
+            ("clipped_files", "is_clipped"),
+            ("silent_files", "is_silent")
+        ):
+            glob_stats[stat] = int(np.count_nonzero(_get_column(col)))
+
+    return glob_stats
+
+
+def _exit_invalid_file_error(e: InvalidAudioFileError) -> None:
+    """Exits the program because a file could not be parsed.
+
+    Args:
+        e (InvalidAudioFileError): Raised exception.
+    """
+    exit_error(
+        f"{e}. Use --skip-invalid-files to ignore unparseable files and "
+        "continue analysis",
+        writer=tqdm
+    )
+
+
+def _print_invalid_manifest_rows(
+        manifest: ManifestReader,
+        max_rows: int = 10
+) -> None:
+    """Reports the rows of a manifest that do not contain a valid audio
+    file.
+
+    Args:
+        manifest (ManifestReader): Manifest whose files were read.
+        max_rows (int): Maximum number of rows listed.
+    """
+    invalid_rows = manifest.invalid_rows
+
+    if len(invalid_rows) == 0:
+        return
+
+    print_error(
+        f"{len(invalid_rows)} row(s) of '{manifest.col}' column of "
+        f"'{manifest.file}' contain an invalid filename and were skipped. "
+        "Please check that such files exist, have a valid --extension "
+        "option, and can be reached"
+    )
+
+    for row_idx, file in invalid_rows[:max_rows]:
+        file_repr = "(empty)" if file is None else f"'{file}'"
+        print_error(f"  Row #{row_idx}: {file_repr}")
+
+    if len(invalid_rows) > max_rows:
+        print_error(f"  ... and {len(invalid_rows) - max_rows} more row(s)")
+
+
+def _analyze_file(
+        file: str,
+        args: Namespace,
+        memory_budget: Optional[MemoryBudget] = None,
+        spectral_batch: Optional[SpectralRolloffBatch] = None,
+        workers: Optional[WorkerPool] = None
+) -> Tuple[Optional[dict], bool]:
+    """Reads the metadata of a file and, unless --meta is enabled, its
+    statistics.
+
+    Args:
+        file (str): Input audio file.
+        args (Namespace): Main namespace containing user provided input.
+        memory_budget (Optional[MemoryBudget]): Budget the estimated
+            memory usage of the file is reserved from while it is analyzed.
+        spectral_batch (Optional[SpectralRolloffBatch]): Batch the spectral
+            rolloff of the file is added to. If given, its specifications
+            are complete once the batch is flushed.
+        workers (Optional[WorkerPool]): Worker processes the file is read
+            and analyzed in within --timeout seconds.
+
+    Returns:
+        Tuple[Optional[dict], bool]: Audio file specifications (`None` if the
+            file is skipped) and whether the file is skipped due to
+            --max-duration.
+    """
+    deadline = (
+        monotonic() + args.timeout if workers is not None else None
+    )
+
+    # Get metadata
+    try:
+        with profile_stage("metadata", file=file):
+            if workers is not None:
+                audio_meta = read_file_meta_isolated(
+                    file,
+                    args,
+                    workers,
+                    deadline
+                )
+
+            else:
+                audio_meta = read_file_meta(
+                    file,
+                    skip_invalid_files=args.skip_invalid_files
+                )
+    
+    except InvalidAudioFileError as e:
+        _exit_invalid_file_error(e)
+    
+    if args.meta:
+        return audio_meta, False
+
+    # Skip long files
+    if audio_meta["duration_seconds"] > args.max_duration:
+        return None, True
+    
+    # NOTE: The file waits until its estimated memory usage fits in
+    # --memory-budget, together with the files analyzed by other threads
+    reservation_start = monotonic()
+
+    if memory_budget is not None:
+        reservation = memory_budget.reserve(
+            estimate_memory_usage(audio_meta, args)
+        )
+
+    else:
+        reservation = nullcontext()
+
+    # Update audio stats
+    try:
+        with reservation:
+            if workers is not None:
+                # NOTE: Time spent waiting for --memory-budget does not
+                # count towards --timeout
+                deadline = monotonic() + (deadline - reservation_start)
+                analyze_file_isolated(audio_meta, args, workers, deadline)
+
+            else:
+                analyze_file(audio_meta, args, spectral_batch=spectral_batch)
+    
+    except InvalidAudioFileError as e:
+        _exit_invalid_file_error(e)
+
+    return audio_meta, False
+
+
+def _finish_file(
+        audio_meta: Optional[dict],
+        is_skipped: bool,
+        preload: Optional[pl.DataFrame],
+        args: Namespace,
+        on_read: Optional[Callable[[Optional[dict], bool], None]] = None
+) -> Tuple[Optional[dict], bool]:
+    """Applies --filter or --select to the specifications of a file
+    returned by `_analyze_file`.
+
+    Args:
+        audio_meta (Optional[dict]): Audio file specifications (`None` if
+            the file is skipped).
+        is_skipped (bool): Whether the file is skipped due to
+            --max-duration.
+        preload (Optional[pl.DataFrame]): Data preloaded with --preload.
+        args (Namespace): Main namespace containing user provided input.
+        on_read (Optional[Callable[[Optional[dict], bool], None]]): Function
+            called with the specifications of the file and whether it is
+            skipped, before applying filters.
+
+    Returns:
+        Tuple[Optional[dict], bool]: Audio file specifications (`None` if the
+            file is skipped or filtered out) and whether the file is skipped
+            due to --max-duration.
+    """
+    if on_read is not None:
+        on_read(audio_meta, is_skipped)
+
+    if is_skipped or args.meta:
+        return audio_meta, is_skipped
+
+    # Apply filters
+    is_filtered_out = _is_filtered_out(audio_meta, preload, args)
+
+    return None if is_filtered_out else audio_meta, False
+
+
+def _is_filtered_out(
+        audio_meta: dict,
+        preload: Optional[pl.DataFrame],
+        args: Namespace
+) -> bool:
+    """Applies --filter or --select to the specifications of a file.
+
+    Args:
+        audio_meta (dict): Audio file specifications.
+        preload (Optional[pl.DataFrame]): Data preloaded with --preload.
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        bool: `True` if the file is filtered out, `False` otherwise.
+    """
+    file = audio_meta["file"]
+
+    try:
+        with profile_stage("filter", file=file):
+            is_filtered_out = (
+                (
+                    args.filter is not None
+                    and matches_filter(
+                        data=audio_meta,
+                        preload=preload,
+                        expr=args.filter
+                    )
+                ) or (
+                    args.select is not None
+                    and not matches_filter(
+                        data=audio_meta,
+                        preload=preload,
+                        expr=args.select,
+                    )
+                )
+            )
+    
+    except FilterExpressionError as e:
+        exit_error(
+            f"--filter/--select error: {e}. Please look at the "
+            "repository README.md for further details",
+            writer=tqdm
+        )
+
+    return is_filtered_out
+
+
+def _query_record(
+        record: dict,
+        cols: List[str],
+        preload: Optional[pl.DataFrame],
+        args: Namespace
+) -> Tuple[Optional[dict], bool]:
+    """Applies --max-duration and --filter or --select to the stored results
+    of a file, as `_analyze_file` does for files read from disk.
+
+    Args:
+        record (dict): Stored file results. All stored fields can be used by
+            --filter and --select.
+        cols (List[str]): Output fields.
+        preload (Optional[pl.DataFrame]): Data preloaded with --preload.
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        Tuple[Optional[dict], bool]: File specifications restricted to the
+            output fields (`None` if the file is skipped or filtered out)
+            and whether the file is skipped due to --max-duration.
+    """
+    if (
+        not args.meta
+        and (record["duration_seconds"] or 0.0) > args.max_duration
+    ):
+        return None, True
+
+    if _is_filtered_out(record, preload, args):
+        return None, False
+
+    # NOTE: Fields that were not requested are dropped, so that the output
+    # matches the output of a new analysis with the same options
+    return {
+        k: v for k, v in record.items() if k in cols or k == "filename"
+    }, False
+
+
+def _get_index_fingerprint(args: Namespace) -> str:
+    """Returns the options the results kept by --index depend on.
+
+    Args:
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        str: Options as a .json string.
+    """
+    return dict_to_json(
+        {
+            "version": __version__,
+            "input": args.input[0],
+            "extension": sorted(args.extension),
+            "recursive": args.recursive,
+            "dtype": args.dtype,
+            "mmap": args.mmap,
+            "meta": args.meta,
+            "sha256": bool(args.sha256 or args.sha256_short),
+            "silent_thresh": args.silent_thresh,
+            "silent_frame_size_ms": args.silent_frame_size_ms,
+            "silent_frame_mode": args.silent_frame_mode,
+            "silent_hop_size": args.silent_hop_size,
+            "fft_size": args.fft_size,
+            "hop_size": args.hop_size,
+            "spectral_rolloff": args.spectral_rolloff,
+            "spectral_rolloff_detail": args.spectral_rolloff_detail,
+            "probe": args.probe,
+            "probe_window_size": args.probe_window_size,
+            "probe_num_random_windows": args.probe_num_random_windows,
+            "random_seed": args.random_seed,
+            "max_duration": args.max_duration,
+            "skip_invalid_files": args.skip_invalid_files
+        }
+    )
+
+
+class _InputFiles(NamedTuple):
+    """Files found in one of the inputs.
+
+    Attributes:
+        input (str): Input audio file, manifest, stored results or folder.
+        files (Union[List[str], List[int], ManifestReader]): Files to
+            analyze. Indices in `results` if --from-results is enabled, and
+            `manifest` itself if the manifest is read lazily.
+        manifest (Optional[ManifestReader]): Manifest the files are read
+            from, if any.
+        results (Optional[ResultStore]): Stored results, if --from-results
+            is enabled.
+        index (Optional[DirIndex]): Index used if --index is enabled.
+        scan (Optional[DirScan]): Files found using `index`.
+    """
+    input: str
+    files: Union[List[str], List[int], ManifestReader]
+    manifest: Optional[ManifestReader] = None
+    results: Optional[ResultStore] = None
+    index: Optional[DirIndex] = None
+    scan: Optional[DirScan] = None
+
+
+def _get_input_files(input: str, args: Namespace) -> _InputFiles:
+    """Finds the files of an input.
+
+    !!! note
+        Errors are printed with `tqdm.write`, since inputs are found while
+        a progress bar is shown.
+
+    Args:
+        input (str): Input audio file, manifest, stored results or folder.
+        args (Namespace): Main namespace containing user provided input.
+
+    Returns:
+        _InputFiles: Files found.
+    """
+    if args.from_results:
+        try:
+            with profile_stage("discovery"):
+                results = read_results(input)
+        
+        except ResultsError as e:
+            exit_error(f"--from-results error: {e}", writer=tqdm)
+
+        # Check stored results contain all output fields
+        missing_cols = [
+            c for c in get_output_cols(args) if c not in results.fields
+        ]
+
+        if len(missing_cols) > 0:
             exit_error(
-                "The number of requested splits "
-                f"({args.post_action_num_splits}) is bigger than the number of"
-                f" file(s) ({len(files)})"
+                f"Missing column(s) in '{input}': "
+                f"{', '.join(missing_cols)}. Please use the same options "
+                "used to create it (e.g. --meta, --sha256 or "
+                "--spectral-rolloff)",
+                writer=tqdm
+            )
+
+        # NOTE: Files are identified by their index in the stored results
+        return _InputFiles(input, list(range(len(results))), results=results)
+
+    elif is_file_with_ext(file=input, ext=args.extension):
+        return _InputFiles(input, [input])
+    
+    elif is_manifest(input):
+        # NOTE: The manifest is read lazily and its rows are checked in
+        # parallel while files are analyzed, since the file column can
+        # contain garbage values. Invalid rows are reported at the end
+        try:
+            with profile_stage("discovery"):
+                manifest = ManifestReader(
+                    input,
+                    col=args.csv_input_file_col,
+                    ext=args.extension,
+                    ignore_errors=args.csv_ignore_errors
+                )
+
+        except ValueError:
+            exit_error(
+                f"No '{args.csv_input_file_col}' column found in the provided "
+                f"manifest file '{input}'",
+                writer=tqdm
             )
 
-        print(
-            f"\n{len(files)} file(s) will be moved and split into "
-            f"{args.post_action_num_splits} partition(s)"
-        )
+        # NOTE: --sample and --read-order need all files beforehand
+        if args.sample or args.read_order != "path":
+            files = list(tqdm(
+                manifest,
+                desc=f"Verifying '{args.csv_input_file_col}' column data",
+                colour=get_sppbar_color(),
+                leave=False,
+                unit="row",
+                disable=args.format != "text"
+            ))
+
+        else:
+            files = manifest
+
+        return _InputFiles(input, files, manifest=manifest)
+        
+    elif os.path.isdir(input):
+        with profile_stage("discovery"):
+            if args.index is not None:
+                # NOTE: Only folders that changed since the last scan are
+                # listed, and their files analyzed
+                index = DirIndex(
+                    args.index,
+                    fingerprint=_get_index_fingerprint(args)
+                )
+                scan = index.scan(
+                    input,
+                    ext=args.extension,
+                    recursive=args.recursive
+                )
+
+                return _InputFiles(input, scan.files, index=index, scan=scan)
+
+            files = get_dir_files(
+                dir=input,
+                ext=args.extension,
+                recursive=args.recursive
+            )
+
+        return _InputFiles(input, files)
+        
+    exit_error(f"Invalid input file or folder '{input}'", writer=tqdm)
+
+
+def _print_empty_input(
+        input_files: _InputFiles,
+        args: Namespace,
+        is_fatal: bool = True
+) -> None:
+    """Reports an input where no audio files were found.
+
+    Args:
+        input_files (_InputFiles): Files found in the input.
+        args (Namespace): Main namespace containing user provided input.
+        is_fatal (bool): If `True`, the execution of the program is stopped.
+    """
+    warning_repr = f"0 audio files found in '{input_files.input}'"
+
+    if input_files.manifest is not None:
+        _print_invalid_manifest_rows(input_files.manifest)
+
+    elif not args.recursive:
+        warning_repr += (
+            ". Use --recursive or -r if you intended to perform a recursive "
+            "search"
+        )
+
+    if is_fatal:
+        exit_warning(warning_repr)
+
+    print_warning(warning_repr)
+
+
+def _iter_input(
+        input_files: _InputFiles,
+        preload: Optional[pl.DataFrame],
+        cols: List[str],
+        args: Namespace,
+        memory_budget: Optional[MemoryBudget] = None,
+        workers: Optional[WorkerPool] = None
+) -> Iterator[Tuple[int, Optional[dict], bool]]:
+    """Analyzes the files of an input (or queries their stored results) in
+    --read-order.
+
+    Args:
+        input_files (_InputFiles): Files found in the input.
+        preload (Optional[pl.DataFrame]): Data preloaded with --preload.
+        cols (List[str]): Output fields.
+        args (Namespace): Main namespace containing user provided input.
+        memory_budget (Optional[MemoryBudget]): Budget shared by all
+            inputs analyzed concurrently.
+        workers (Optional[WorkerPool]): Worker processes shared by all
+            inputs if --timeout is set.
+
+    Yields:
+        Tuple[int, Optional[dict], bool]: Index of the file in the input,
+            its specifications (`None` if it was filtered out or skipped)
+            and whether it was skipped.
+    """
+    files, results, scan = (
+        input_files.files,
+        input_files.results,
+        input_files.scan
+    )
+
+    # NOTE: Stored results and manifests read lazily are always read in
+    # input order
+    if results is not None or not isinstance(files, list):
+        work = enumerate(files)
+
+    elif scan is not None and args.read_order != "path":
+        # NOTE: Files whose results are reused from --index are not read,
+        # so they are processed after the rest
+        new_idxs = np.flatnonzero(scan.cached_idxs < 0)
+
+        with profile_stage("read_order"):
+            read_order = new_idxs[
+                get_read_order([files[i] for i in new_idxs], args.read_order)
+            ].tolist() + np.flatnonzero(scan.cached_idxs >= 0).tolist()
+
+        work = ((idx, files[idx]) for idx in read_order)
+
+    else:
+        with profile_stage("read_order"):
+            read_order = get_read_order(files, args.read_order)
+
+        work = ((idx, files[idx]) for idx in read_order)
+
+    # Keep the unfiltered results of the files analyzed for --index
+    if scan is not None:
+        index_store = ResultStore(cols)
+        index_dirs = []
+
+        def _on_read(dir: str, audio_meta: Optional[dict], is_skipped: bool):
+            if is_skipped:
+                input_files.index.add_skipped(dir)
+
+            else:
+                index_store.append(audio_meta)
+                index_dirs.append(dir)
+
+    # NOTE: Files whose spectral rolloff is computed in a batch are only
+    # finished once the batch is flushed. Finished files are released as
+    # soon as all files analyzed before them are finished too
+    spectral_batch = (
+        get_spectral_rolloff_batch(args)
+        if results is None and not args.meta and workers is None else None
+    )
+    analyzed = []
+
+    # NOTE: With --timeout, up to --process-workers files are analyzed at
+    # once, each one by a thread waiting for its worker process, so that a
+    # hung file does not stop the others
+    if workers is not None:
+        executor = ThreadPoolExecutor(args.process_workers)
+        in_flight = set()
+
+        def _analyze_isolated(
+                idx: int,
+                file: str
+        ) -> Tuple[int, Optional[dict], bool]:
+            return (
+                idx,
+                *_analyze_file(
+                    file,
+                    args,
+                    memory_budget=memory_budget,
+                    workers=workers
+                )
+            )
+
+    def _is_analyzed(audio_meta: Optional[dict]) -> bool:
+        # NOTE: The spectral rolloff of a file in the batch is added to its
+        # specifications by the callback of the batch once it is computed
+        return (
+            audio_meta is None
+            or spectral_batch is None
+            or "spectral_rolloff" in audio_meta
+        )
+
+    def _finish_analyzed() -> Iterator[Tuple[int, Optional[dict], bool]]:
+        # NOTE: Only files whose analysis is complete are released, in the
+        # order they were analyzed
+        num_analyzed = next(
+            (
+                i for i, (_, audio_meta, _) in enumerate(analyzed)
+                if not _is_analyzed(audio_meta)
+            ),
+            len(analyzed)
+        )
+        finished = analyzed[:num_analyzed]
+        del analyzed[:num_analyzed]
+
+        for idx, audio_meta, is_skipped in finished:
+            audio_meta, is_skipped = _finish_file(
+                audio_meta,
+                is_skipped,
+                preload,
+                args,
+                on_read=(
+                    partial(_on_read, scan.dirs[idx])
+                    if scan is not None else None
+                )
+            )
+            yield idx, audio_meta, is_skipped
+
+    for idx, file in work:
+        if results is not None:
+            audio_meta, is_skipped = _query_record(
+                results[file],
+                cols,
+                preload,
+                args
+            )
+
+        elif scan is not None and scan.cached_idxs[idx] >= 0:
+            # Reuse results of files in unchanged folders
+            audio_meta, is_skipped = _query_record(
+                scan.cached[int(scan.cached_idxs[idx])],
+                cols,
+                preload,
+                args
+            )
+
+        elif workers is not None:
+            in_flight.add(executor.submit(_analyze_isolated, idx, file))
+
+            if len(in_flight) >= args.process_workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                analyzed.extend(f.result() for f in done)
+                yield from _finish_analyzed()
+
+            continue
+
+        else:
+            analyzed.append(
+                (
+                    idx,
+                    *_analyze_file(
+                        file,
+                        args,
+                        memory_budget=memory_budget,
+                        spectral_batch=spectral_batch
+                    )
+                )
+            )
+
+            yield from _finish_analyzed()
+            continue
+
+        yield idx, audio_meta, is_skipped
+
+    if spectral_batch is not None:
+        with profile_stage("spectral_rolloff"):
+            spectral_batch.flush()
+
+    if workers is not None:
+        analyzed.extend(f.result() for f in wait(in_flight).done)
+        executor.shutdown()
+
+    yield from _finish_analyzed()
+
+    # Update --index with the results of this scan
+    if scan is not None:
+        with profile_stage("index"):
+            input_files.index.write(index_store, index_dirs)
+
+
+def _iter_concurrently(
+        iterators: List[Iterator]
+) -> Iterator[Tuple[int, Optional[object]]]:
+    """Consumes several iterators at once, each one in its own thread.
+
+    !!! note
+        Threads are daemonic, so that an interrupted program does not wait
+        for them. Exceptions raised by an iterator (including `SystemExit`
+        raised by `exit_error`) are raised again by the calling thread.
+
+    Args:
+        iterators (List[Iterator]): Iterators to consume.
+
+    Yields:
+        Tuple[int, Optional[object]]: Index of the iterator and its next
+            item, in the order items are produced, or `None` once the
+            iterator is exhausted.
+    """
+    # NOTE: The queue is unbounded, so that a slow consumer never blocks
+    # the threads of the remaining iterators
+    items = queue.SimpleQueue()
+
+    def _consume(iterator_idx: int, iterator: Iterator) -> None:
+        try:
+            for item in iterator:
+                items.put((iterator_idx, item, None))
+
+            items.put((iterator_idx, None, None))
+
+        except BaseException as e:
+            items.put((iterator_idx, None, e))
+
+    for iterator_idx, iterator in enumerate(iterators):
+        threading.Thread(
+            target=_consume,
+            args=(iterator_idx, iterator),
+            daemon=True
+        ).start()
+
+    num_done = 0
+
+    while num_done < len(iterators):
+        iterator_idx, item, e = items.get()
+
+        if e is not None:
+            raise e
+
+        num_done += item is None
+        yield iterator_idx, item
+
+
+def _write_record(
+        audio_meta: dict,
+        cols: List[str],
+        record_stream: TextIO,
+        record_writer: Optional[object],
+        args: Namespace
+) -> None:
+    """Prints the specifications of a file and writes them to --csv.
+
+    Args:
+        audio_meta (dict): Specifications of the file.
+        cols (List[str]): Output fields.
+        record_stream (TextIO): Stream file records are written to if
+            --format is `jsonl`.
+        record_writer (Optional[object]): .csv writer of `record_stream` if
+            --format is `tsv`.
+        args (Namespace): Main namespace containing user provided input.
+    """
+    # Format current file representation
+    if not args.summary and args.format == "text":
+        if args.meta:
+            file_repr = _audio_file_meta_repr_from_dict(
+                audio_meta,
+                args.max_fname_chars
+            )
+        
+        else:
+            file_repr = _audio_file_repr_from_dict(
+                audio_meta,
+                args.max_fname_chars,
+                abbrev_hash=bool(args.sha256_short)
+            )
+
+        print(file_repr, writer=tqdm)
+    
+    # Stream machine-readable records
+    elif not args.summary and args.format == "jsonl":
+        record_stream.write(
+            dict_to_json({c: audio_meta.get(c) for c in cols}) + "\n"
+        )
+    
+    elif not args.summary and args.format == "tsv":
+        record_writer.writerow([audio_meta.get(c) for c in cols])
+    
+    # Write data to csv
+    if args.csv:
+        _write_csv_row(args.csv, cols, audio_meta)
+
+
+def _print_input_stats(
+        inputs: List[_InputFiles],
+        store: ResultStore,
+        input_ends: List[int],
+        input_skipped: List[int],
+        input_times: List[float],
+        args: Namespace
+) -> None:
+    """Prints a summary line for each input.
+
+    Args:
+        inputs (List[_InputFiles]): Files found in each input.
+        store (ResultStore): Results of all files shown in the output, one
+            input after the other.
+        input_ends (List[int]): Index in `store` after the last result of
+            each input.
+        input_skipped (List[int]): Number of files of each input skipped
+            due to --max-duration.
+        input_times (List[float]): Time in seconds it took to analyze each
+            input.
+        args (Namespace): Main namespace containing user provided input.
+    """
+    width = max(len(i.input) for i in inputs) + 2
+    print(
+        "Input".ljust(width)
+        + "Files".rjust(10)
+        + "Invalid".rjust(10)
+        + "Skipped".rjust(10)
+        + "Duration".rjust(18)
+        + "Size".rjust(10)
+        + "Elapsed".rjust(14)
+    )
+    start = 0
+
+    for input_files, end, skipped_files, elapsed_time in zip(
+        inputs,
+        input_ends,
+        input_skipped,
+        input_times
+    ):
+        glob_stats = _get_glob_stats(
+            store,
+            skipped_files,
+            args,
+            rows=slice(start, end)
+        )
+        input_repr = (
+            input_files.input.ljust(width)
+            + str(end - start).rjust(10)
+            + str(glob_stats["invalid_files"]).rjust(10)
+            + str(skipped_files).rjust(10)
+            + time_to_str(glob_stats["total_duration"], abbrev=True).rjust(18)
+            + bytes_to_str(glob_stats["total_size_bytes"]).rjust(10)
+            + time_to_str(elapsed_time, abbrev=True).rjust(14)
+        )
+        start = end
+
+        if glob_stats["invalid_files"] > 0 or skipped_files > 0:
+            print_error(input_repr)
+
+        else:
+            print(input_repr)
+
+
+def _print_reports(args: Namespace, track_memory: bool) -> None:
+    """Prints the stage timers and memory usage if requested.
+
+    Args:
+        args (Namespace): Main namespace containing user provided input.
+        track_memory (bool): If `True`, memory usage was tracked.
+    """
+    # Print stage timers if requested
+    profiler = get_profiler()
+
+    if args.profile or args.profile_trace is not None:
+        _print_profile(profiler)
+
+        if args.profile_trace is not None:
+            profiler.write_chrome_trace(args.profile_trace)
+            print(f"Profile trace written to '{args.profile_trace}'")
+    
+    # Print memory usage if requested
+    if track_memory:
+        memory = profiler.get_memory_tracker()
+        _print_memory(memory)
+
+        if args.memory_report is not None:
+            memory.write_json(args.memory_report)
+            print(f"Memory report written to '{args.memory_report}'")
+
+
+def _delta_repr(old: str, new: str, delta: str) -> str:
+    """Creates a printable string representation of a change between two
+    snapshots.
+
+    Args:
+        old (str): Old value.
+        new (str): New value.
+        delta (str): Difference between both values, including its sign.
+
+    Returns:
+        str: `str` representation of the change.
+    """
+    return f"{old} → {new} ({delta})"
+
 
-        if not args.unattended:
-            ask_confirmation()
-        
-        _create_dir_if_missing(args.post_action_output)
+def _diff(args: Namespace, record_stream: TextIO) -> None:
+    """Compares the input results with the results given by --diff, and
+    prints the changes and a summary of both snapshots.
 
-        # Create splits specs
-        random.seed(args.random_seed)
-        random.shuffle(files)
-        splits = np.array_split(files, args.post_action_num_splits)
-        split_dirname_zfill = len(str(args.post_action_num_splits - 1))
-        moved_files = 0
-
-        for split_idx, split_data in enumerate(splits):
-            split_files = split_data.tolist()
-            split_dir = os.path.join(
-                args.post_action_output,
-                f"{args.post_action_split_dirname}"
-                f"{str(split_idx).zfill(split_dirname_zfill)}"
+    Args:
+        args (Namespace): Main namespace containing user provided input.
+        record_stream (TextIO): Stream changes are written to if --format is
+            `jsonl` or `tsv`.
+    """
+    try:
+        with profile_stage("discovery"):
+            new = read_results_dataframe(args.input[0])
+            old = read_results_dataframe(args.diff)
+
+        start_time = perf_counter()
+
+        with profile_stage("diff"):
+            changes = diff_results(
+                old,
+                new,
+                tolerance_db=args.diff_tolerance
             )
-            _create_dir_if_missing(split_dir)
-
-            # Copy files and warn user if a file already exists
-            for f in tqdm(
-                split_files,
-                desc=(
-                    f"Moving files of partition {split_idx + 1}/"
-                    f"{args.post_action_num_splits}"
-                ),
-                leave=False,
-                unit="file",
-                colour=get_sppbar_color()
-            ):
-                try:
-                    if args.recursive and args.post_action_preserve_subfolders:
-                        # Get relative path
-                        dst = f.replace(args.input, "", 1)
-                        dst = dst.split(os.sep)  # Avoid double-slashes
-                        dst = os.path.join(split_dir, *dst)
-
-                        # Create subfolders if structure does not exist yet
-                        os.makedirs(os.path.dirname(dst), exist_ok=True)
-                    
-                    else:
-                        dst = os.path.join(split_dir, os.path.basename(f))
-                    
-                    if os.path.exists(dst):
-                        print_warning(
-                            f"File '{dst}' already exists",
-                            writer=tqdm
-                        )
-                        continue
+            summary = get_diff_summary(old, new, changes)
+    
+    except (ResultsError, ValueError) as e:
+        exit_error(f"--diff error: {e}")
 
-                    else:
-                        shutil.move(f, dst)
-                        moved_files += 1
-                
-                except Exception as e:
-                    print_warning(
-                        f"An error ocurred while moving '{f}' to '{dst}': {e}",
-                        writer=tqdm
-                    )
+    elapsed_time = perf_counter() - start_time
+    tags = {
+        "added": "green",
+        "removed": "error",
+        "modified": "warning",
+        "moved": "magenta",
+        "renamed": "magenta",
+        "stats_changed": "warning"
+    }
 
-        print_fn = (print_warning if moved_files != len(files) else print)
-        print_fn(
-           f"{moved_files}/{len(files)} file(s) moved to "
-           f"'{args.post_action_output}'"
-        )
+    with profile_stage("output"):
+        if not args.summary and args.format == "text":
+            for change in changes.iter_rows(named=True):
+                tag = tags[change["change"]]
 
-    elif args.post_action == "dump":
-        print(
-            f"\n{len(files)} file path(s) will be dumped to "
-            f"'{args.post_action_output}'"
-        )
+                if change["change"] in ("moved", "renamed"):
+                    file_repr = f"{change['old_file']} → {change['file']}"
 
-        if not args.unattended:
-            ask_confirmation()
+                else:
+                    file_repr = change["file"] or change["old_file"]
 
-        with open(args.post_action_output, "w") as f:
-            f.write("\n".join(files))
+                change_repr = change["change"].ljust(14)
+                print(f"<{tag}>{change_repr}</{tag}>{file_repr}")
         
-        print(
-            f"\n{len(files)} file path(s) dumped to "
-            f"'{args.post_action_output}'"
-        )
-
-    elif args.post_action == "dump+sp":
-        if args.post_action_num_splits > len(files):
-            exit_error(
-                "--post-action-num-splits should be equal or smaller than "
-                "the number of files"
-            )
+        elif not args.summary and args.format == "jsonl":
+            for change in changes.iter_rows(named=True):
+                record_stream.write(dict_to_json(change) + "\n")
         
-        split_file_repr, ext = os.path.splitext(args.post_action_output)
-        split_file_repr += f"_*{ext}"
+        elif not args.summary and args.format == "tsv":
+            record_writer = csv.writer(
+                record_stream,
+                delimiter="\t",
+                lineterminator="\n"
+            )
+            record_writer.writerow(changes.columns)
+            record_writer.writerows(changes.iter_rows())
         
-        print(
-            f"\n{len(files)} file path(s) will be dumped to "
-            f"{args.post_action_num_splits} file(s) '{split_file_repr}'"
+        if args.csv:
+            changes.write_csv(args.csv)
+
+    # Print summary
+    if not args.summary and changes.height > 0:
+        print("")
+
+    for change in DIFF_CHANGES:
+        change_repr = (
+            f"{change.replace('_', ' ').capitalize()} files:".ljust(22)
+            + str(summary[change])
         )
 
-        if not args.unattended:
-            ask_confirmation()
-        
-        splits = np.array_split(files, args.post_action_num_splits)
-        zfill = len(str(len(splits)))
+        if summary[change] > 0:
+            print(f"<{tags[change]}>{change_repr}</{tags[change]}>")
 
-        for split_idx, split in enumerate(splits):
-            filename, ext = os.path.splitext(args.post_action_output)
-            filename += f"_{str(split_idx).zfill(zfill)}{ext}"
+        else:
+            print(change_repr)
 
-            with open(filename, "w") as f:
-                f.write("\n".join(split))
-         
-        print(
-            f"\n{len(files)} file(s) dumped to "
-            f"{args.post_action_num_splits} file(s) '{split_file_repr}'"
-        )
+    print("Unchanged files:".ljust(22) + str(summary["unchanged"]))
 
-    else:
-        raise AssertionError
+    num_files_delta = summary["num_files"] - summary["old_num_files"]
+    duration_delta = summary["total_duration"] - summary["old_total_duration"]
+    size_delta = summary["total_size_bytes"] - summary["old_total_size_bytes"]
+    print(
+        "Total file(s):".ljust(22) + _delta_repr(
+            str(summary["old_num_files"]),
+            str(summary["num_files"]),
+            f"{num_files_delta:+d}"
+        )
+    )
+    print(
+        "Total duration:".ljust(22) + _delta_repr(
+            time_to_str(summary["old_total_duration"]),
+            time_to_str(summary["total_duration"]),
+            ("-" if duration_delta < 0.0 else "+")
+            + time_to_str(abs(duration_delta))
+        )
+    )
+    print(
+        "Total size:".ljust(22) + _delta_repr(
+            bytes_to_str(summary["old_total_size_bytes"]),
+            bytes_to_str(summary["total_size_bytes"]),
+            ("-" if size_delta < 0 else "+") + bytes_to_str(abs(size_delta))
+        )
+    )
+    print("")
+    print(f"Elapsed time: {time_to_str(elapsed_time, abbrev=False)}")
 
 
 def sndls(args: Namespace) -> None:
@@ -703,6 +2142,27 @@ def sndls(args: Namespace) -> None:
     Args:
         args (Namespace): Main namespace containing user provided input.
     """
+    # NOTE: With --format jsonl or tsv, file records are the only output
+    # written to stdout. Any other output is redirected to stderr
+    if args.format == "text":
+        _sndls(args, record_stream=sys.stdout)
+
+    else:
+        set_color_enabled(False)
+        record_stream = sys.stdout
+
+        with redirect_stdout(sys.stderr):
+            _sndls(args, record_stream=record_stream)
+
+
+def _sndls(args: Namespace, record_stream: TextIO) -> None:
+    """Runs the `sndls` command.
+    
+    Args:
+        args (Namespace): Main namespace containing user provided input.
+        record_stream (TextIO): Stream file records are written to if
+            --format is `jsonl` or `tsv`.
+    """
     # Check file extensions
     for ext in args.extension:
         if ext not in get_allowed_audio_file_extensions():
@@ -746,92 +2206,160 @@ def sndls(args: Namespace) -> None:
             "samples"
         )
     
+    # Enable stage timers and memory tracking if requested
+    track_memory = (
+        args.memory
+        or args.memory_tracemalloc
+        or args.memory_report is not None
+    )
+
+    if args.profile or args.profile_trace is not None or track_memory:
+        set_profiler(
+            Profiler(
+                trace=args.profile_trace is not None,
+                memory=(
+                    MemoryTracker(
+                        trace_allocations=args.memory_tracemalloc,
+                        per_stage=not _is_concurrent(args)
+                    )
+                    if track_memory else None
+                )
+            )
+        )
+    
+    # Check options that only support a single input
+    if len(args.input) > 1:
+        for option, value in (
+            ("--diff", args.diff),
+            ("--index", args.index),
+            (
+                "--post-action-preserve-subfolders",
+                args.post_action_preserve_subfolders
+            )
+        ):
+            if value:
+                exit_error(f"{option} can only be used with a single input")
+
+    # Compare results if requested
+    if args.diff is not None:
+        if (
+            args.post_action
+            or args.filter
+            or args.select
+            or args.sample
+            or args.meta
+        ):
+            exit_error(
+                "--diff not allowed with: --post-action, --filter, --select, "
+                "--sample, --meta"
+            )
+        
+        _diff(args, record_stream)
+        _print_reports(args, track_memory)
+        return
+    
     # Preload file if requested
     if args.preload is not None:
-        preload = _preload_file(
-            file=args.preload,
-            has_header=args.preload_has_header,
-            truncate_ragged_lines=args.preload_truncate_ragged_lines,
-            ignore_errors=args.csv_ignore_errors
-        )
+        try:
+            with profile_stage("preload"):
+                preload = preload_file(
+                    file=args.preload,
+                    has_header=args.preload_has_header,
+                    truncate_ragged_lines=args.preload_truncate_ragged_lines,
+                    ignore_errors=args.csv_ignore_errors
+                )
+        
+        except PreloadError as e:
+            error_repr = f"--preload error: {e}"
+
+            if "truncate_ragged_lines" in str(e):
+                error_repr += (
+                    "\n\nIf the issue was caused by 'truncate_ragged_lines', "
+                    "please consider using --preload-truncate-ragged-lines"
+                )
+            
+            exit_error(error_repr)
     
     else:
         preload = None
     
-    # Get file(s)
-    if is_file_with_ext(file=args.input, ext=args.extension):
-        files = [args.input]
-    
-    elif is_file_with_ext(file=args.input, ext=".csv"):
-        # Read file and check if the col column exists
-        df = pl.read_csv(args.input, ignore_errors=args.csv_ignore_errors)
+    # Check --index is only used with folders
+    if args.index is not None:
+        if not os.path.isdir(args.input[0]) or args.from_results:
+            exit_error("--index can only be used if the input is a folder")
 
-        if args.csv_input_file_col not in df.columns:
-            exit_error(
-                f"No '{args.csv_input_file_col}' column found in the provided "
-                f".csv file '{args.input}'"
-            )
+        if args.sample:
+            exit_error("--index cannot be used together with --sample")
 
-        # Read files and check all exist since col can contain garbage values
-        files = df[args.csv_input_file_col].to_list()
+    # Get file(s)
+    # NOTE: Show progress bar in case folders are too big
+    with tqdm(
+        total=1,
+        desc="Fetching files... This may take some time for large folders",
+        bar_format="{desc}",
+        leave=False,
+        disable=(
+            args.format != "text"
+            or not any(os.path.isdir(i) for i in args.input)
+        )
+    ) as pbar:
+        pbar.update(1)
+
+        # NOTE: Inputs are scanned concurrently, so that a slow storage
+        # does not delay the rest
+        if len(args.input) == 1:
+            inputs = [_get_input_files(args.input[0], args)]
 
-        for row_idx, file in enumerate(tqdm(
-            files,
-            desc=f"Verifying '{args.csv_input_file_col}' column data",
-            colour=get_sppbar_color(),
-            leave=False,
-            unit="row"
-        )):
-            if not is_file_with_ext(file=file, ext=args.extension):
-                # NOTE: +2 because the count starts from 1 and the header
-                # row is skipped in the count
-                exit_error(
-                    f"Row #{row_idx + 2} of '{args.csv_input_file_col}' column"
-                    f" contains an invalid filename '{file}'. Please check "
-                    "that such a file exists, has a valid --extension option, "
-                    "and can be reached"
-                )
-        
-    elif os.path.isdir(args.input):
-        # Show progress bar in case folder is too big
-        with tqdm(
-            total=1,
-            desc="Fetching files... This may take some time for large folders",
-            bar_format="{desc}",
-            leave=False
-        ) as pbar:
-            pbar.update(1)
-            files = get_dir_files(
-                dir=args.input,
-                ext=args.extension,
-                recursive=args.recursive
-            )
-        
-    else:
-        exit_error(f"Invalid input file or folder '{args.input}'")
-
-    # Check folder is not empty
-    if len(files) == 0:
-        if not args.recursive:
-            exit_warning(
-                f"0 audio files found in '{args.input}'. Use --recursive or -r"
-                " if you intended to perform a recursive search"
-            )
         else:
-            exit_warning(f"0 audio files found in '{args.input}'")
+            with ThreadPoolExecutor(len(args.input)) as pool:
+                inputs = list(
+                    pool.map(partial(_get_input_files, args=args), args.input)
+                )
+
+    # Check inputs are not empty
+    is_empty = [
+        isinstance(i.files, list) and len(i.files) == 0 for i in inputs
+    ]
+
+    for input_files in compress(inputs, is_empty):
+        _print_empty_input(input_files, args, is_fatal=len(inputs) == 1)
+
+    if all(is_empty):
+        exit_warning("0 audio files found")
 
     # Check splits are provided
     if (
-        args.post_action in ("mv+sp", "cp+sp", "dump+sp")
+        args.post_action in ("mv+sp", "cp+sp", "ln+sp", "dump+sp")
         and args.post_action_num_splits is None
     ):
         exit_error(
             "--post-action-num-splits must be defined if --post-action is "
-            "mv+sp, cp+sp or dump+sp"
+            "mv+sp, cp+sp, ln+sp or dump+sp"
         )
     
+    # Check --copy-mode is only used with copy or link post actions
+    if args.copy_mode is not None:
+        if args.post_action not in ("cp", "cp+sp", "ln", "ln+sp"):
+            exit_error(
+                "--copy-mode can only be used if --post-action is cp, cp+sp, "
+                "ln or ln+sp"
+            )
+
+        if args.post_action in ("ln", "ln+sp") and args.copy_mode == "copy":
+            exit_error(
+                "--copy-mode copy cannot be used with --post-action ln or "
+                "ln+sp. Please use cp or cp+sp instead"
+            )
+    
     # Sample files if --sample is enabled
     if args.sample:
+        # NOTE: Files of all inputs are sampled together
+        files = [
+            (input_idx, file)
+            for input_idx, input_files in enumerate(inputs)
+            for file in input_files.files
+        ]
+
         if args.sample >= 1.0 and len(files) < int(args.sample):
             exit_error(
                 "Not enough files to sample from. The current input has only "
@@ -848,14 +2376,24 @@ def sndls(args: Namespace) -> None:
             rng = random.Random(args.random_seed)
             files = rng.sample(files, k=int(args.sample))
 
+        inputs = [
+            input_files._replace(
+                files=[f for i, f in files if i == input_idx]
+            )
+            for input_idx, input_files in enumerate(inputs)
+        ]
+
     # Collect target files if --post-action
     if args.post_action:
         if (
             args.post_action in (
                 "cp",
                 "mv",
+                "ln",
                 "cp+sp",
                 "mv+sp",
+                "ln+sp",
+                "tar",
                 "dump",
                 "dump+sp"
             )
@@ -863,12 +2401,22 @@ def sndls(args: Namespace) -> None:
         ):
             exit_error(
                 "--post-action-output must be defined if --post-action is one "
-                "of cp, mv, cp+sp, mv+sp, dump or dump+sp"
+                "of cp, mv, ln, cp+sp, mv+sp, ln+sp, tar, dump or dump+sp"
             )
         
-        post_action_files = []
+        if args.post_action_shard_size <= 0.0:
+            exit_error("--post-action-shard-size must be greater than 0.0")
     
+    if args.post_action_workers < 1:
+        exit_error("--post-action-workers must be 1 or greater")
+
     # Check --post-action-preserve-subfolders is enabled with --recursive
+    if args.post_action_preserve_subfolders and args.from_results:
+        exit_error(
+            "--post-action-preserve-subfolders cannot be used together with "
+            "--from-results"
+        )
+
     if args.post_action_preserve_subfolders and not args.recursive:
         exit_error(
             "--post-action-preserve-subfolders can only be used if --recursive"
@@ -882,445 +2430,200 @@ def sndls(args: Namespace) -> None:
             " to 1.0"
         )
 
-    # Global stats to collect
-    glob_stats = {
-        "fs": [],
-        "mono_files": 0,
-        "stereo_files": 0,
-        "multichannel_files": 0,
-        "skipped_files": 0,
-        "invalid_files": 0,
-        "anomalous_files": 0,
-        "clipped_files": 0,
-        "silent_files": 0,
-        "min_duration": None,
-        "max_duration": None,
-        "total_duration": 0,
-        "total_size_bytes": 0
-    }
+    # Check segment options
+    if args.segment_workers < 1:
+        exit_error("--segment-workers must be 1 or greater")
 
-    # Create .csv file if requested
-    if args.csv is not None:
-        # Header cols (mandatory fields)
-        cols = [
-            "file",
-            "size_bytes",
-            "subtype",
-            "fmt",
-            "fs",
-            "num_channels",
-            "num_samples_per_channel",
-            "duration_seconds",
-            "peak_db",
-            "rms_db",
-            "is_clipped",
-            "is_anomalous",
-            "is_silent",
-            "is_invalid"
-        ]
+    if args.fft_workers < 1:
+        exit_error("--fft-workers must be 1 or greater")
 
-        if args.spectral_rolloff:
-            if args.spectral_rolloff_detail:
-                for c in (
-                    "spectral_rolloff_min",
-                    "spectral_rolloff",
-                    "spectral_rolloff_max"
-                ):
-                    cols.insert(-4, c)
-            
-            else:
-                cols.insert(-4, "spectral_rolloff")
+    if args.segment_size <= 0.0:
+        exit_error("--segment-size must be greater than 0.0")
+
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        exit_error("--memory-budget must be greater than 0")
+
+    if args.timeout is not None and args.timeout <= 0.0:
+        exit_error("--timeout must be greater than 0.0")
+
+    if args.process_workers < 1:
+        exit_error("--process-workers must be 1 or greater")
+
+    # Check --probe options
+    if args.probe:
+        if args.meta:
+            exit_error("--probe cannot be used together with --meta")
+
+        if args.probe_window_size <= 0.0:
+            exit_error("--probe-window-size must be greater than 0.0")
+
+        if args.probe_num_random_windows < 0:
+            exit_error("--probe-num-random-windows must be 0 or greater")
 
-        # Optional fields
-        if args.sha256 or args.sha256_short:
-            cols.insert(1, "sha256")
+    # Create .csv file if requested
+    cols = get_output_cols(args)
+
+    # NOTE: Results are kept in a columnar store instead of one dict per
+    # file, so that millions of files can be kept in memory for the summary
+    # and post actions
+    store = ResultStore(cols)
 
+    if args.csv is not None:
         with open(args.csv, "w") as f:
             writer = csv.writer(f)
             writer.writerow(cols)
     
+    # Write .tsv header if requested
+    record_writer = None
+
+    if args.format == "tsv":
+        record_writer = csv.writer(
+            record_stream,
+            delimiter="\t",
+            lineterminator="\n"
+        )
+        record_writer.writerow(cols)
+    
     # Mark start
     start_time = perf_counter()
 
-    for file in tqdm(
-        files,
-        desc="Analyzing audio files",
+    # NOTE: Files are analyzed in --read-order, but results are printed,
+    # saved and collected in input order using a reorder buffer. Several
+    # inputs are analyzed concurrently, each one in its own thread, and
+    # their results are output one input after the other
+    memory_budget = (
+        MemoryBudget(args.memory_budget)
+        if args.memory_budget is not None else None
+    )
+    workers = (
+        WorkerPool(args.process_workers)
+        if args.timeout is not None and not args.from_results else None
+    )
+    iterators = [
+        _iter_input(
+            i,
+            preload,
+            cols,
+            args,
+            memory_budget=memory_budget,
+            workers=workers
+        )
+        for i in inputs
+    ]
+
+    if len(iterators) == 1:
+        work = chain(((0, item) for item in iterators[0]), [(0, None)])
+
+    else:
+        work = _iter_concurrently(iterators)
+
+    num_inputs = len(inputs)
+    pending = [{} for _ in range(num_inputs)]
+    next_idxs = [0] * num_inputs
+    is_done = [False] * num_inputs
+    input_idx = 0
+    input_ends = []
+    input_times = [0.0] * num_inputs
+    input_skipped = [
+        i.scan.num_cached_skipped if i.scan is not None else 0 for i in inputs
+    ]
+
+    with tqdm(
+        total=(
+            sum(len(i.files) for i in inputs)
+            if all(isinstance(i.files, list) for i in inputs) else None
+        ),
+        desc=(
+            "Querying stored results" if args.from_results
+            else "Analyzing audio files"
+        ),
         colour=get_sppbar_color(),
         leave=False,
-        unit="file"
-    ):
-        # Get metadata
-        if args.skip_invalid_files:
-            try:
-                audio_meta = read_audio_metadata(file)
-                audio_meta["file"] = file
-                audio_meta["filename"] = os.path.basename(file)
-                audio_meta["size_bytes"] = os.path.getsize(file)
-                audio_meta["is_invalid"] = False
-            
-            except Exception as _:
-                audio_meta = {}
-                audio_meta["file"] = file
-                audio_meta["filename"] = os.path.basename(file)
-                audio_meta["size_bytes"] = os.path.getsize(file)
-                audio_meta["fs"] = None
-                audio_meta["num_channels"] = 0
-                audio_meta["num_samples_per_channel"] = 0
-                audio_meta["duration_seconds"] = 0
-                audio_meta["fmt"] = None
-                audio_meta["subtype"] = None
-                audio_meta["is_invalid"] = True
+        unit="file",
+        disable=args.format != "text"
+    ) as pbar:
+        for work_idx, item in work:
+            if item is None:
+                is_done[work_idx] = True
+                input_times[work_idx] = perf_counter() - start_time
 
-        else:
-            try:
-                audio_meta = read_audio_metadata(file)
-                audio_meta["file"] = file
-                audio_meta["filename"] = os.path.basename(file)
-                audio_meta["size_bytes"] = os.path.getsize(file)
-                audio_meta["is_invalid"] = False
-
-            except Exception as e:
-                exit_error(
-                    f"File '{file}' could not be parsed due to the following "
-                    f"error: {e}. Use --skip-invalid-files to ignore "
-                    "unparseable files and continue analysis"
-                )
-        
-        # Ingest data if requested
-        if not args.meta:
-            # Skip long files
-            if audio_meta["duration_seconds"] > args.max_duration:
-                glob_stats["skipped_files"] += 1
-                continue
-            
-            # Update audio stats
-            if args.skip_invalid_files:
-                try:
-                    audio, fs = read_audio(file, dtype=args.dtype)
-                    audio_peak_db = flatten_nested_list(
-                        peak_db(audio, axis=-1).tolist()
-                    )
-                    audio_rms_db = flatten_nested_list(
-                        rms_db(audio, axis=-1).tolist()
-                    )
-                    audio_is_clipped = is_clipped(audio)
-                    audio_is_anomalous = is_anomalous(audio)
-                    silent_frame_size_samples = (
-                        ms_to_samples(
-                            args.silent_frame_size_ms,
-                            fs=fs,
-                            truncate=True
-                        )
-                        if args.silent_frame_size_ms is not None else None
-                    )
-                    audio_is_silent = is_silent(
-                        x=audio,
-                        thresh_db=args.silent_thresh,
-                        frame_size=silent_frame_size_samples,
-                        hop_size=args.silent_hop_size,
-                        axis=-1,
-                        mode=args.silent_frame_mode
-                    )
-                    audio_meta["peak_db"] = audio_peak_db
-                    audio_meta["rms_db"] = audio_rms_db
-                    audio_meta["is_clipped"] = audio_is_clipped
-                    audio_meta["is_anomalous"] = audio_is_anomalous
-                    audio_meta["is_silent"] = audio_is_silent
-                    audio_meta["is_invalid"] = False
-
-                    if args.sha256 or args.sha256_short:
-                        audio_meta["sha256"] = generate_sha256_from_file(file)
-                
-                except Exception as _:
-                    audio_is_clipped = False
-                    audio_is_anomalous = False
-                    audio_is_silent = False
-                    audio_meta["peak_db"] = None
-                    audio_meta["rms_db"] = None
-                    audio_meta["is_clipped"] = False
-                    audio_meta["is_anomalous"] = False
-                    audio_meta["is_silent"] = False
-                    audio_meta["is_invalid"] = True
-
-                    if args.spectral_rolloff is not None:
-                        if args.spectral_rolloff_detail:
-                            _spectral_rolloff = spectral_rolloff(
-                                audio,
-                                fs,
-                                args.fft_size,
-                                args.hop_size,
-                                rolloff=args.spectral_rolloff
-                            )
-                            _min_spectral_rolloff = flatten_nested_list(
-                                np.min(
-                                    _spectral_rolloff,
-                                    axis=-1,
-                                    keepdims=True
-                                ).tolist()
-                            )
-                            _max_spectral_rolloff = flatten_nested_list(
-                                    np.max(
-                                    _spectral_rolloff,
-                                    axis=-1,
-                                    keepdims=True
-                                ).tolist()
-                            )
-                            _average_spectral_rolloff = flatten_nested_list(
-                                    np.mean(
-                                    spectral_rolloff(
-                                        audio,
-                                        fs,
-                                        args.fft_size,
-                                        args.hop_size,
-                                        rolloff=args.spectral_rolloff
-                                    ),
-                                    axis=-1,
-                                    keepdims=True
-                                ).tolist()
-                            )
-                            audio_meta["spectral_rolloff_min"] = (
-                                _min_spectral_rolloff
-                            )
-                            audio_meta["spectral_rolloff"] = (
-                                _average_spectral_rolloff
-                            )
-                            audio_meta["spectral_rolloff_max"] = (
-                                _max_spectral_rolloff
-                            )
-                        
-                        else:
-                            audio_meta["spectral_rolloff"] = (
-                                    flatten_nested_list(
-                                        np.mean(
-                                        spectral_rolloff(
-                                            audio,
-                                            fs,
-                                            args.fft_size,
-                                            args.hop_size,
-                                            rolloff=args.spectral_rolloff
-                                        ),
-                                        axis=-1,
-                                        keepdims=True
-                                    ).tolist()
-                                )
-                            )
-
-                    if args.sha256 or args.sha256_short:
-                        audio_meta["sha256"] = generate_sha256_from_file(file)
-            
             else:
-                try:
-                    audio, fs = read_audio(file, dtype=args.dtype)
-                    audio_peak_db = flatten_nested_list(
-                        peak_db(audio, axis=-1).tolist()
-                    )
-                    audio_rms_db = flatten_nested_list(
-                        rms_db(audio, axis=-1).tolist()
-                    )
-                    audio_is_clipped = is_clipped(audio)
-                    audio_is_anomalous = is_anomalous(audio)
-                    silent_frame_size_samples = (
-                        ms_to_samples(
-                            args.silent_frame_size_ms,
-                            fs=fs,
-                            truncate=True
+                idx, audio_meta, is_skipped = item
+                input_skipped[work_idx] += is_skipped
+                pending[work_idx][idx] = audio_meta
+                pbar.update(1)
+
+            # Output the results of the current input that are ready
+            while input_idx < num_inputs:
+                while next_idxs[input_idx] in pending[input_idx]:
+                    audio_meta = pending[input_idx].pop(next_idxs[input_idx])
+                    next_idxs[input_idx] += 1
+
+                    if audio_meta is None:
+                        continue
+
+                    with profile_stage("output", file=audio_meta["file"]):
+                        _write_record(
+                            audio_meta,
+                            cols,
+                            record_stream,
+                            record_writer,
+                            args
                         )
-                        if args.silent_frame_size_ms is not None else None
-                    )
-                    audio_is_silent = is_silent(
-                        x=audio,
-                        thresh_db=args.silent_thresh,
-                        frame_size=silent_frame_size_samples,
-                        hop_size=args.silent_hop_size,
-                        axis=-1,
-                        mode=args.silent_frame_mode
-                    )
-                    audio_meta["peak_db"] = audio_peak_db
-                    audio_meta["rms_db"] = audio_rms_db
-                    audio_meta["is_clipped"] = audio_is_clipped
-                    audio_meta["is_anomalous"] = audio_is_anomalous
-                    audio_meta["is_silent"] = audio_is_silent
-
-                    if args.spectral_rolloff is not None:
-                        if args.spectral_rolloff_detail:
-                            _spectral_rolloff = spectral_rolloff(
-                                audio,
-                                fs,
-                                args.fft_size,
-                                args.hop_size,
-                                rolloff=args.spectral_rolloff
-                            )
-                            _min_spectral_rolloff = flatten_nested_list(
-                                np.min(
-                                    _spectral_rolloff,
-                                    axis=-1,
-                                    keepdims=True
-                                ).tolist()
-                            )
-                            _max_spectral_rolloff = flatten_nested_list(
-                                    np.max(
-                                    _spectral_rolloff,
-                                    axis=-1,
-                                    keepdims=True
-                                ).tolist()
-                            )
-                            _average_spectral_rolloff = flatten_nested_list(
-                                    np.mean(
-                                    spectral_rolloff(
-                                        audio,
-                                        fs,
-                                        args.fft_size,
-                                        args.hop_size,
-                                        rolloff=args.spectral_rolloff
-                                    ),
-                                    axis=-1,
-                                    keepdims=True
-                                ).tolist()
-                            )
-                            audio_meta["spectral_rolloff_min"] = (
-                                _min_spectral_rolloff
-                            )
-                            audio_meta["spectral_rolloff"] = (
-                                _average_spectral_rolloff
-                            )
-                            audio_meta["spectral_rolloff_max"] = (
-                                _max_spectral_rolloff
-                            )
-                        
-                        else:
-                            audio_meta["spectral_rolloff"] = (
-                                    flatten_nested_list(
-                                        np.mean(
-                                        spectral_rolloff(
-                                            audio,
-                                            fs,
-                                            args.fft_size,
-                                            args.hop_size,
-                                            rolloff=args.spectral_rolloff
-                                        ),
-                                        axis=-1,
-                                        keepdims=True
-                                    ).tolist()
-                                )
-                            )
-
-                    if args.sha256 or args.sha256_short:
-                        audio_meta["sha256"] = generate_sha256_from_file(file)
-                
-                except Exception as e:
-                    exit_error(
-                        f"File '{file}' could not be parsed due to the "
-                        f"following error: {e}. Use --skip-invalid-files to "
-                        "ignore unparseable files and continue analysis"
-                    )
-            
-            # Apply filters
-            if (
-                (
-                    args.filter is not None
-                    and _matches_filter(
-                        data=audio_meta,
-                        preload=preload,
-                        expr=args.filter
-                    )
-                ) or (
-                    args.select is not None
-                    and not _matches_filter(
-                        data=audio_meta,
-                        preload=preload,
-                        expr=args.select,
-                    )
-                )
-            ):
-                continue
-  
-            if not args.summary:
-                file_repr = _audio_file_repr_from_dict(
-                    audio_meta,
-                    args.max_fname_chars,
-                    abbrev_hash=bool(args.sha256_short)
-                )
-                print(file_repr, writer=tqdm)
 
-        else:
-            # Format current file representation
-            if not args.summary:
-                file_repr = _audio_file_meta_repr_from_dict(
-                    audio_meta,
-                    args.max_fname_chars
-                )
-                print(file_repr, writer=tqdm)
-            
-        # Collect files for --post-action if any 
-        if args.post_action:
-            post_action_files.append(file)
-        
-        # Write data to csv
-        if args.csv:
-            with open(args.csv, "a") as f:
-                writer = csv.DictWriter(f, fieldnames=cols)
+                    # Collect results for the summary and --post-action
+                    store.append(audio_meta)
 
-                # Remove fields not written to .csv
-                del audio_meta["filename"]
+                if not is_done[input_idx]:
+                    break
 
-                writer.writerow(audio_meta)
-        
-        # Update global stats based on metadata
-        if isinstance(audio_meta["duration_seconds"], Number):
-            # NOTE: It may not be a number in invalid files
-            glob_stats["total_duration"] += audio_meta["duration_seconds"]
-        
-        # Update size
-        glob_stats["total_size_bytes"] += audio_meta["size_bytes"]
+                input_ends.append(len(store))
+                input_idx += 1
+
+    if workers is not None:
+        workers.close()
+
+    # NOTE: Manifests read lazily are only known to be empty at the end
+    if (
+        num_inputs == 1
+        and inputs[0].manifest is not None
+        and next_idxs[0] == 0
+    ):
+        _print_empty_input(inputs[0], args)
 
-        # Update duration stats
-        if (
-            (glob_stats["min_duration"] is None)
-            or (audio_meta["duration_seconds"] < glob_stats["min_duration"])
-        ):
-            glob_stats["min_duration"] = audio_meta["duration_seconds"]
-        
-        if (
-            (glob_stats["max_duration"] is None)
-            or (audio_meta["duration_seconds"] > glob_stats["max_duration"])
-        ):
-            glob_stats["max_duration"] = audio_meta["duration_seconds"]
-        
-        # Update channel stats
-        if audio_meta["num_channels"] == 1:
-            glob_stats["mono_files"] += 1
-            
-        elif audio_meta["num_channels"] == 2:
-            glob_stats["stereo_files"] += 1
-        
-        elif audio_meta["num_channels"] > 2:
-            glob_stats["multichannel_files"] += 1
-        
-        # Update sample rates
-        if audio_meta["fs"] not in glob_stats["fs"]:
-            glob_stats["fs"].append(audio_meta["fs"])
-        
-        # Update global stats based on audio data
-        if not args.meta:
-            if audio_is_silent:
-                glob_stats["silent_files"] += 1
-            
-            if audio_is_anomalous:
-                glob_stats["anomalous_files"] += 1
-            
-            if audio_is_clipped:
-                glob_stats["clipped_files"] += 1
-            
-            if audio_meta["is_invalid"]:
-                glob_stats["invalid_files"] += 1
-            
     # Get elapsed time
     elapsed_time = perf_counter() - start_time
+    glob_stats = _get_glob_stats(store, sum(input_skipped), args)
 
     # Print global stats
     if not args.summary:
         print("")
+
+    # Report invalid manifest rows all at once
+    for manifest in (i.manifest for i in inputs if i.manifest is not None):
+        if len(manifest.invalid_rows) > 0:
+            _print_invalid_manifest_rows(manifest)
+            print("")
+
+    # Print stats of each input
+    if num_inputs > 1:
+        _print_input_stats(
+            inputs,
+            store,
+            input_ends,
+            input_skipped,
+            input_times,
+            args
+        )
+        print("")
     
+    if inputs[0].scan is not None:
+        scan = inputs[0].scan
+        print(
+            "Changed folders:".ljust(22)
+            + f"{scan.num_changed_dirs}/{scan.num_dirs}"
+        )
+
     print(
         "Total file(s):".ljust(22) + str(
             glob_stats["mono_files"]
@@ -1404,6 +2707,17 @@ def sndls(args: Namespace) -> None:
         + time_to_str(glob_stats['total_duration']),
     )
 
+    if glob_stats["probe_duration"] is not None:
+        probe_ratio = (
+            glob_stats["probe_duration"] / glob_stats["total_duration"]
+            if glob_stats["total_duration"] > 0.0 else 0.0
+        )
+        print(
+            "Probed duration:".ljust(22)
+            + time_to_str(glob_stats["probe_duration"])
+            + f" ({100.0 * probe_ratio:.1f}%)"
+        )
+
     # NOTE: Total files are recalculated because some files may have been
     # filtered from len(files)
     total_files = (
@@ -1434,4 +2748,8 @@ def sndls(args: Namespace) -> None:
 
     # Perform --post-action if any
     if args.post_action:
-        _perform_post_action(post_action_files, args)
+        with profile_stage("post_action"):
+            _perform_post_action(store, args)
+    
+    _print_reports(args, track_memory)
+
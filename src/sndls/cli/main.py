@@ -1,9 +1,10 @@
+import os
 import sys
 import argparse
-from .cmd import sndls
 from ..utils.fmt import (
     printc_exit as print_exit,
-    exit_warning
+    exit_warning,
+    str_to_bytes
 )
 from sndls import (
     __description__,
@@ -20,9 +21,13 @@ def get_parser() -> argparse.Namespace:
     parser.add_argument(
         "input",
         type=str,
-        nargs="?",
-        default=".",
-        help="input audio file, .csv file or folder containing audio files"
+        nargs="*",
+        default=["."],
+        help=(
+            "input audio file(s), .csv or .parquet file(s) listing audio "
+            "files, or folder(s) containing audio files. Several inputs are "
+            "scanned and analyzed concurrently"
+        )
     )
     parser.add_argument(
     "-e", "--extension",
@@ -38,9 +43,22 @@ def get_parser() -> argparse.Namespace:
     )
     parser.add_argument(
         "-d", "--dtype",
-        choices=["float32", "float64"],
+        choices=["float32", "float64", "native"],
         default="float32",
-        help="data type used to read audio files and calculate stats"
+        help=(
+            "data type used to read audio files and calculate stats (native "
+            "reads integer PCM files without converting them to float)"
+        )
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help=(
+            "memory-map uncompressed WAV and AIFF files instead of decoding "
+            "them. Samples keep their native data type, as with --dtype "
+            "native, unless --dtype float64 is given, in which case they are "
+            "converted to float64 when read"
+        )
     )
     parser.add_argument(
         "-m", "--meta",
@@ -83,6 +101,15 @@ def get_parser() -> argparse.Namespace:
              "percentage"
         )
     )
+    parser.add_argument(
+        "--format",
+        choices=["text", "jsonl", "tsv"],
+        default="text",
+        help=(
+            "output format. jsonl and tsv write one record per file to stdout "
+            "without colors or progress bars, and any other output to stderr"
+        )
+    )
     parser.add_argument(
         "--summary",
         action="store_true",
@@ -150,12 +177,122 @@ def get_parser() -> argparse.Namespace:
         action="store_true",
         help="shows spectral rollof in min ≤ mean ≤ max format"
     )
+    parser.add_argument(
+        "--fft-workers",
+        type=int,
+        default=1,
+        help=(
+            "number of threads used by the FFT to compute the spectral "
+            "rolloff. The frames of short files are batched into large FFT "
+            "calls, so values above 1 also speed up folders of short clips"
+        )
+    )
+    parser.add_argument(
+        "--probe",
+        action="store_true",
+        help=(
+            "analyze only the head, the tail and a few random windows of "
+            "each file for fast triage (see --probe-window-size and "
+            "--probe-num-random-windows)"
+        )
+    )
+    parser.add_argument(
+        "--probe-window-size",
+        type=float,
+        default=5.0,
+        help="length in seconds of each window analyzed if --probe is enabled"
+    )
+    parser.add_argument(
+        "--probe-num-random-windows",
+        type=int,
+        default=2,
+        help=(
+            "number of random windows analyzed in addition to the head and "
+            "tail if --probe is enabled (seeded with --random-seed)"
+        )
+    )
+    parser.add_argument(
+        "--read-order",
+        choices=["path", "inode", "physical", "size"],
+        default="path",
+        help=(
+            "order in which files are read to maximize sequential disk "
+            "access (inode number, physical position on disk or file size). "
+            "Results are always shown in path order"
+        )
+    )
+    parser.add_argument(
+        "--segment-workers",
+        type=int,
+        default=1,
+        help=(
+            "number of threads used to analyze segments of files longer than "
+            "--segment-size in parallel"
+        )
+    )
+    parser.add_argument(
+        "--segment-size",
+        type=float,
+        default=300.0,
+        help=(
+            "length in seconds of the segments analyzed in parallel if "
+            "--segment-workers is greater than 1"
+        )
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=str_to_bytes,
+        help=(
+            "maximum memory in bytes (or with a K, M, G or T suffix) used by "
+            "the audio data being analyzed at once, estimated from the "
+            "metadata of each file. Files wait until they fit in the budget, "
+            "and files that do not fit on their own are analyzed in segments "
+            "instead of being read at once"
+        )
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help=(
+            "maximum number of seconds spent reading and analyzing each file. "
+            "If set, files are decoded and analyzed in supervised worker "
+            "processes (see --process-workers), and files whose worker hangs "
+            "or crashes are killed and handled as unparseable files"
+        )
+    )
+    parser.add_argument(
+        "--process-workers",
+        type=int,
+        default=1,
+        help="number of worker processes used if --timeout is set"
+    )
+    parser.add_argument(
+        "--index",
+        type=str,
+        help=(
+            "folder where the scanned folders and the results of their files "
+            "are kept, so that later scans of the same input folder only "
+            "list and analyze folders that changed"
+        )
+    )
     parser.add_argument(
         "-p", "--post-action",
-        choices=["cp", "mv", "rm", "mv+sp", "cp+sp", "dump", "dump+sp"],
+        choices=[
+            "cp",
+            "mv",
+            "ln",
+            "rm",
+            "mv+sp",
+            "cp+sp",
+            "ln+sp",
+            "tar",
+            "dump",
+            "dump+sp"
+        ],
         help=(
             "action to execute after listing all files (cp=copy, mv=move, "
-            "rm=remove, sp=split, dump=dump to file)"
+            "ln=link, rm=remove, sp=split, tar=pack into .tar shards, "
+            "dump=dump to file)"
         )
     )
     parser.add_argument(
@@ -163,7 +300,16 @@ def get_parser() -> argparse.Namespace:
         type=str,
         help=(
             "post action output (required for --post-action "
-            "{cp,mv,cp+sp,mv+sp, dump, dump+sp})"
+            "{cp,mv,ln,cp+sp,mv+sp,ln+sp,tar,dump,dump+sp})"
+        )
+    )
+    parser.add_argument(
+        "--copy-mode",
+        choices=["copy", "hardlink", "symlink", "reflink"],
+        help=(
+            "how files are materialized by --post-action {cp,ln,cp+sp,ln+sp}. "
+            "hardlink and reflink fall back to copy across devices (defaults "
+            "to copy for cp and cp+sp, and hardlink for ln and ln+sp)"
         )
     )
     parser.add_argument(
@@ -178,13 +324,47 @@ def get_parser() -> argparse.Namespace:
         "--post-action-num-splits",
         type=int,
         help="number of partitions (required for --post-action {cp+sp,mv+sp,"
-             "dump+sp})"
+             "ln+sp,dump+sp})"
+    )
+    parser.add_argument(
+        "--split-balance",
+        choices=["count", "duration", "size"],
+        default="count",
+        help=(
+            "criterion used to balance partitions created by --post-action "
+            "{cp+sp,mv+sp,ln+sp,dump+sp}: same number of files, same total "
+            "duration or same total size"
+        )
     )
     parser.add_argument(
         "--post-action-split-dirname",
         type=str,
         default="split_",
-        help="split folder name (only valid if --post-action {cp+sp,mv+sp})"
+        help="split folder name (only valid if --post-action {cp+sp,mv+sp,"
+             "ln+sp})"
+    )
+    parser.add_argument(
+        "--post-action-shard-size",
+        type=float,
+        default=1024.0,
+        help="maximum size in megabytes of each .tar shard created by "
+             "--post-action tar"
+    )
+    parser.add_argument(
+        "--post-action-shard-meta",
+        action="store_true",
+        help="add a .json file with the metadata and stats of each file to "
+             "the .tar shards created by --post-action tar"
+    )
+    parser.add_argument(
+        "--post-action-workers",
+        type=int,
+        default=1,
+        help=(
+            "number of threads used to copy, link, move or remove files, or "
+            "to write .tar shards with --post-action. Values above 1 can be "
+            "much faster on network storage"
+        )
     )
     parser.add_argument(
         "--max-fname-chars",
@@ -196,13 +376,43 @@ def get_parser() -> argparse.Namespace:
         "--csv-input-file-col",
         type=str,
         default="file",
-        help="name of the column containing files if the input is a .csv file"
+        help=(
+            "name of the column containing files if the input is a .csv or "
+            ".parquet file"
+        )
     )
     parser.add_argument(
         "--csv-ignore-errors",
         action="store_true",
         help="skip rows with errors when reading .csv files"
     )
+    parser.add_argument(
+        "--from-results",
+        action="store_true",
+        help=(
+            "treat the input .csv or .parquet file as results saved with "
+            "--csv, and apply --filter/--select, --sample, the summary and "
+            "--post-action to them without reading any audio file"
+        )
+    )
+    parser.add_argument(
+        "--diff",
+        type=str,
+        help=(
+            "compare the input .csv or .parquet results with older results "
+            "saved with --csv, and show added, removed, modified, moved and "
+            "renamed files, and files whose stats changed"
+        )
+    )
+    parser.add_argument(
+        "--diff-tolerance",
+        type=float,
+        default=0.1,
+        help=(
+            "largest change in decibels of the peak or root mean square (RMS)"
+            " level of any channel that is not reported by --diff"
+        )
+    )
     parser.add_argument(
         "--max-duration",
         type=float,
@@ -246,6 +456,40 @@ def get_parser() -> argparse.Namespace:
         default=1234,
         help="random seed used if --sample is enabled"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print the time spent in each processing stage"
+    )
+    parser.add_argument(
+        "--profile-trace",
+        type=str,
+        help="write the time spent in each processing stage to a .json file "
+        "in Chrome trace event format (implies --profile)"
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="print the peak memory used by the decoding, statistics, "
+        "spectral rolloff, hashing and preload stages and the files using "
+        "the most memory. Peaks are process-wide, so if files are analyzed "
+        "concurrently (several inputs, --segment-workers or "
+        "--process-workers above 1) only the peak of the whole process is "
+        "reported. Memory used by the worker processes of --timeout is not "
+        "included"
+    )
+    parser.add_argument(
+        "--memory-tracemalloc",
+        action="store_true",
+        help="also measure allocation peaks with tracemalloc. This is more "
+        "accurate but slower (implies --memory)"
+    )
+    parser.add_argument(
+        "--memory-report",
+        type=str,
+        help="write the memory usage report to a .json file (implies "
+        "--memory)"
+    )
 
     return parser
 
@@ -259,8 +503,18 @@ def main() -> None:
     parser = get_parser()
     args = parser.parse_args()
 
+    # NOTE: Heavy dependencies are only imported once arguments are parsed
+    from .cmd import sndls
+
     try:
         sndls(args)
     
     except KeyboardInterrupt:
         exit_warning("Process terminated by the user")
+    
+    except BrokenPipeError:
+        # NOTE: The output was piped to a process that stopped reading it
+        # (e.g. head). stdout is redirected to avoid a second error when
+        # python flushes it at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
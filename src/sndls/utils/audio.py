@@ -1,9 +1,11 @@
+import math
 import numpy as np
+from functools import lru_cache
 from typing import (
     Optional,
+    Tuple,
     Union
 )
-from scipy.signal import stft
 from numpy.lib.stride_tricks import sliding_window_view
 from .config import get_default_eps
 
@@ -27,6 +29,55 @@ def ms_to_samples(
     return int(samples) if truncate else samples
 
 
+def is_integer_audio(x: np.ndarray) -> bool:
+    """Returns `True` if a `np.ndarray` contains audio data in integer PCM
+    format (e.g. as read by `read_audio` with `dtype="int16"`).
+
+    Args:
+        x (np.ndarray): Input audio data.
+
+    Returns:
+        bool: `True` if `x` has an integer data type, `False` otherwise.
+    """
+    return np.issubdtype(x.dtype, np.integer)
+
+
+def get_full_scale(dtype: Union[str, np.dtype]) -> float:
+    """Returns the value representing an amplitude of 1.0 for a given data
+    type. That is, `2 ** (num_bits - 1)` for integer PCM data and 1.0 for
+    floating point data.
+
+    Args:
+        dtype (Union[str, np.dtype]): Data type of the audio data.
+
+    Returns:
+        float: Full scale value.
+    """
+    dtype = np.dtype(dtype)
+
+    if np.issubdtype(dtype, np.integer):
+        return float(2 ** (8 * dtype.itemsize - 1))
+
+    return 1.0
+
+
+def to_float(x: np.ndarray, dtype: str = "float32") -> np.ndarray:
+    """Converts audio data to floating point in the [-1.0, 1.0) range. Floating
+    point data is returned unchanged.
+
+    Args:
+        x (np.ndarray): Input audio data.
+        dtype (str): Floating point data type used for integer data.
+
+    Returns:
+        np.ndarray: Floating point audio data.
+    """
+    if not is_integer_audio(x):
+        return x
+
+    return x.astype(dtype) / np.asarray(get_full_scale(x.dtype), dtype=dtype)
+
+
 def amp_to_db(x: np.ndarray, eps: float = get_default_eps()) -> np.ndarray:
     """Returns the amplitude in decibels of every sample.
     
@@ -67,8 +118,18 @@ def peak_amp(x: np.ndarray, axis: int = -1) -> np.ndarray:
         axis (int): Axis along which the peak amplitude is calculated.
     
     Returns:
-        np.ndarray: Array containing peak amplitude values.
+        np.ndarray: Array containing peak amplitude values. For integer PCM
+            data, values are relative to full scale.
     """
+    if is_integer_audio(x):
+        # NOTE: np.abs overflows for the most negative integer, so the peak
+        # is taken from the extremes instead
+        peak = np.maximum(
+            np.amax(x, axis=axis, keepdims=True).astype(np.float64),
+            -np.amin(x, axis=axis, keepdims=True).astype(np.float64)
+        )
+        return peak / get_full_scale(x.dtype)
+
     return np.amax(np.abs(x), axis=axis, keepdims=True)
 
 
@@ -98,8 +159,19 @@ def rms(x: np.ndarray, axis: int = -1) -> np.ndarray:
         axis (int): Axis along which the root mean square level is calculated.
     
     Returns:
-        np.ndarray: Array containing the root mean square level.
+        np.ndarray: Array containing the root mean square level. For integer
+            PCM data, values are relative to full scale.
     """
+    if is_integer_audio(x):
+        # NOTE: Squares are accumulated in float64 without converting x
+        x_ = np.moveaxis(x, axis, -1)
+        power = np.einsum("...i,...i->...", x_, x_, dtype=np.float64)
+        power /= x_.shape[-1]
+        return np.expand_dims(
+            np.sqrt(power) / get_full_scale(x.dtype),
+            axis=axis
+        )
+
     return np.mean(x ** 2, axis=axis, keepdims=True) ** 0.5
 
 
@@ -116,6 +188,28 @@ def rms_db(x: np.ndarray, axis: int = -1) -> np.ndarray:
     return amp_to_db(rms(x, axis=axis))
 
 
+def sum_of_squares(x: np.ndarray, axis: int = -1) -> np.ndarray:
+    """Returns the sum of squares of a `np.ndarray` accumulated in `float64`.
+    Together with the number of samples, it allows merging the root mean
+    square level of several chunks of a signal exactly.
+
+    Args:
+        x (np.ndarray): Input audio data.
+        axis (int): Axis along which squares are summed.
+
+    Returns:
+        np.ndarray: Array containing the sum of squares. For integer PCM
+            data, values are relative to full scale.
+    """
+    x_ = np.moveaxis(x, axis, -1)
+    energy = np.einsum("...i,...i->...", x_, x_, dtype=np.float64)
+
+    if is_integer_audio(x):
+        energy /= get_full_scale(x.dtype) ** 2
+
+    return np.expand_dims(energy, axis=axis)
+
+
 def frame_cutter(x: np.ndarray, frame_size: int, hop_size: int) -> np.ndarray:
     """
     Cuts an input array into frames of a specified size with a given hop size.
@@ -144,6 +238,13 @@ def is_clipped(x: np.ndarray, min: float = -1.0, max: float = 1.0) -> bool:
         bool: `True` if the file contains at least one value outside the given
             range.
     """
+    if is_integer_audio(x):
+        # NOTE: The range is given relative to full scale
+        full_scale = get_full_scale(x.dtype)
+        return bool(
+            np.amax(x) > max * full_scale or np.amin(x) < min * full_scale
+        )
+
     result = np.logical_or(np.any(x > max), np.any(x < min))
     return bool(result)
 
@@ -159,6 +260,9 @@ def is_anomalous(x: np.ndarray) -> bool:
         bool: `True` if the file contains at least one `inf`, `-inf` or `NaN`
             value.
     """
+    if is_integer_audio(x):
+        return False
+
     result = np.logical_or(
         np.logical_or(np.isinf(x).any(), np.isneginf(x).any()),
         np.isnan(x).any()
@@ -166,6 +270,139 @@ def is_anomalous(x: np.ndarray) -> bool:
     return bool(result)
 
 
+def frame_energy(
+        x: np.ndarray,
+        frame_size: int,
+        hop_size: int,
+        axis: int = -1
+) -> np.ndarray:
+    """Returns the sum of squares of each frame of a `np.ndarray`, using the
+    same frames as `frame_cutter`.
+
+    Squares are summed once in `float64` over blocks of
+    `gcd(frame_size, hop_size)` samples, and the energy of each frame is
+    obtained from the cumulative sum of the block energies. Hence, the cost
+    does not depend on the overlap between frames and no frame is copied.
+
+    Args:
+        x (np.ndarray): Input audio data.
+        frame_size (int): Frame size in samples.
+        hop_size (int): Number of samples between adjacent frames.
+        axis (int): Axis along which frames are cut.
+
+    Returns:
+        np.ndarray: Array containing the sum of squares of each frame along
+            `axis`. For integer PCM data, values are relative to full scale.
+    """
+    x = np.moveaxis(x, axis, -1)
+    num_samples = x.shape[-1]
+    num_frames = max(0, (num_samples - frame_size) // hop_size + 1)
+    block_size = math.gcd(frame_size, hop_size)
+    num_blocks = ((num_frames - 1) * hop_size + frame_size) // block_size
+
+    # Energy of each block
+    blocks = x[..., :num_blocks * block_size].reshape(
+        *x.shape[:-1], num_blocks, block_size
+    )
+    cumsum = np.zeros((*x.shape[:-1], num_blocks + 1), dtype=np.float64)
+    np.einsum(
+        "...ij,...ij->...i",
+        blocks,
+        blocks,
+        dtype=np.float64,
+        out=cumsum[..., 1:]
+    )
+
+    if is_integer_audio(x):
+        cumsum /= get_full_scale(x.dtype) ** 2
+
+    # Energy of each frame
+    np.cumsum(cumsum[..., 1:], axis=-1, out=cumsum[..., 1:])
+    starts = np.arange(num_frames) * (hop_size // block_size)
+    energy = (
+        cumsum[..., starts + frame_size // block_size] - cumsum[..., starts]
+    )
+
+    # NOTE: Rounding errors of the cumulative sum may lead to tiny negative
+    # energies in silent frames
+    return np.moveaxis(np.maximum(energy, 0.0), -1, axis)
+
+
+def frame_rms_db(
+        x: np.ndarray,
+        frame_size: int,
+        hop_size: float = 0.5,
+        axis: int = -1
+) -> np.ndarray:
+    """Returns the root mean square level in decibels of each frame of the
+    mono sum of a `np.ndarray` containing audio data.
+
+    Args:
+        x (np.ndarray): Input audio data in (num_channels, num_samples)
+            format.
+        frame_size (int): Frame size in samples. If `x` is shorter, a single
+            frame containing all samples is used.
+        hop_size (float): Hop size as a fraction of `frame_size`.
+        axis (int): Axis along which frames are cut.
+
+    Returns:
+        np.ndarray: Root mean square level in decibels of each frame.
+    """
+    if is_integer_audio(x):
+        # NOTE: The monosum of integer data may overflow its data type
+        x = np.sum(x, axis=0, dtype=np.float64) / get_full_scale(x.dtype)
+
+    else:
+        x = np.sum(x, axis=0)  # Monosum
+
+    num_samples = x.shape[axis]
+    frame_size_ = frame_size if num_samples > frame_size else num_samples
+    energy = frame_energy(
+        x,
+        frame_size=frame_size_,
+        hop_size=int(frame_size * hop_size),
+        axis=axis
+    )
+    return np.ravel(amp_to_db(np.sqrt(energy / frame_size_)))
+
+
+def is_silent_frames(
+        db_rms: np.ndarray,
+        thresh_db: float = -80.0,
+        mode: Optional[str] = "any"
+) -> bool:
+    """Returns `True` if a set of frames is silent according to their root
+    mean square level in decibels.
+
+    Args:
+        db_rms (np.ndarray): Root mean square level in decibels of each
+            frame (see `frame_rms_db`).
+        thresh_db (float): Minimum threshold below which a frame is
+            considered silent.
+        mode (str): Method to flag the frames as silent. See `is_silent`.
+
+    Returns:
+        bool: `True` if the frames are silent, `False` otherwise.
+    """
+    if mode == "any":
+        return bool(np.any(db_rms < thresh_db))
+    
+    elif mode == "all":
+        return bool(np.all(db_rms < thresh_db))
+    
+    elif mode == "mean":
+        return bool(np.mean(db_rms) < thresh_db)
+    
+    elif mode == "median":
+        return bool(np.median(db_rms) < thresh_db)
+    
+    elif mode == "max":
+        return bool(np.max(db_rms) < thresh_db)
+    
+    else:
+        raise ValueError(f"Invalid mode {mode=}")
+
+
 def is_silent(
         x: np.ndarray,
         thresh_db: float = -80.0,
@@ -200,91 +437,197 @@ def is_silent(
         bool: `True` if `x` is silent, `False` otherwise.
     """
     if frame_size is not None:
-        x = np.sum(x, axis=0)  # Monosum
-        x_frames = frame_cutter(
-            x,
-            frame_size=(
-                frame_size if x.shape[axis] > frame_size else x.shape[axis]
-            ),
-            hop_size=int(frame_size * hop_size)
+        return is_silent_frames(
+            frame_rms_db(x, frame_size, hop_size=hop_size, axis=axis),
+            thresh_db=thresh_db,
+            mode=mode
         )
-        db_rms = np.asarray(rms_db(x_frames, axis=axis))
-
-        if mode == "any":
-            return bool(np.any(db_rms < thresh_db))
-        
-        elif mode == "all":
-            return bool(np.all(db_rms < thresh_db))
-        
-        elif mode == "mean":
-            return bool(np.mean(db_rms) < thresh_db)
-        
-        elif mode == "median":
-            return bool(np.median(db_rms) < thresh_db)
-        
-        elif mode == "max":
-            return bool(np.max(db_rms) < thresh_db)
-        
-        else:
-            raise ValueError(f"Invalid mode {mode=}")
 
     else:
         db_rms = rms_db(x, axis=axis)
         return bool(np.all(db_rms < thresh_db))
 
 
+@lru_cache(maxsize=16)
+def get_stft_window(
+        window: str,
+        fft_size: int,
+        dtype: str = "float32"
+) -> Tuple[np.ndarray, np.generic]:
+    """Returns an STFT window and the factor the spectrum is scaled by, as
+    done by `scipy.signal.stft` with `scaling="spectrum"`. Results are
+    cached, so that the window is only computed once per FFT size.
+
+    Args:
+        window (str): Window type (see `scipy.signal.get_window`).
+        fft_size (int): Size of the FFT.
+        dtype (str): Floating point data type of the frames.
+
+    Returns:
+        Tuple[np.ndarray, np.generic]: Read-only window and scale factor.
+    """
+    # NOTE: scipy is only imported if needed since it is slow to import
+    from scipy.signal import get_window
+
+    # NOTE: scipy computes the scale in the complex data type of the
+    # spectrum, so it is replicated to obtain exactly the same spectrum
+    complex_window = get_window(window, fft_size).astype(
+        np.result_type(dtype, np.complex64)
+    )
+    scale = np.sqrt(1.0 / complex_window.sum() ** 2)
+    win = complex_window.real.astype(dtype)
+    win.flags.writeable = False
+
+    return win, scale
+
+
+def stft_frames(
+        x: np.ndarray,
+        fft_size: int,
+        hop_size: int,
+        boundary: Optional[str] = "zeros"
+) -> np.ndarray:
+    """Cuts an input array into the (unwindowed) frames of its STFT.
+
+    Args:
+        x (np.ndarray): Input audio data in (..., time) format.
+        fft_size (int): Size of the FFT.
+        hop_size (int): Hop size of the FFT.
+        boundary (Optional[str]): If `zeros`, `x` is padded with
+            `fft_size // 2` zeros at both ends, so that the first frame is
+            centered at its first sample. If `None`, frames start at the
+            first sample.
+
+    Returns:
+        np.ndarray: Frames in (..., num_frames, fft_size) format. A view of
+            `x` is returned if `boundary` is `None`.
+
+    Raises:
+        ValueError: If `boundary` is not `zeros` or `None`.
+    """
+    if boundary == "zeros":
+        pad = [(0, 0)] * (x.ndim - 1) + [(fft_size // 2, fft_size // 2)]
+        x = np.pad(x, pad)
+
+    elif boundary is not None:
+        raise ValueError(f"Unknown boundary '{boundary}'")
+
+    if x.shape[-1] < fft_size:
+        return np.empty((*x.shape[:-1], 0, fft_size), dtype=x.dtype)
+
+    return sliding_window_view(x, fft_size, axis=-1)[..., ::hop_size, :]
+
+
+def rolloff_bins(
+        frames: np.ndarray,
+        window: str = "hann",
+        rolloff: float = 0.9,
+        workers: int = 1,
+        out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Calculates the index of the frequency bin under which `rolloff`
+    percent of the energy of each frame is accumulated.
+
+    Frames are windowed and transformed with `scipy.fft.rfft`, which splits
+    the frames among `workers` threads.
+
+    Args:
+        frames (np.ndarray): Floating point frames in (..., fft_size)
+            format, as returned by `stft_frames`.
+        window (str): Window type.
+        rolloff (float): Rolloff percent between 0.0 and 1.0.
+        workers (int): Number of threads used by the FFT.
+        out (Optional[np.ndarray]): Buffer with the same shape and data type
+            as `frames` where windowed frames are written (it can be
+            `frames` itself). A new array is allocated if not given.
+
+    Returns:
+        np.ndarray: Bin index of each frame in (...) format.
+    """
+    # NOTE: scipy is only imported if needed since it is slow to import
+    from scipy.fft import rfft
+
+    win, scale = get_stft_window(window, frames.shape[-1], frames.dtype.name)
+    windowed = np.multiply(frames, win, out=out)
+    x_stft = rfft(windowed, axis=-1, workers=workers)
+    x_stft *= scale
+    x_mag = np.abs(x_stft)
+
+    # NOTE: The first bin whose cumulative magnitude is not below the
+    # threshold is the lowest frequency that reaches it
+    x_mag_cumsum = np.cumsum(x_mag, axis=-1, out=x_mag)
+    rolloff_threshold = rolloff * x_mag_cumsum[..., -1:]
+
+    return np.argmax(~(x_mag_cumsum < rolloff_threshold), axis=-1)
+
+
 def spectral_rolloff(
         x: np.ndarray,
         fs: int,
         fft_size: int,
         hop_size: Optional[int],
         window: str = "hann",
-        rolloff: float = 0.9
+        rolloff: float = 0.9,
+        boundary: Optional[str] = "zeros",
+        workers: int = 1,
+        max_frames: int = 1024
 ) -> np.ndarray:
     """Calculates the spectral rolloff of an input array `x`. That is, the
     frequency bin under which `rolloff` percent of the energy is
     accumulated.
 
+    The spectrum is computed as `scipy.signal.stft` does, but frames are
+    transformed in blocks of at most `max_frames` frames using `scipy.fft`
+    with `workers` threads, so that the memory used by the spectrum does not
+    grow with the length of `x`.
+
     Args:
         x (np.ndarray): Input audio data.
         fs (int): Sample rate.
         fft_size (int): Size of the FFT.
-        hop_size (Optional[int]): Hop size of the FFT.
+        hop_size (Optional[int]): Hop size of the FFT. If `None`,
+            `fft_size // 2` is used.
         window (str): Window type.
         rolloff (float): Rolloff percent between 0.0 and 1.0. Rolloff of
             0.9 means that the resulting rolloff for a given frequency is
             the value under which 90 percent of the energy is accumulated.
+        boundary (Optional[str]): If `zeros`, `x` is padded with zeros at
+            both ends so that the first frame is centered at its first
+            sample (see `scipy.signal.stft`). If `None`, frames start at the
+            first sample.
+        workers (int): Number of threads used by the FFT.
+        max_frames (int): Maximum number of frames transformed at once.
     
     Returns:
         np.ndarray: Array containing framewise roll-off.
     """
     if rolloff < 0.0 or rolloff > 1.0:
         raise ValueError("rolloff must be between 0.0 and 1.0")
-    
-    # Compute magnitude
-    fc, _, x_stft = stft(
-        x,
-        fs=fs,
-        nperseg=fft_size,
-        nfft=None,
-        noverlap=fft_size - hop_size,
-        window=window,
-        return_onesided=True,
-        padded=False,
-        scaling="spectrum"
-    )
-    x_mag = np.abs(x_stft)
-    fc = np.expand_dims(fc, axis=(0, -1))
-    fc = np.broadcast_to(fc, x_mag.shape)
-
-    # Get cumulative sum and obtain rolloff threshold per frame
-    x_mag_cumsum = np.cumsum(x_mag, axis=-2)
-    rolloff_threshold = np.expand_dims(
-        rolloff * x_mag_cumsum[..., -1, :], axis=-2
-    )
-
-    # Mask all values below threshold as inf
-    rolloff_idx = np.where(x_mag_cumsum < rolloff_threshold, np.nan, 1.0)
-    rolloff_freq = np.nanmin(fc * rolloff_idx, axis=-2, keepdims=True)
 
-    return rolloff_freq
+    if hop_size is None:
+        hop_size = fft_size // 2
+
+    frames = stft_frames(x, fft_size, hop_size, boundary=boundary)
+    num_frames = frames.shape[-2]
+    bins = np.empty(frames.shape[:-1], dtype=np.intp)
+    block_size = max(1, max_frames)
+    out = np.empty((min(block_size, num_frames), fft_size), x.dtype)
+
+    # NOTE: Frames overlap, so flattening the frames of several channels
+    # would copy all of them. Blocks are taken from one channel at a time
+    # instead, so at most `max_frames` frames are materialized
+    for idx in np.ndindex(frames.shape[:-2]):
+        for start in range(0, num_frames, block_size):
+            block = frames[idx][start:start + block_size]
+            bins[idx][start:start + len(block)] = rolloff_bins(
+                block,
+                window=window,
+                rolloff=rolloff,
+                workers=workers,
+                out=out[:len(block)]
+            )
+
+    # NOTE: Bin frequencies are computed as scipy does
+    freqs = np.fft.rfftfreq(fft_size, d=1 / fs)
+
+    return np.expand_dims(freqs[bins], axis=-2)
@@ -1,3 +1,4 @@
+import heapq
 from itertools import chain
 from typing import (
     Any,
@@ -33,6 +34,43 @@ def flatten_nested_list(nl: List[List]) -> List[Any]:
     )
 
 
+def partition_by_weight(
+        weights: List[float],
+        num_partitions: int
+) -> List[List[int]]:
+    """Partitions a set of weighted elements into `num_partitions` partitions
+    with approximately the same total weight. Elements are assigned from the
+    heaviest to the lightest to the partition with the lowest total weight
+    so far (longest-processing-time-first scheduling). Ties are broken by the
+    number of elements of each partition and then by its index, so that
+    zero-weight elements are spread evenly and the result is deterministic.
+
+    Args:
+        weights (List[float]): Weight of each element.
+        num_partitions (int): Number of partitions.
+
+    Returns:
+        List[List[int]]: Indices of the elements of each partition, in
+            ascending order.
+    """
+    partitions = [[] for _ in range(num_partitions)]
+    loads = [(0.0, 0, idx) for idx in range(num_partitions)]
+
+    for idx in sorted(
+        range(len(weights)),
+        key=lambda idx: weights[idx],
+        reverse=True
+    ):
+        load, count, partition_idx = heapq.heappop(loads)
+        partitions[partition_idx].append(idx)
+        heapq.heappush(
+            loads,
+            (load + weights[idx], count + 1, partition_idx)
+        )
+
+    return [sorted(partition) for partition in partitions]
+
+
 def time_to_str(time: float, abbrev: bool = False) -> str:
     """ Returns a time in seconds in a human readable format.
     
@@ -1,4 +1,5 @@
-import numpy as np
+import os
+import sys
 from typing import Tuple
 
 
@@ -59,6 +60,11 @@ class __Config__(metaclass=__Singleton__):
             "</u>": self._TEXT_DECORATORS["end_decoration"]
         }
 
+        # NOTE: Colors are disabled if the output is not a terminal or if
+        # the NO_COLOR environment variable is set
+        self._COLOR_ENABLED = (
+            sys.stdout.isatty() and os.environ.get("NO_COLOR", "") == ""
+        )
         self._DEFAULT_AUDIO_IO_DTYPE = "float32"
         self._DEFAULT_AUDIO_SUBTYPE = "FLOAT"
         self._SINGLE_PROCESS_PROGRESS_BAR_COLOR = "green"
@@ -92,6 +98,25 @@ def _get_text_decorator_tags() -> dict:
     return __Config__()._TEXT_DECORATOR_TAGS
 
 
+def is_color_enabled() -> bool:
+    """Returns `True` if colors and decorators are enabled.
+
+    Returns:
+        bool: `True` if colors and decorators are enabled, `False` otherwise.
+    """
+    return __Config__()._COLOR_ENABLED
+
+
+def set_color_enabled(enabled: bool) -> None:
+    """Enables or disables colors and decorators.
+
+    Args:
+        enabled (bool): If `False`, color and decorator tags are removed
+            instead of being replaced by their escape sequences.
+    """
+    __Config__()._COLOR_ENABLED = enabled
+
+
 def get_sppbar_color() -> str:
     """Returns the default single process progress bar color.
     
@@ -127,6 +152,8 @@ def get_default_eps() -> float:
         float: Default epsilon for the current default data type used to read
             audio data.
     """
+    import numpy as np
+
     return np.finfo(get_default_audio_io_dtype()).eps
 
 
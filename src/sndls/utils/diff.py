@@ -0,0 +1,300 @@
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List
+)
+
+if TYPE_CHECKING:
+    import polars as pl
+
+# Categories of changes between two snapshots, in the order they are shown
+DIFF_CHANGES = (
+    "added",
+    "removed",
+    "modified",
+    "moved",
+    "renamed",
+    "stats_changed"
+)
+
+# Fields compared to detect modified files if `sha256` is not available
+_CONTENT_FIELDS = (
+    "size_bytes",
+    "fs",
+    "num_channels",
+    "num_samples_per_channel"
+)
+
+# Fields compared to detect files whose stats changed
+_FLAG_FIELDS = ("is_clipped", "is_anomalous", "is_silent", "is_invalid")
+_LEVEL_FIELDS = ("peak_db", "rms_db")
+
+# Columns of the table returned by `diff_results`
+_DIFF_COLS = (
+    "change",
+    "file",
+    "old_file",
+    "size_bytes",
+    "old_size_bytes",
+    "duration_seconds",
+    "old_duration_seconds"
+)
+
+
+def _max_abs_diff(
+        df: pl.DataFrame,
+        a: str,
+        b: str
+) -> pl.Expr:
+    """Returns an expression with the largest absolute difference between the
+    values of two per-channel columns.
+
+    !!! note
+        Channels are compared one at a time, since files whose number of
+        channels changed cannot be subtracted as lists.
+
+    Args:
+        df (pl.DataFrame): Data containing both columns.
+        a (str): First column.
+        b (str): Second column.
+
+    Returns:
+        pl.Expr: Largest absolute difference (null if no channel is present
+            in both columns).
+    """
+    import polars as pl
+
+    num_channels = max(
+        df.get_column(a).list.len().max() or 0,
+        df.get_column(b).list.len().max() or 0,
+        1
+    )
+
+    return pl.max_horizontal(
+        (
+            pl.col(a).list.get(idx, null_on_oob=True)
+            - pl.col(b).list.get(idx, null_on_oob=True)
+        ).abs()
+        for idx in range(num_channels)
+    )
+
+
+def _pair_by(
+        removed: pl.DataFrame,
+        added: pl.DataFrame,
+        keys: List[str]
+) -> pl.DataFrame:
+    """Pairs removed and added files with the same values in a set of
+    columns.
+
+    Files sharing the same values (e.g. duplicated files with the same
+    `sha256`) are paired one to one in path order.
+
+    Args:
+        removed (pl.DataFrame): Files only found in the old snapshot, with
+            `old_` prefixed columns.
+        added (pl.DataFrame): Files only found in the new snapshot.
+        keys (List[str]): Columns to match (without the `old_` prefix).
+
+    Returns:
+        pl.DataFrame: One row per pair, with the columns of both files.
+    """
+    import polars as pl
+
+    def _rank(df: pl.DataFrame, cols: List[str]) -> pl.DataFrame:
+        return df.with_columns(
+            pl.int_range(pl.len()).over(cols).alias("_rank")
+        )
+
+    old_keys = [f"old_{k}" for k in keys]
+
+    return _rank(added.sort("file"), keys).join(
+        _rank(removed.sort("old_file"), old_keys),
+        left_on=[*keys, "_rank"],
+        right_on=[*old_keys, "_rank"],
+        how="inner"
+    ).drop("_rank")
+
+
+def diff_results(
+        old: pl.DataFrame,
+        new: pl.DataFrame,
+        tolerance_db: float = 0.1
+) -> pl.DataFrame:
+    """Compares two snapshots of the results of a dataset (e.g. as read by
+    `sndls.utils.store.read_results_dataframe`).
+
+    Files are matched with hash joins, in this order:
+
+    1. By path. Files whose content changed (different `sha256` or, if it is
+        not available in both snapshots, different size, sample rate,
+        number of channels or length) are `modified`, and files whose
+        `peak_db` or `rms_db` changed by more than `tolerance_db` in any
+        channel, or whose flags changed, are `stats_changed`.
+    2. Files only found in one of the snapshots are paired by `sha256` (or,
+        if it is not available, by filename and size). Pairs in the same
+        folder are `renamed`, and the rest are `moved`.
+    3. Remaining files are `added` or `removed`.
+
+    Args:
+        old (pl.DataFrame): Old snapshot.
+        new (pl.DataFrame): New snapshot.
+        tolerance_db (float): Largest change of `peak_db` and `rms_db` that
+            is not reported.
+
+    Returns:
+        pl.DataFrame: One row per change, sorted by path, with columns
+            `change`, `file` and `old_file` (`None` for removed and added
+            files, respectively), and the size and duration of both files.
+            Unchanged files are not included.
+
+    Raises:
+        ValueError: If any of the snapshots has no `file` or `size_bytes`
+            column.
+    """
+    import polars as pl
+
+    for df in (old, new):
+        for col in ("file", "size_bytes"):
+            if col not in df.columns:
+                raise ValueError(f"No '{col}' column found")
+
+    # NOTE: Only fields available in both snapshots are compared
+    fields = [c for c in new.columns if c in old.columns]
+    new = new.select(fields)
+    old = old.select(fields).rename({c: f"old_{c}" for c in fields})
+
+    joined = new.join(
+        old,
+        left_on="file",
+        right_on="old_file",
+        how="full",
+        coalesce=False
+    )
+    both = joined.filter(
+        pl.col("file").is_not_null() & pl.col("old_file").is_not_null()
+    )
+
+    # Files found in both snapshots
+    content_fields = (
+        ["sha256"] if "sha256" in fields
+        else [c for c in _CONTENT_FIELDS if c in fields]
+    )
+    is_modified = pl.any_horizontal(
+        pl.col(c).ne_missing(pl.col(f"old_{c}")) for c in content_fields
+    )
+    stats_exprs = [
+        pl.col(c).ne_missing(pl.col(f"old_{c}"))
+        for c in _FLAG_FIELDS if c in fields
+    ] + [
+        _max_abs_diff(both, c, f"old_{c}") > tolerance_db
+        for c in _LEVEL_FIELDS if c in fields
+    ]
+    is_stats_changed = (
+        pl.any_horizontal(stats_exprs).fill_null(False)
+        if len(stats_exprs) > 0 else pl.lit(False)
+    )
+    changed = both.with_columns(
+        pl.when(is_modified)
+        .then(pl.lit("modified"))
+        .when(is_stats_changed)
+        .then(pl.lit("stats_changed"))
+        .otherwise(None)
+        .alias("change")
+    ).filter(pl.col("change").is_not_null())
+
+    # Files found in only one of the snapshots
+    added = joined.filter(pl.col("old_file").is_null()).select(fields)
+    removed = joined.filter(pl.col("file").is_null()).select(
+        f"old_{c}" for c in fields
+    )
+
+    # NOTE: Without sha256, only files moved without being renamed are
+    # paired, since many files in a dataset may have the same size
+    if "sha256" in fields:
+        keys = ["sha256"]
+
+    else:
+        keys = ["_filename", "size_bytes"]
+        added = added.with_columns(
+            pl.col("file").str.extract(r"([^/\\]*)$").alias("_filename")
+        )
+        removed = removed.with_columns(
+            pl.col("old_file").str.extract(r"([^/\\]*)$")
+            .alias("old__filename")
+        )
+
+    moved = _pair_by(removed, added, keys)
+    added = added.join(moved.select("file"), on="file", how="anti")
+    removed = removed.join(moved.select("old_file"), on="old_file", how="anti")
+
+    def _dirname(col: str) -> pl.Expr:
+        return pl.col(col).str.replace(r"[^/\\]*$", "")
+
+    moved = moved.with_columns(
+        pl.when(_dirname("file") == _dirname("old_file"))
+        .then(pl.lit("renamed"))
+        .otherwise(pl.lit("moved"))
+        .alias("change")
+    )
+    added = added.with_columns(pl.lit("added").alias("change"))
+    removed = removed.with_columns(pl.lit("removed").alias("change"))
+
+    # NOTE: Columns of the snapshot a file is missing from (e.g. `old_file`
+    # of added files) are filled with nulls
+    frames = [
+        df.select(
+            pl.col(c) if c in df.columns else pl.lit(None).alias(c)
+            for c in _DIFF_COLS
+        )
+        for df in (added, removed, changed, moved)
+    ]
+
+    return pl.concat(frames, how="diagonal_relaxed").sort(
+        pl.coalesce("file", "old_file"),
+        maintain_order=True
+    )
+
+
+def get_diff_summary(
+        old: pl.DataFrame,
+        new: pl.DataFrame,
+        changes: pl.DataFrame
+) -> Dict[str, float]:
+    """Returns the number of files of each category of changes and the
+    totals of both snapshots.
+
+    Args:
+        old (pl.DataFrame): Old snapshot.
+        new (pl.DataFrame): New snapshot.
+        changes (pl.DataFrame): Changes returned by `diff_results`.
+
+    Returns:
+        Dict[str, float]: Number of files of each change in `DIFF_CHANGES`,
+            number of `unchanged` files, and number of files, total
+            duration and total size of each snapshot (`old_num_files`,
+            `num_files`, `old_total_duration`, `total_duration`,
+            `old_total_size_bytes` and `total_size_bytes`).
+    """
+    counts = dict(changes.group_by("change").len().iter_rows())
+    summary = {change: counts.get(change, 0) for change in DIFF_CHANGES}
+
+    # NOTE: Files found in both snapshots that were not reported
+    summary["unchanged"] = (
+        new.join(old.select("file"), on="file", how="semi").height
+        - summary["modified"]
+        - summary["stats_changed"]
+    )
+
+    for prefix, df in (("old_", old), ("", new)):
+        summary[f"{prefix}num_files"] = df.height
+        summary[f"{prefix}total_duration"] = (
+            df.get_column("duration_seconds").fill_null(0.0).sum()
+            if "duration_seconds" in df.columns else 0.0
+        )
+        summary[f"{prefix}total_size_bytes"] = (
+            df.get_column("size_bytes").fill_null(0).sum()
+        )
+
+    return summary
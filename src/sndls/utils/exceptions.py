@@ -9,3 +9,31 @@ class FolderNotFoundError(Exception):
 
 class ShapeError(Exception):
     pass
+
+
+class InvalidAudioFileError(Exception):
+    pass
+
+
+class FilterExpressionError(Exception):
+    pass
+
+
+class PreloadError(Exception):
+    pass
+
+
+class ResultsError(Exception):
+    pass
+
+
+class WorkerError(Exception):
+    pass
+
+
+class WorkerTimeoutError(WorkerError):
+    pass
+
+
+class WorkerCrashedError(WorkerError):
+    pass
@@ -1,14 +1,44 @@
+from __future__ import annotations
+import re
 import sys
-from tqdm import tqdm
-from typing import Optional
+import json
+import math
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Tuple
+)
 from .config import (
     _get_text_color_tags,
-    _get_text_decorator_tags
+    _get_text_decorator_tags,
+    is_color_enabled
 )
 
+if TYPE_CHECKING:
+    from tqdm import tqdm
+
+_TAGS = None
+
+
+def _get_tags() -> Tuple[dict, re.Pattern]:
+    """Returns all color and decorator tags together with a compiled regular
+    expression matching any of them.
+
+    Returns:
+        Tuple[dict, re.Pattern]: Tags and compiled regular expression.
+    """
+    global _TAGS
+
+    if _TAGS is None:
+        tags = {**_get_text_decorator_tags(), **_get_text_color_tags()}
+        _TAGS = tags, re.compile("|".join(re.escape(tag) for tag in tags))
+
+    return _TAGS
+
 
 def _decorate_str(s: str) -> str:
-    """Replaces colors and decorators in a string.
+    """Replaces colors and decorators in a string. If colors are disabled
+    (e.g. because the output is not a terminal), tags are removed instead.
 
     Args:
         s (str): The input string to be decorated.
@@ -16,14 +46,17 @@ def _decorate_str(s: str) -> str:
     Returns:
         str: The decorated string.
     """
-    # Replace colors and decorators
-    for k, v in _get_text_decorator_tags().items():
-        s = s.replace(k, v)
+    # NOTE: Most strings have no tags at all
+    if "<" not in s:
+        return s
 
-    for k, v in _get_text_color_tags().items():
-        s = s.replace(k, v)
+    tags, tags_regex = _get_tags()
 
-    return s
+    if not is_color_enabled():
+        return tags_regex.sub("", s)
+
+    # Replace colors and decorators in a single pass
+    return tags_regex.sub(lambda m: tags[m.group(0)], s)
 
 
 def printc(s: str, writer: Optional[tqdm] = None) -> None:
@@ -100,6 +133,42 @@ def exit_warning(s: str, code: int = 1, writer: Optional[tqdm] = None) -> None:
     sys.exit(code)
 
 
+def _to_json_value(value):
+    """Converts a value to a JSON-compliant value. Non-finite `float` values
+    (`NaN`, `inf` and `-inf`) are replaced by `None`.
+
+    Args:
+        value (Any): Value to convert.
+
+    Returns:
+        Any: JSON-compliant value.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+
+    elif isinstance(value, (list, tuple)):
+        return [_to_json_value(v) for v in value]
+
+    return value
+
+
+def dict_to_json(data: dict) -> str:
+    """Returns a single-line JSON representation of a `dict` of audio file
+    specifications.
+
+    Args:
+        data (dict): Audio file specifications.
+
+    Returns:
+        str: JSON representation of `data`.
+    """
+    return json.dumps(
+        {k: _to_json_value(v) for k, v in data.items()},
+        ensure_ascii=False,
+        allow_nan=False
+    )
+
+
 def bytes_to_str(bytes: int) -> str:
     """Returns an amount of bytes in a human readable format.
     
@@ -127,6 +196,28 @@ def bytes_to_str(bytes: int) -> str:
     return repr
 
 
+def str_to_bytes(s: str) -> int:
+    """Parses an amount of bytes, optionally followed by a `K`, `M`, `G` or
+    `T` suffix (powers of 1024, as shown by `bytes_to_str`).
+    
+    Args:
+        s (str): Amount of bytes (e.g. `512M` or `4G`).
+
+    Returns:
+        int: Number of bytes.
+
+    Raises:
+        ValueError: If `s` is not a valid amount of bytes.
+    """
+    s = s.strip().upper().removesuffix("B")
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+    if len(s) > 0 and s[-1] in units:
+        return int(float(s[:-1]) * units[s[-1]])
+
+    return int(s)
+
+
 def time_to_str(time: float, abbrev: bool = False) -> str:
     """Returns a time in seconds in a human readable format.
     
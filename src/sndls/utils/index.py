@@ -0,0 +1,328 @@
+from __future__ import annotations
+import os
+import json
+import numpy as np
+from fnmatch import fnmatchcase
+from time import time_ns
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+from .collections import make_list
+from .exceptions import FolderNotFoundError
+from .store import ResultStore
+
+if TYPE_CHECKING:
+    import polars as pl
+
+_INDEX_VERSION = 1
+
+# NOTE: Folders modified this recently are listed again on the next scan,
+# since a change within the mtime resolution of the filesystem could go
+# unnoticed otherwise
+_RACY_MTIME_NS = 2_000_000_000
+
+
+class DirScan(NamedTuple):
+    """Files found by `DirIndex.scan`.
+
+    Attributes:
+        files (List[str]): All audio files, sorted alphabetically.
+        dirs (List[str]): Normalized folder of each file.
+        cached_idxs (np.ndarray): Index in `cached` of each file, or -1 if
+            the file is in a folder that changed and has to be analyzed.
+        cached (ResultStore): Results of the files in unchanged folders.
+        num_cached_skipped (int): Number of files in unchanged folders that
+            were skipped in the last run (e.g. due to --max-duration).
+        num_dirs (int): Number of scanned folders.
+        num_changed_dirs (int): Number of folders that had to be listed.
+    """
+    files: List[str]
+    dirs: List[str]
+    cached_idxs: np.ndarray
+    cached: ResultStore
+    num_cached_skipped: int
+    num_dirs: int
+    num_changed_dirs: int
+
+
+class DirIndex:
+    """Sidecar index of the folders scanned in a previous run and the results
+    of their files.
+
+    The index keeps the modification time (mtime) and subfolders of each
+    scanned folder, together with the (unfiltered) results of the audio
+    files inside it. On a rescan, folders whose mtime did not change are not
+    listed again, and their files are neither checked nor analyzed: their
+    results are taken from the index instead. Only subfolders are checked,
+    since changes in a subfolder do not update the mtime of its parents.
+
+    !!! warning
+        The mtime of a folder changes when files are added, removed or
+        renamed, but not when an existing file is rewritten in place. Delete
+        the index to analyze such files again.
+
+    The index is stored in a folder containing `index.json` (format version
+    and analysis options), `dirs.parquet` and `results.parquet`. Indices
+    created with different options are ignored.
+
+    Args:
+        dir (str): Index folder.
+        fingerprint (str): Analysis options the results depend on. Indices
+            with a different fingerprint are ignored.
+    """
+    def __init__(self, dir: str, fingerprint: str) -> None:
+        self.dir = dir
+        self.fingerprint = fingerprint
+        self.is_loaded = False
+        self._dirs: Dict[str, Tuple[int, List[str], int]] = {}
+        self._results: Optional[pl.DataFrame] = None
+        self._scan_dirs: Dict[str, Tuple[int, List[str]]] = {}
+        self._num_skipped: Dict[str, int] = {}
+        self._cached: Optional[pl.DataFrame] = None
+        self._load()
+
+    def _load(self) -> None:
+        """Loads the index, if it exists and was created with the same
+        fingerprint."""
+        meta_file = os.path.join(self.dir, "index.json")
+
+        if not os.path.isfile(meta_file):
+            return
+
+        with open(meta_file, "r") as f:
+            meta = json.load(f)
+
+        if (
+            meta.get("version") != _INDEX_VERSION
+            or meta.get("fingerprint") != self.fingerprint
+        ):
+            return
+
+        import polars as pl
+
+        dirs = pl.read_parquet(os.path.join(self.dir, "dirs.parquet"))
+
+        for dir, mtime_ns, subdirs, num_skipped in dirs.iter_rows():
+            self._dirs[dir] = (mtime_ns, subdirs, num_skipped)
+
+        self._results = pl.read_parquet(
+            os.path.join(self.dir, "results.parquet")
+        )
+        self.is_loaded = True
+
+    def scan(
+            self,
+            dir: str,
+            ext: List[str],
+            recursive: bool = True
+    ) -> DirScan:
+        """Finds the audio files inside a folder, listing only the folders
+        that changed since the index was written.
+
+        Files are found as `sndls.utils.io.get_dir_files` does: hidden files
+        and folders are ignored, and symbolic links are followed.
+
+        Args:
+            dir (str): Folder to scan.
+            ext (List[str]): File extensions to be considered. Accepts `.*`
+                as a wild card.
+            recursive (bool): If `True`, subfolders are also scanned.
+
+        Returns:
+            DirScan: Files found and results of files in unchanged folders.
+
+        Raises:
+            FolderNotFoundError: If `dir` cannot be found.
+        """
+        import polars as pl
+
+        if not os.path.isdir(dir):
+            raise FolderNotFoundError(f"Folder not found: '{dir}'")
+
+        patterns = [f"*{e}" for e in make_list(ext)]
+        scan_time_ns = time_ns()
+        unchanged_dirs = []
+        new_files = []
+        num_cached_skipped = 0
+        stack = [dir]
+
+        self._scan_dirs = {}
+        self._num_skipped = {}
+
+        while len(stack) > 0:
+            path = stack.pop()
+            key = os.path.normpath(path)
+
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+
+            except OSError:
+                continue
+
+            cached = self._dirs.get(key)
+
+            if cached is not None and cached[0] == mtime_ns:
+                subdirs = cached[1]
+                unchanged_dirs.append(key)
+                num_cached_skipped += cached[2]
+                self._num_skipped[key] = cached[2]
+
+            else:
+                subdirs = []
+
+                try:
+                    with os.scandir(path) as it:
+                        for entry in it:
+                            if entry.name.startswith("."):
+                                continue
+
+                            if entry.is_dir():
+                                subdirs.append(entry.name)
+
+                            elif entry.is_file() and any(
+                                fnmatchcase(entry.name, p) for p in patterns
+                            ):
+                                new_files.append((entry.path, key))
+
+                except OSError:
+                    continue
+
+                self._num_skipped[key] = 0
+
+            # NOTE: -1 forces the folder to be listed again on the next scan
+            self._scan_dirs[key] = (
+                mtime_ns if scan_time_ns - mtime_ns > _RACY_MTIME_NS else -1,
+                subdirs
+            )
+
+            if recursive:
+                stack.extend(os.path.join(path, s) for s in subdirs)
+
+        # Results of the files in unchanged folders
+        if self._results is not None and len(unchanged_dirs) > 0:
+            cached_df = self._results.filter(
+                pl.col("dir").is_in(unchanged_dirs)
+            ).sort("file")
+
+        else:
+            cached_df = pl.DataFrame(
+                {"file": [], "dir": []},
+                schema={"file": pl.String, "dir": pl.String}
+            )
+
+        self._cached = cached_df
+
+        # NOTE: Both lists are sorted, so they are merged in a single pass
+        new_files.sort()
+        cached_files = cached_df.get_column("file").to_list()
+        cached_dirs = cached_df.get_column("dir").to_list()
+        files, dirs = [], []
+        cached_idxs = np.full(
+            len(new_files) + len(cached_files),
+            -1,
+            dtype=np.int64
+        )
+        i, j = 0, 0
+
+        while i < len(new_files) or j < len(cached_files):
+            if j == len(cached_files) or (
+                i < len(new_files) and new_files[i][0] < cached_files[j]
+            ):
+                files.append(new_files[i][0])
+                dirs.append(new_files[i][1])
+                i += 1
+
+            else:
+                cached_idxs[len(files)] = j
+                files.append(cached_files[j])
+                dirs.append(cached_dirs[j])
+                j += 1
+
+        return DirScan(
+            files=files,
+            dirs=dirs,
+            cached_idxs=cached_idxs,
+            cached=ResultStore.from_polars(cached_df.drop("dir")),
+            num_cached_skipped=num_cached_skipped,
+            num_dirs=len(self._scan_dirs),
+            num_changed_dirs=len(self._scan_dirs) - len(unchanged_dirs)
+        )
+
+    def add_skipped(self, dir: str) -> None:
+        """Counts a file of a changed folder that was skipped, so that it is
+        counted again when the folder is reused.
+
+        Args:
+            dir (str): Normalized folder of the file (see `DirScan.dirs`).
+        """
+        self._num_skipped[dir] = self._num_skipped.get(dir, 0) + 1
+
+    def write(
+            self,
+            new_results: ResultStore,
+            new_dirs: List[str]
+    ) -> None:
+        """Writes the index of the last scan.
+
+        Args:
+            new_results (ResultStore): Unfiltered results of the files
+                analyzed in the last scan.
+            new_dirs (List[str]): Normalized folder of each file in
+                `new_results`.
+        """
+        import polars as pl
+
+        os.makedirs(self.dir, exist_ok=True)
+
+        dirs = pl.DataFrame(
+            {
+                "dir": list(self._scan_dirs),
+                "mtime_ns": [m for m, _ in self._scan_dirs.values()],
+                "subdirs": [s for _, s in self._scan_dirs.values()],
+                "num_skipped": [
+                    self._num_skipped[d] for d in self._scan_dirs
+                ]
+            },
+            schema={
+                "dir": pl.String,
+                "mtime_ns": pl.Int64,
+                "subdirs": pl.List(pl.String),
+                "num_skipped": pl.Int64
+            }
+        )
+        results = pl.concat(
+            [
+                self._cached,
+                new_results.to_polars().with_columns(
+                    pl.Series("dir", new_dirs, dtype=pl.String)
+                )
+            ],
+            how="diagonal_relaxed"
+        )
+
+        # NOTE: index.json is removed first and written last, so that an
+        # interrupted write leaves no index instead of an inconsistent one
+        meta_file = os.path.join(self.dir, "index.json")
+
+        if os.path.isfile(meta_file):
+            os.remove(meta_file)
+
+        for name, df in (("dirs", dirs), ("results", results)):
+            tmp_file = os.path.join(self.dir, f".{name}.parquet.tmp")
+            df.write_parquet(tmp_file)
+            os.replace(tmp_file, os.path.join(self.dir, f"{name}.parquet"))
+
+        tmp_file = os.path.join(self.dir, ".index.json.tmp")
+
+        with open(tmp_file, "w") as f:
+            json.dump(
+                {"version": _INDEX_VERSION, "fingerprint": self.fingerprint},
+                f
+            )
+
+        os.replace(tmp_file, meta_file)
@@ -1,8 +1,12 @@
 import os
+import errno
+import shutil
+import struct
 import numpy as np
 import soundfile as sf
 from glob import glob
 from typing import (
+    BinaryIO,
     Callable,
     List,
     Optional,
@@ -19,6 +23,42 @@ from .fmt import (
     print_error
 )
 
+# Integer data type used to read each PCM subtype without converting it to
+# floating point. NOTE: soundfile scales 8-bit and 24-bit data to the full
+# range of the returned data type
+_NATIVE_DTYPES = {
+    "PCM_S8": "int16",
+    "PCM_U8": "int16",
+    "PCM_16": "int16",
+    "PCM_24": "int32",
+    "PCM_32": "int32",
+    "ULAW": "int16",
+    "ALAW": "int16"
+}
+
+# Data type of the samples of uncompressed WAV files by format tag and number
+# of bits (1 = PCM, 3 = IEEE float) that can be memory-mapped
+_WAV_DTYPES = {
+    (1, 16): "<i2",
+    (1, 32): "<i4",
+    (3, 32): "<f4",
+    (3, 64): "<f8"
+}
+
+# Data type of the samples of uncompressed AIFF and AIFF-C files by
+# compression type and number of bits that can be memory-mapped
+_AIFF_DTYPES = {
+    (b"NONE", 8): ">i1",
+    (b"NONE", 16): ">i2",
+    (b"NONE", 32): ">i4",
+    (b"twos", 16): ">i2",
+    (b"sowt", 16): "<i2",
+    (b"fl32", 32): ">f4",
+    (b"FL32", 32): ">f4",
+    (b"fl64", 64): ">f8",
+    (b"FL64", 64): ">f8"
+}
+
 
 def get_dir_files(
         dir: Union[str, List[str]],
@@ -82,6 +122,97 @@ def get_dir_files(
     return sorted(all_files, key=key)
 
 
+def _get_physical_offset(file: str) -> Optional[int]:
+    """Returns the physical offset on disk of the first extent of a file using
+    the `FS_IOC_FIEMAP` ioctl (Linux only).
+
+    Args:
+        file (str): Input file.
+
+    Returns:
+        Optional[int]: Physical offset in bytes, or `None` if it is not
+            available (e.g. unsupported platform or filesystem, or empty
+            file).
+    """
+    try:
+        import fcntl
+
+    except ImportError:
+        return None
+
+    # NOTE: FS_IOC_FIEMAP = _IOWR('f', 11, struct fiemap). struct fiemap is
+    # 32 bytes long and is followed by fm_extent_count extents of 56 bytes
+    fs_ioc_fiemap = 0xC020660B
+    request = bytearray(struct.pack("=QQIIII", 0, 2 ** 64 - 1, 0, 0, 1, 0))
+    request += bytes(56)
+
+    try:
+        with open(file, "rb") as f:
+            fcntl.ioctl(f.fileno(), fs_ioc_fiemap, request)
+
+    except OSError:
+        return None
+
+    num_extents = struct.unpack_from("=I", request, 20)[0]
+
+    if num_extents == 0:
+        return None
+
+    return struct.unpack_from("=Q", request, 40)[0]
+
+
+def get_read_order(files: List[str], order: str = "path") -> List[int]:
+    """Returns the order in which files should be read to maximize sequential
+    disk access.
+
+    Args:
+        files (List[str]): Input files.
+        order (str): One of:
+            - `path`: Input order.
+            - `inode`: Ascending device and inode number, which usually
+                follows allocation order on disk.
+            - `physical`: Ascending physical offset on disk of the first
+                extent of each file. Files without extent information are
+                read afterwards in inode order.
+            - `size`: Ascending file size.
+
+    Returns:
+        List[int]: Indices of `files` in reading order. Files that cannot be
+            accessed are read last, in input order.
+    """
+    if order == "path":
+        return list(range(len(files)))
+
+    elif order not in ("inode", "physical", "size"):
+        raise ValueError(f"Invalid read order {order=}")
+
+    keys = []
+
+    for file in files:
+        try:
+            st = os.stat(file)
+
+        except OSError:
+            keys.append((1,))
+            continue
+
+        if order == "size":
+            keys.append((0, st.st_size))
+
+        elif order == "physical":
+            offset = _get_physical_offset(file)
+            keys.append(
+                (0, st.st_dev, 0, offset) if offset is not None
+                else (0, st.st_dev, 1, st.st_ino)
+            )
+
+        else:
+            keys.append((0, st.st_dev, st.st_ino))
+
+    # NOTE: sorted is stable, so ties keep the input order
+    return sorted(range(len(files)), key=keys.__getitem__)
+
+
 def read_audio_metadata(file: str) -> dict:
     """Reads the metadata block from an audio files and returns it as a
     `dict`.
@@ -104,6 +235,24 @@ def read_audio_metadata(file: str) -> dict:
     }
 
 
+def get_native_dtype(
+        subtype: Optional[str],
+        fallback: str = get_default_audio_io_dtype()
+) -> str:
+    """Returns the data type used to read an audio file of a given subtype
+    in its native integer PCM format.
+
+    Args:
+        subtype (Optional[str]): Audio file subtype (e.g. `PCM_16`).
+        fallback (str): Data type returned for subtypes that are not integer
+            PCM (e.g. `FLOAT` or `VORBIS`).
+
+    Returns:
+        str: Data type to be passed to `read_audio`.
+    """
+    return _NATIVE_DTYPES.get(subtype, fallback)
+
+
 def read_audio(
         file: str,
         start: int = 0,
@@ -141,6 +290,294 @@ def read_audio(
     return data.transpose(), fs_
 
 
+def read_audio_windows(
+        file: str,
+        windows: List[Tuple[int, int]],
+        dtype: str = get_default_audio_io_dtype(),
+) -> Tuple[List[np.ndarray], int]:
+    """Reads several chunks of an audio file, opening it only once.
+
+    Args:
+        file (str): Audio file.
+        windows (List[Tuple[int, int]]): Start and stop frame of each chunk.
+        dtype (str): Data type used to represent the data.
+
+    Returns:
+        (Tuple[List[np.ndarray], int]): `np.ndarray` representing the audio
+            data of each chunk and sample rate `tuple`.
+    """
+    is_file_or_error(file)
+    chunks = []
+
+    with sf.SoundFile(file, "r") as f:
+        for start, stop in windows:
+            f.seek(start)
+            data = f.read(frames=stop - start, dtype=dtype, always_2d=True)
+            chunks.append(data.transpose())
+
+        fs_ = f.samplerate
+
+    return chunks, fs_
+
+
+def _get_wav_layout(f: BinaryIO) -> Optional[Tuple[int, int, str, int, int]]:
+    """Locates the sample data of a RIFF WAV file.
+
+    Args:
+        f (BinaryIO): File opened in binary mode, positioned after the
+            `RIFF`/`WAVE` header.
+
+    Returns:
+        Optional[Tuple[int, int, str, int, int]]: Data offset in bytes,
+            data size in bytes, `numpy` data type, number of channels and
+            sample rate, or `None` if the sample format cannot be
+            memory-mapped.
+    """
+    fmt = None
+
+    while True:
+        header = f.read(8)
+
+        if len(header) < 8:
+            return None
+
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+
+        if chunk_id == b"fmt ":
+            fmt = f.read(chunk_size)
+
+            if len(fmt) < 16:
+                return None
+
+            f.seek(chunk_size % 2, os.SEEK_CUR)
+
+        elif chunk_id == b"data":
+            break
+
+        else:
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+    if fmt is None:
+        return None
+
+    format_tag, num_channels, fs, _, block_align, num_bits = struct.unpack(
+        "<HHIIHH",
+        fmt[:16]
+    )
+
+    # NOTE: WAVE_FORMAT_EXTENSIBLE stores the actual format in its subformat
+    if format_tag == 0xFFFE and len(fmt) >= 26:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+
+    dtype = _WAV_DTYPES.get((format_tag, num_bits))
+
+    if dtype is None or block_align != num_channels * num_bits // 8:
+        return None
+
+    return f.tell(), chunk_size, dtype, num_channels, fs
+
+
+def _get_aiff_layout(
+        f: BinaryIO,
+        is_aifc: bool
+) -> Optional[Tuple[int, int, str, int, int]]:
+    """Locates the sample data of an AIFF or AIFF-C file.
+
+    Args:
+        f (BinaryIO): File opened in binary mode, positioned after the
+            `FORM`/`AIFF` header.
+        is_aifc (bool): If `True`, the file is an AIFF-C file.
+
+    Returns:
+        Optional[Tuple[int, int, str, int, int]]: Data offset in bytes,
+            data size in bytes, `numpy` data type, number of channels and
+            sample rate, or `None` if the sample format cannot be
+            memory-mapped.
+    """
+    comm = None
+    data = None
+
+    while comm is None or data is None:
+        header = f.read(8)
+
+        if len(header) < 8:
+            return None
+
+        chunk_id, chunk_size = struct.unpack(">4sI", header)
+
+        if chunk_id == b"COMM":
+            comm = f.read(chunk_size)
+            f.seek(chunk_size % 2, os.SEEK_CUR)
+
+        elif chunk_id == b"SSND":
+            data_offset, _ = struct.unpack(">II", f.read(8))
+            data = (f.tell() + data_offset, chunk_size - 8 - data_offset)
+            f.seek(chunk_size - 8 + chunk_size % 2, os.SEEK_CUR)
+
+        else:
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+    if len(comm) < 18:
+        return None
+
+    num_channels, _, num_bits = struct.unpack(">hIh", comm[:8])
+    compression = comm[18:22] if is_aifc else b"NONE"
+    dtype = _AIFF_DTYPES.get((compression, num_bits))
+
+    if dtype is None:
+        return None
+
+    # Sample rate as an 80-bit IEEE 754 extended precision number
+    exponent, mantissa = struct.unpack(">HQ", comm[8:18])
+    fs = round(mantissa * 2.0 ** ((exponent & 0x7FFF) - 16383 - 63))
+
+    return data[0], data[1], dtype, num_channels, fs
+
+
+def read_audio_mmap(file: str) -> Optional[Tuple[np.ndarray, int]]:
+    """Memory-maps the samples of an uncompressed WAV or AIFF file instead of
+    decoding them. No audio data is read until it is accessed, and the
+    operating system can page it in and out as needed.
+
+    Integer PCM samples are returned in their native integer data type (see
+    `sndls.utils.audio.get_full_scale`). Other sample formats, such as
+    24-bit or 8-bit unsigned PCM, are not supported. Callers that need a
+    different data type (e.g. `float64`) must convert the samples they use.
+
+    Args:
+        file (str): Audio file.
+
+    Returns:
+        Optional[Tuple[np.ndarray, int]]: Read-only (num_channels,
+            num_samples) view of the samples and sample rate, or `None` if
+            the file cannot be memory-mapped.
+    """
+    is_file_or_error(file)
+
+    with open(file, "rb") as f:
+        header = f.read(12)
+
+        if len(header) < 12:
+            return None
+
+        if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+            layout = _get_wav_layout(f)
+
+        elif header[:4] == b"FORM" and header[8:12] in (b"AIFF", b"AIFC"):
+            layout = _get_aiff_layout(f, is_aifc=header[8:12] == b"AIFC")
+
+        else:
+            return None
+
+    if layout is None:
+        return None
+
+    offset, size, dtype, num_channels, fs = layout
+    frame_size = num_channels * np.dtype(dtype).itemsize
+
+    # NOTE: The data size may be wrong in files that were not closed properly
+    size = min(size, os.path.getsize(file) - offset)
+    num_frames = size // frame_size
+
+    if num_frames == 0:
+        return np.zeros((num_channels, 0), dtype=dtype), fs
+
+    data = np.memmap(
+        file,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=(num_frames, num_channels)
+    )
+
+    return data.transpose(), fs
+
+
+def _reflink_file(src: str, dst: str) -> None:
+    """Creates a copy-on-write clone of `src` at `dst` using the `FICLONE`
+    ioctl (Linux only, supported by filesystems such as Btrfs and XFS).
+
+    Args:
+        src (str): Source file.
+        dst (str): Destination file.
+
+    Raises:
+        OSError: If the platform or filesystem does not support reflinks.
+    """
+    try:
+        import fcntl
+
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported")
+
+    # NOTE: FICLONE = _IOW(0x94, 9, int)
+    ficlone = 0x40049409
+
+    # NOTE: `dst` is opened outside of the `try` block, so that an existing
+    # file (`FileExistsError`) is never removed below
+    with open(src, "rb") as src_f, open(dst, "xb") as dst_f:
+        try:
+            fcntl.ioctl(dst_f.fileno(), ficlone, src_f.fileno())
+
+        except OSError:
+            # Remove the empty destination file created above before
+            # re-raising
+            dst_f.close()
+            os.remove(dst)
+            raise
+
+
+def copy_file(src: str, dst: str, mode: str = "copy") -> str:
+    """Copies `src` to `dst` either as a regular copy or as a hard link,
+    symbolic link or reflink. Hard links and reflinks fall back to a regular
+    copy if `src` and `dst` are in different devices or if the filesystem
+    does not support them.
+
+    Args:
+        src (str): Source file.
+        dst (str): Destination file.
+        mode (str): Copy mode. One of `copy`, `hardlink`, `symlink` or
+            `reflink`.
+
+    Returns:
+        str: Copy mode that was effectively used.
+    """
+    if mode == "copy":
+        shutil.copy(src, dst)
+
+    elif mode == "symlink":
+        os.symlink(os.path.abspath(src), dst)
+
+    elif mode in ("hardlink", "reflink"):
+        try:
+            if mode == "hardlink":
+                os.link(src, dst)
+
+            else:
+                _reflink_file(src, dst)
+
+        except OSError as e:
+            # NOTE: Links cannot cross devices or be created on some
+            # filesystems, so a regular copy is done instead
+            if e.errno not in (
+                errno.EXDEV,
+                errno.EPERM,
+                errno.EMLINK,
+                errno.EINVAL,
+                errno.ENOTTY,
+                errno.EOPNOTSUPP
+            ):
+                raise
+
+            shutil.copy(src, dst)
+            mode = "copy"
+
+    else:
+        raise ValueError(f"Invalid copy mode {mode=}")
+
+    return mode
+
+
 def ask_confirmation(
             s: str = "<magenta><b>Do you want to continue? [y/n]:</b>"
                      "</magenta> ",
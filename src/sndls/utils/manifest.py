@@ -0,0 +1,211 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from itertools import (
+    chain,
+    repeat
+)
+from typing import (
+    TYPE_CHECKING,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+from .guards import (
+    has_ext,
+    is_file_with_ext
+)
+
+if TYPE_CHECKING:
+    import polars as pl
+
+_MANIFEST_EXTENSIONS = (".csv", ".parquet")
+
+
+def is_manifest(file: str) -> bool:
+    """Returns `True` if `file` is a .csv or .parquet file that can be used
+    as a manifest listing audio files.
+
+    Args:
+        file (str): File to check.
+
+    Returns:
+        bool: `True` if `file` is a manifest, `False` otherwise.
+    """
+    return is_file_with_ext(file, ext=list(_MANIFEST_EXTENSIONS))
+
+
+def _check_rows(
+        files: List[Optional[str]],
+        ext: Union[str, List[str]]
+) -> List[bool]:
+    """Checks that manifest rows contain existing audio files.
+
+    Args:
+        files (List[Optional[str]]): Values of the file column (`None` for
+            empty cells).
+        ext (Union[str, List[str]]): Valid audio file extension(s).
+
+    Returns:
+        List[bool]: `True` for each valid row, `False` otherwise.
+    """
+    return [isinstance(f, str) and is_file_with_ext(f, ext) for f in files]
+
+
+class ManifestReader:
+    """Lazily reads the audio files listed in a column of a .csv or .parquet
+    manifest.
+
+    The manifest is scanned with `polars` and only the file column is read,
+    in batches of `batch_size` rows, so that manifests with millions of rows
+    do not have to be loaded at once. Rows are checked in a thread pool
+    while files are being consumed: the checks of the next batch are
+    submitted before the files of the current one are yielded, which hides
+    the latency of `stat` calls on network storage.
+
+    Rows that are empty, do not exist or do not have a valid extension are
+    skipped and collected in `invalid_rows` instead of stopping the
+    iteration.
+
+    Args:
+        file (str): .csv or .parquet manifest.
+        col (str): Name of the column listing audio files.
+        ext (Union[str, List[str]]): Valid audio file extension(s).
+        ignore_errors (bool): If `True`, rows with errors are skipped when
+            reading .csv manifests.
+        batch_size (int): Number of rows read and checked at once.
+        num_workers (int): Number of threads used to check rows.
+        chunk_size (int): Number of rows checked by each thread task.
+
+    Raises:
+        ValueError: If the manifest does not have a `col` column.
+    """
+    def __init__(
+            self,
+            file: str,
+            col: str,
+            ext: Union[str, List[str]],
+            ignore_errors: bool = False,
+            batch_size: int = 8192,
+            num_workers: int = 16,
+            chunk_size: int = 256
+    ) -> None:
+        self.file = file
+        self.col = col
+        self.ext = ext
+        self.ignore_errors = ignore_errors
+        self.batch_size = max(1, batch_size)
+        self.num_workers = max(1, num_workers)
+        self.chunk_size = max(1, chunk_size)
+        self.invalid_rows: List[Tuple[int, Optional[str]]] = []
+
+        # NOTE: Row numbers of .csv manifests count the header row, so they
+        # match the line shown by text editors and spreadsheets
+        self._first_row = 1 if has_ext(file, ".parquet") else 2
+
+        if col not in self._scan().collect_schema().names():
+            raise ValueError(f"No '{col}' column found in '{file}'")
+
+    def _scan(self) -> pl.LazyFrame:
+        """Returns a lazy scan of the manifest.
+
+        Returns:
+            pl.LazyFrame: Lazy manifest.
+        """
+        import polars as pl
+
+        if has_ext(self.file, ".parquet"):
+            return pl.scan_parquet(self.file)
+
+        # NOTE: Files are always read as strings, so that numeric-looking
+        # names are not parsed and mangled
+        return pl.scan_csv(
+            self.file,
+            ignore_errors=self.ignore_errors,
+            schema_overrides={self.col: pl.String}
+        )
+
+    def _iter_batches(self) -> Iterator[List[Optional[str]]]:
+        """Yields the values of the file column in batches.
+
+        Yields:
+            List[Optional[str]]: Values of the next `batch_size` rows.
+        """
+        import polars as pl
+
+        lf = self._scan().select(pl.col(self.col).cast(pl.String))
+
+        # NOTE: Older polars versions cannot stream a lazy frame in batches,
+        # so the (single) column is collected and sliced instead
+        if hasattr(lf, "collect_batches"):
+            batches = lf.collect_batches(
+                chunk_size=self.batch_size,
+                maintain_order=True
+            )
+
+        else:
+            batches = lf.collect().iter_slices(self.batch_size)
+
+        for df in batches:
+            values = df.get_column(self.col).to_list()
+
+            # NOTE: Batches may be larger or smaller than requested
+            for start in range(0, len(values), self.batch_size):
+                yield values[start:start + self.batch_size]
+
+    def __iter__(self) -> Iterator[str]:
+        self.invalid_rows = []
+        row_idx = self._first_row
+
+        with ThreadPoolExecutor(self.num_workers) as pool:
+            pending = None
+
+            for files in self._iter_batches():
+                # NOTE: Rows are checked in chunks to keep the overhead of
+                # each thread task low. pool.map submits all chunks at once
+                # and returns them in order, so the next batch is checked
+                # while the current one is consumed
+                checks = pool.map(
+                    _check_rows,
+                    [
+                        files[start:start + self.chunk_size]
+                        for start in range(0, len(files), self.chunk_size)
+                    ],
+                    repeat(self.ext)
+                )
+
+                if pending is not None:
+                    yield from self._emit(*pending)
+
+                pending = (row_idx, files, checks)
+                row_idx += len(files)
+
+            if pending is not None:
+                yield from self._emit(*pending)
+
+    def _emit(
+            self,
+            row_idx: int,
+            files: List[Optional[str]],
+            checks: Iterator[List[bool]]
+    ) -> Iterator[str]:
+        """Yields the valid files of a batch and collects the invalid ones.
+
+        Args:
+            row_idx (int): Row number of the first file of the batch.
+            files (List[Optional[str]]): Files of the batch.
+            checks (Iterator[List[bool]]): Result of the check of each
+                file, in chunks.
+
+        Yields:
+            str: Valid files.
+        """
+        is_valid_rows = chain.from_iterable(checks)
+
+        for offset, (file, is_valid) in enumerate(zip(files, is_valid_rows)):
+            if is_valid:
+                yield file
+
+            else:
+                self.invalid_rows.append((row_idx + offset, file))
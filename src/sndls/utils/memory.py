@@ -0,0 +1,422 @@
+import sys
+import json
+import heapq
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
+
+try:
+    import resource
+
+except ImportError:  # pragma: no cover
+    # NOTE: The resource module is not available on Windows
+    resource = None
+
+_PROC_STATUS = "/proc/self/status"
+_PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _read_proc_status() -> Tuple[Optional[int], Optional[int]]:
+    """Reads the current and peak resident set size of the current process
+    from `/proc/self/status`.
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: Current and peak resident set
+            size in bytes, or `None` if not available.
+    """
+    rss = None
+    peak_rss = None
+
+    try:
+        with open(_PROC_STATUS, "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+
+                elif line.startswith("VmHWM:"):
+                    peak_rss = int(line.split()[1]) * 1024
+
+    except OSError:
+        pass
+
+    return rss, peak_rss
+
+
+def _get_max_rss() -> Optional[int]:
+    """Returns the peak resident set size of the current process as reported
+    by `getrusage`.
+
+    Returns:
+        Optional[int]: Peak resident set size in bytes, or `None` if not
+            available.
+    """
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # NOTE: ru_maxrss is given in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_rss() -> Tuple[Optional[int], Optional[int]]:
+    """Returns the current and peak resident set size of the current process.
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: Current and peak resident set
+            size in bytes. The current size is `None` if not available on
+            this platform.
+    """
+    rss, peak_rss = _read_proc_status()
+
+    if peak_rss is None:
+        peak_rss = _get_max_rss()
+
+    return rss, peak_rss
+
+
+def reset_peak_rss() -> bool:
+    """Resets the peak resident set size of the current process, so that the
+    peak of a concrete code block can be measured. Only supported on Linux.
+
+    Returns:
+        bool: `True` if the peak was reset, `False` otherwise.
+    """
+    try:
+        with open(_PROC_CLEAR_REFS, "w") as f:
+            f.write("5")
+
+    except OSError:
+        return False
+
+    return True
+
+
+class MemoryTracker:
+    """Tracks the peak memory used by each processing stage and by each
+    file.
+
+    The peak resident set size (RSS) is measured per stage on Linux by
+    resetting the kernel high water mark before each stage. On other
+    platforms only the process-wide peak is available, so per-stage peaks
+    are upper bounds. If `trace_allocations` is `True`, the peak of the
+    memory allocated through `tracemalloc` is also measured, which is
+    accurate on every platform but slows down allocations.
+
+    !!! note
+        Both the kernel high water mark and the `tracemalloc` peak are
+        process-wide, so stages and files can only be told apart if they run
+        one at a time. If `per_stage` is `False` (e.g. several files are
+        analyzed at once), peaks are never reset and only the process-wide
+        peaks are reported.
+
+    Args:
+        trace_allocations (bool): If `True`, allocation peaks are measured
+            using `tracemalloc`.
+        num_top_files (int): Number of files using the most memory to keep.
+        per_stage (bool): If `True`, the memory used by each stage and by
+            each file is tracked. Otherwise only the process-wide peaks are.
+    """
+    def __init__(
+            self,
+            trace_allocations: bool = False,
+            num_top_files: int = 10,
+            per_stage: bool = True
+    ) -> None:
+        self.per_stage = per_stage
+        self._trace_allocations = trace_allocations
+        self._num_top_files = num_top_files
+        self._can_reset_peak = per_stage and reset_peak_rss()
+        self._peak_rss = get_rss()[1] or 0
+        self._peak_alloc = 0
+        self._stages: Dict[str, dict] = {}
+        self._current_file: Optional[Tuple[str, dict]] = None
+        self._top_files: List[tuple] = []
+
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def start(self) -> Tuple[Optional[int], int]:
+        """Starts measuring a stage.
+
+        Returns:
+            Tuple[Optional[int], int]: Resident set size and traced memory in
+                bytes at the start of the stage.
+        """
+        if self._can_reset_peak:
+            reset_peak_rss()
+
+        traced = 0
+
+        if self._trace_allocations:
+            if self.per_stage:
+                tracemalloc.reset_peak()
+
+            traced = tracemalloc.get_traced_memory()[0]
+
+        return get_rss()[0], traced
+
+    def stop(
+            self,
+            name: str,
+            start: Tuple[Optional[int], int],
+            file: Optional[str] = None
+    ) -> None:
+        """Stops measuring a stage and records its memory usage.
+
+        Args:
+            name (str): Stage name.
+            start (Tuple[Optional[int], int]): Value returned by `start`.
+            file (Optional[str]): File processed by the stage, if any.
+        """
+        start_rss, start_traced = start
+        _, peak_rss = get_rss()
+        peak_rss = peak_rss or 0
+        self._peak_rss = max(self._peak_rss, peak_rss)
+
+        if self._trace_allocations:
+            self._peak_alloc = max(
+                self._peak_alloc,
+                tracemalloc.get_traced_memory()[1]
+            )
+
+        if not self.per_stage:
+            return
+
+        rss_increase = max(0, peak_rss - (start_rss or peak_rss))
+        alloc_peak = (
+            tracemalloc.get_traced_memory()[1] - start_traced
+            if self._trace_allocations else None
+        )
+
+        stats = self._stages.setdefault(
+            name,
+            {
+                "count": 0,
+                "peak_rss_bytes": 0,
+                "max_rss_increase_bytes": 0,
+                "max_alloc_peak_bytes": None
+            }
+        )
+        stats["count"] += 1
+        stats["peak_rss_bytes"] = max(stats["peak_rss_bytes"], peak_rss)
+        stats["max_rss_increase_bytes"] = max(
+            stats["max_rss_increase_bytes"],
+            rss_increase
+        )
+
+        if alloc_peak is not None:
+            stats["max_alloc_peak_bytes"] = max(
+                stats["max_alloc_peak_bytes"] or 0,
+                alloc_peak
+            )
+
+        if file is not None:
+            self._update_file(file, name, rss_increase, alloc_peak)
+
+    def _update_file(
+            self,
+            file: str,
+            name: str,
+            rss_increase: int,
+            alloc_peak: Optional[int]
+    ) -> None:
+        """Updates the memory usage of a file and keeps the files using the
+        most memory.
+
+        Args:
+            file (str): Processed file.
+            name (str): Stage name.
+            rss_increase (int): Increase of the resident set size in bytes.
+            alloc_peak (Optional[int]): Allocation peak in bytes.
+        """
+        # NOTE: Stages of a file run one after the other, so the usage of a
+        # file is final once a different file is seen
+        if self._current_file is None or self._current_file[0] != file:
+            self._flush_current_file()
+            self._current_file = (
+                file,
+                {
+                    "stage": name,
+                    "rss_increase_bytes": 0,
+                    "alloc_peak_bytes": None
+                }
+            )
+
+        usage = self._current_file[1]
+        usage_key = (
+            "alloc_peak_bytes" if alloc_peak is not None
+            else "rss_increase_bytes"
+        )
+        value = alloc_peak if alloc_peak is not None else rss_increase
+
+        if value > (usage[usage_key] or 0):
+            usage["stage"] = name
+
+        usage["rss_increase_bytes"] = max(
+            usage["rss_increase_bytes"],
+            rss_increase
+        )
+
+        if alloc_peak is not None:
+            usage["alloc_peak_bytes"] = max(
+                usage["alloc_peak_bytes"] or 0,
+                alloc_peak
+            )
+
+    def _flush_current_file(self) -> None:
+        """Adds the file currently being processed to the files using the
+        most memory if it uses more than the current ones."""
+        if self._current_file is not None:
+            self._push_top_file(*self._current_file)
+            self._current_file = None
+
+    def _push_top_file(self, file: str, usage: dict) -> None:
+        """Adds a file to the files using the most memory if it uses more
+        than the current ones.
+
+        Args:
+            file (str): Processed file.
+            usage (dict): Memory usage of the file.
+        """
+        key = (
+            usage["alloc_peak_bytes"]
+            if usage["alloc_peak_bytes"] is not None
+            else usage["rss_increase_bytes"]
+        )
+        item = (key, file, usage)
+
+        if len(self._top_files) < self._num_top_files:
+            heapq.heappush(self._top_files, item)
+
+        elif key > self._top_files[0][0]:
+            heapq.heapreplace(self._top_files, item)
+
+    def get_peak_rss(self) -> int:
+        """Returns the peak resident set size observed so far.
+
+        Returns:
+            int: Peak resident set size in bytes.
+        """
+        return max(self._peak_rss, get_rss()[1] or 0)
+
+    def get_peak_alloc(self) -> Optional[int]:
+        """Returns the peak of the memory allocated through `tracemalloc`
+        observed so far.
+
+        Returns:
+            Optional[int]: Allocation peak in bytes, or `None` if allocations
+                are not traced.
+        """
+        if not self._trace_allocations:
+            return None
+
+        return max(self._peak_alloc, tracemalloc.get_traced_memory()[1])
+
+    def get_stats(self) -> List[Tuple[str, dict]]:
+        """Returns the memory usage of each stage in the order they were
+        first recorded.
+
+        Returns:
+            List[Tuple[str, dict]]: Stage name and its `count`,
+                `peak_rss_bytes`, `max_rss_increase_bytes` and
+                `max_alloc_peak_bytes` (`None` if allocations are not
+                traced). Empty if `per_stage` is `False`.
+        """
+        return list(self._stages.items())
+
+    def get_top_files(self) -> List[dict]:
+        """Returns the files using the most memory, sorted in descending
+        order.
+
+        Returns:
+            List[dict]: `file`, `stage` using the most memory,
+                `rss_increase_bytes` and `alloc_peak_bytes` of each file.
+                Empty if `per_stage` is `False`.
+        """
+        self._flush_current_file()
+
+        return [
+            {"file": file, **usage}
+            for _, file, usage in sorted(self._top_files, reverse=True)
+        ]
+
+    def write_json(self, file: str) -> None:
+        """Writes the memory usage report to a `.json` file.
+
+        Args:
+            file (str): Output `.json` file.
+        """
+        report = {
+            "peak_rss_bytes": self.get_peak_rss(),
+            "peak_alloc_bytes": self.get_peak_alloc(),
+            "per_stage": self.per_stage,
+            "per_stage_peak_rss": self._can_reset_peak,
+            "trace_allocations": self._trace_allocations,
+            "stages": dict(self.get_stats()),
+            "top_files": self.get_top_files()
+        }
+
+        with open(file, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+class MemoryBudget:
+    """Limits the memory used by tasks running concurrently (e.g. files
+    analyzed by different threads) to a budget.
+
+    Each task reserves its estimated memory usage before running and
+    releases it when it is done. Tasks wait until their reservation fits in
+    the budget, and are admitted in the same order they asked for it, so
+    that large reservations are not starved by smaller ones. Reservations
+    larger than the whole budget are reduced to it, that is, such tasks run
+    alone.
+
+    Args:
+        limit (int): Budget in bytes.
+    """
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._used = 0
+        self._next_ticket = 0
+        self._serving_ticket = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def reserve(self, nbytes: int) -> Iterator[None]:
+        """Reserves memory from the budget while the context is active,
+        waiting until there is enough memory available.
+
+        Args:
+            nbytes (int): Memory to reserve in bytes.
+        """
+        nbytes = max(0, min(nbytes, self.limit))
+
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+
+            while (
+                ticket != self._serving_ticket
+                or self._used + nbytes > self.limit
+            ):
+                self._cond.wait()
+
+            self._used += nbytes
+            self._serving_ticket += 1
+            self._cond.notify_all()
+
+        try:
+            yield
+
+        finally:
+            with self._cond:
+                self._used -= nbytes
+                self._cond.notify_all()
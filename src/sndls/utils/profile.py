@@ -0,0 +1,258 @@
+import os
+import json
+import math
+import threading
+from contextlib import (
+    contextmanager,
+    nullcontext
+)
+from time import perf_counter_ns
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
+from .memory import MemoryTracker
+
+# NOTE: A single (reusable) context is returned while profiling is disabled,
+# so instrumented code paths pay almost nothing
+_NULL_CONTEXT = nullcontext()
+_PROFILER = None
+
+# Stages whose memory usage is tracked. Other stages either contain these or
+# run on several threads at once, so their peaks cannot be told apart
+_MEMORY_STAGES = frozenset(
+    ("preload", "decode", "stats", "spectral_rolloff", "sha256")
+)
+
+
+class Profiler:
+    """Collects the wall time spent in each processing stage.
+
+    Stages are identified by name and may be entered from any thread. Timings
+    are aggregated per stage and, optionally, kept as individual events so
+    that they can be exported as a Chrome trace (see `write_chrome_trace`).
+
+    Args:
+        trace (bool): If `True`, every stage execution is kept as an event
+            for trace export. Otherwise only durations are kept.
+        memory (Optional[MemoryTracker]): If given, the memory used by the
+            decoding, statistics, spectral rolloff, hashing and preload
+            stages is tracked too.
+    """
+    def __init__(
+            self,
+            trace: bool = False,
+            memory: Optional[MemoryTracker] = None
+    ) -> None:
+        self._trace = trace
+        self._memory = memory
+        self._start_ns = perf_counter_ns()
+        self._durations: Dict[str, List[int]] = {}
+        self._events: List[tuple] = []
+
+    def record(
+            self,
+            name: str,
+            start_ns: int,
+            end_ns: int,
+            args: Optional[dict] = None
+    ) -> None:
+        """Records a stage execution.
+
+        Args:
+            name (str): Stage name.
+            start_ns (int): Start time in nanoseconds (`perf_counter_ns`).
+            end_ns (int): End time in nanoseconds (`perf_counter_ns`).
+            args (Optional[dict]): Extra information attached to the trace
+                event (e.g. the processed file).
+        """
+        # NOTE: list.append and dict.setdefault are atomic, so no lock is
+        # needed to record from several threads
+        self._durations.setdefault(name, []).append(end_ns - start_ns)
+
+        if self._trace:
+            self._events.append(
+                (name, start_ns, end_ns, threading.get_ident(), args)
+            )
+
+    @contextmanager
+    def stage(self, name: str, **args) -> Iterator[None]:
+        """Measures the wall time spent inside a `with` block.
+
+        Args:
+            name (str): Stage name.
+            **args: Extra information attached to the trace event.
+        """
+        memory = self._memory if name in _MEMORY_STAGES else None
+        memory_start = None if memory is None else memory.start()
+        start_ns = perf_counter_ns()
+
+        try:
+            yield
+
+        finally:
+            self.record(name, start_ns, perf_counter_ns(), args or None)
+
+            if memory is not None:
+                memory.stop(name, memory_start, file=args.get("file"))
+
+    def get_memory_tracker(self) -> Optional[MemoryTracker]:
+        """Returns the memory tracker of the profiler.
+
+        Returns:
+            Optional[MemoryTracker]: Memory tracker or `None` if memory usage
+                is not tracked.
+        """
+        return self._memory
+
+    def get_elapsed_time(self) -> float:
+        """Returns the wall time elapsed since the profiler was created.
+
+        Returns:
+            float: Elapsed time in seconds.
+        """
+        return (perf_counter_ns() - self._start_ns) * 1e-9
+
+    def get_stats(self) -> List[Tuple[str, dict]]:
+        """Returns the aggregated statistics of each stage in the order they
+        were first recorded.
+
+        Returns:
+            List[Tuple[str, dict]]: Stage name and its `count`, `total`,
+                `mean`, `p50`, `p90`, `p99` and `max` times in seconds.
+        """
+        stats = []
+
+        for name, durations in list(self._durations.items()):
+            durations = sorted(durations)
+            total = sum(durations)
+            stats.append(
+                (
+                    name,
+                    {
+                        "count": len(durations),
+                        "total": total * 1e-9,
+                        "mean": total / len(durations) * 1e-9,
+                        "p50": _percentile(durations, 50.0) * 1e-9,
+                        "p90": _percentile(durations, 90.0) * 1e-9,
+                        "p99": _percentile(durations, 99.0) * 1e-9,
+                        "max": durations[-1] * 1e-9
+                    }
+                )
+            )
+
+        return stats
+
+    def write_chrome_trace(self, file: str) -> None:
+        """Writes all recorded events in Chrome trace event format. The
+        resulting file can be opened with `chrome://tracing` or
+        https://ui.perfetto.dev.
+
+        Args:
+            file (str): Output `.json` file.
+        """
+        pid = os.getpid()
+        tids = {}
+        events = []
+
+        for name, start_ns, end_ns, ident, args in self._events:
+            event = {
+                "name": name,
+                "cat": "sndls",
+                "ph": "X",
+                "ts": (start_ns - self._start_ns) / 1e3,
+                "dur": (end_ns - start_ns) / 1e3,
+                "pid": pid,
+                "tid": tids.setdefault(ident, len(tids))
+            }
+
+            if args is not None:
+                event["args"] = args
+
+            events.append(event)
+
+        with open(file, "w") as f:
+            json.dump(
+                {"traceEvents": events, "displayTimeUnit": "ms"},
+                f,
+                ensure_ascii=False
+            )
+
+
+def _percentile(values: List[int], q: float) -> int:
+    """Returns the nearest-rank percentile of a sorted list.
+
+    Args:
+        values (List[int]): Sorted values.
+        q (float): Percentile between 0.0 and 100.0.
+
+    Returns:
+        int: Percentile value.
+    """
+    return values[max(0, math.ceil(q / 100.0 * len(values)) - 1)]
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Returns the active profiler.
+
+    Returns:
+        Optional[Profiler]: Active profiler or `None` if profiling is
+            disabled.
+    """
+    return _PROFILER
+
+
+def set_profiler(profiler: Optional[Profiler]) -> None:
+    """Sets the active profiler used by `profile_stage`.
+
+    Args:
+        profiler (Optional[Profiler]): Profiler to activate or `None` to
+            disable profiling.
+    """
+    global _PROFILER
+    _PROFILER = profiler
+
+
+def profile_stage(name: str, **args) -> ContextManager:
+    """Measures the wall time spent inside a `with` block using the active
+    profiler. Does nothing if profiling is disabled.
+
+    Args:
+        name (str): Stage name.
+        **args: Extra information attached to the trace event.
+
+    Returns:
+        ContextManager: Context manager measuring the block.
+    """
+    if _PROFILER is None:
+        return _NULL_CONTEXT
+
+    return _PROFILER.stage(name, **args)
+
+
+def profile_fn(name: str, fn: Callable) -> Callable:
+    """Wraps a function so that every call is measured as a stage by the
+    active profiler. Returns `fn` unchanged if profiling is disabled.
+
+    Args:
+        name (str): Stage name.
+        fn (Callable): Function to wrap.
+
+    Returns:
+        Callable: Wrapped function.
+    """
+    profiler = _PROFILER
+
+    if profiler is None:
+        return fn
+
+    def _fn(*args, **kwargs):
+        with profiler.stage(name):
+            return fn(*args, **kwargs)
+
+    return _fn
@@ -0,0 +1,183 @@
+import math
+import numpy as np
+from typing import (
+    Callable,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+from .audio import (
+    rolloff_bins,
+    spectral_rolloff,
+    stft_frames,
+    to_float
+)
+
+
+class SpectralRolloffBatch:
+    """Computes the spectral rolloff of many audio signals (e.g. the files of
+    a folder of short clips) with a few large FFT calls instead of one call
+    per signal.
+
+    The STFT frames of each signal added to the batch are copied into a
+    reusable buffer of `max_frames` frames. Once the buffer is full (or on
+    `flush`), all its frames are windowed in place and transformed at once
+    with `scipy.fft`, which splits them among `workers` threads, and the
+    rolloff of each signal is passed to its callback. Signals with more than
+    `max_frames` frames are not batched, but transformed right away in
+    blocks of `max_frames` frames (see `sndls.utils.audio.spectral_rolloff`).
+
+    !!! note
+        The FFT size is the same for all signals, so signals of any sample
+        rate are batched together: only the mapping from frequency bins to
+        hertz depends on it. The window is cached and the FFT plans are
+        cached by `scipy.fft` itself, so they are reused across batches.
+
+    Args:
+        fft_size (int): Size of the FFT.
+        hop_size (int): Hop size of the FFT.
+        window (str): Window type.
+        rolloff (float): Rolloff percent between 0.0 and 1.0.
+        workers (int): Number of threads used by the FFT.
+        max_frames (int): Number of frames transformed at once.
+    """
+    def __init__(
+            self,
+            fft_size: int,
+            hop_size: int,
+            window: str = "hann",
+            rolloff: float = 0.9,
+            workers: int = 1,
+            max_frames: int = 1024
+    ) -> None:
+        if rolloff < 0.0 or rolloff > 1.0:
+            raise ValueError("rolloff must be between 0.0 and 1.0")
+
+        self.fft_size = fft_size
+        self.hop_size = hop_size
+        self.window = window
+        self.rolloff = rolloff
+        self.workers = workers
+        self.max_frames = max(1, max_frames)
+        self._frames: Optional[np.ndarray] = None
+        self._num_frames = 0
+        self._pending: List[
+            Tuple[int, List[Tuple[int, ...]], int, Callable]
+        ] = []
+
+    def __len__(self) -> int:
+        """Returns the number of signals waiting for the next `flush`."""
+        return len(self._pending)
+
+    def add(
+            self,
+            audio: Union[np.ndarray, List[np.ndarray]],
+            fs: int,
+            callback: Callable[[np.ndarray], None]
+    ) -> None:
+        """Adds an audio signal to the batch. The batch is flushed first if
+        the frames of the signal do not fit in it.
+
+        Args:
+            audio (Union[np.ndarray, List[np.ndarray]]): Audio data in
+                (..., time) format, or a `list` of non-contiguous chunks of
+                it. Frames never span two chunks, and start `fft_size // 2`
+                samples before each chunk (see
+                `sndls.utils.audio.stft_frames`).
+            fs (int): Sample rate.
+            callback (Callable[[np.ndarray], None]): Function called with the
+                framewise rolloff of the signal, in the same format returned
+                by `sndls.utils.audio.spectral_rolloff`.
+        """
+        chunks = [
+            to_float(c)
+            for c in (audio if isinstance(audio, list) else [audio])
+        ]
+        chunk_frames = [
+            stft_frames(c, self.fft_size, self.hop_size) for c in chunks
+        ]
+        num_frames = sum(math.prod(f.shape[:-1]) for f in chunk_frames)
+        dtype = np.result_type(*chunks)
+
+        if num_frames > self.max_frames:
+            callback(
+                np.concatenate(
+                    [
+                        spectral_rolloff(
+                            c,
+                            fs,
+                            self.fft_size,
+                            self.hop_size,
+                            window=self.window,
+                            rolloff=self.rolloff,
+                            workers=self.workers,
+                            max_frames=self.max_frames
+                        )
+                        for c in chunks
+                    ],
+                    axis=-1
+                )
+            )
+            return
+
+        # NOTE: Frames of different data types are transformed separately,
+        # so that float64 signals are not computed in float32
+        if self._frames is not None and (
+            self._frames.dtype != dtype
+            or self._num_frames + num_frames > self.max_frames
+        ):
+            self.flush()
+
+        if self._frames is None or self._frames.dtype != dtype:
+            self._frames = np.empty((self.max_frames, self.fft_size), dtype)
+
+        start = self._num_frames
+
+        # NOTE: Frames are copied straight from the strided view of each
+        # channel into the buffer, without an intermediate copy
+        for frames in chunk_frames:
+            for idx in np.ndindex(frames.shape[:-2]):
+                stop = self._num_frames + frames.shape[-2]
+                self._frames[self._num_frames:stop] = frames[idx]
+                self._num_frames = stop
+
+        self._pending.append(
+            (start, [f.shape[:-1] for f in chunk_frames], fs, callback)
+        )
+
+    def flush(self) -> None:
+        """Transforms all frames in the batch and passes the rolloff of each
+        signal to its callback."""
+        if len(self._pending) == 0:
+            return
+
+        frames = self._frames[:self._num_frames]
+        bins = rolloff_bins(
+            frames,
+            window=self.window,
+            rolloff=self.rolloff,
+            workers=self.workers,
+            out=frames
+        )
+        pending = self._pending
+        self._pending = []
+        self._num_frames = 0
+
+        for start, shapes, fs, callback in pending:
+            freqs = np.fft.rfftfreq(self.fft_size, d=1 / fs)
+            _spectral_rolloff = []
+
+            for shape in shapes:
+                stop = start + math.prod(shape)
+                _spectral_rolloff.append(
+                    freqs[bins[start:stop].reshape(shape)]
+                )
+                start = stop
+
+            callback(
+                np.expand_dims(
+                    np.concatenate(_spectral_rolloff, axis=-1),
+                    axis=-2
+                )
+            )
@@ -0,0 +1,642 @@
+from __future__ import annotations
+import os
+import numpy as np
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Optional
+)
+
+from .exceptions import ResultsError
+from .guards import is_file_with_ext
+
+if TYPE_CHECKING:
+    import polars as pl
+
+# Data type of each scalar field. Missing values are stored as 0 (or NaN for
+# floats) and their validity is kept separately
+_SCALAR_DTYPES = {
+    "size_bytes": np.int64,
+    "fs": np.int32,
+    "num_channels": np.int32,
+    "num_samples_per_channel": np.int64,
+    "duration_seconds": np.float64,
+    "probe_duration_seconds": np.float64,
+    "is_clipped": np.bool_,
+    "is_anomalous": np.bool_,
+    "is_silent": np.bool_,
+    "is_invalid": np.bool_
+}
+
+# Fields with one value per channel
+_CHANNEL_FIELDS = (
+    "peak_db",
+    "rms_db",
+    "spectral_rolloff_min",
+    "spectral_rolloff",
+    "spectral_rolloff_max"
+)
+
+# Fields with a small set of distinct values
+_CATEGORICAL_FIELDS = ("fmt", "subtype")
+
+_SHA256_NUM_BYTES = 32
+
+
+class ResultStore:
+    """Compact columnar container of per-file analysis results.
+
+    Each field is stored in a typed `numpy` array instead of one `dict` per
+    file:
+
+    - Scalar fields (e.g. `size_bytes` or `is_clipped`) use one fixed-size
+        array each.
+    - Per-channel fields (e.g. `peak_db`) are stored ragged, as a flat
+        `float64` array with the values of all files plus the offset of
+        each file in it, so files with many channels do not pad the rest.
+        Values keep full precision, so that results written back out (e.g.
+        `.tar` sidecars or `--from-results`) match the analyzed ones.
+    - `fmt` and `subtype` are stored as integer codes.
+    - `sha256` is stored as 32 raw bytes.
+    - File paths are stored as a single UTF-8 buffer plus offsets.
+
+    Arrays grow geometrically, so appending is amortized O(1). A typical
+    mono or stereo file takes around 100 bytes plus the length of its path.
+
+    Args:
+        fields (List[str]): Fields to store (e.g. as returned by
+            `sndls.analysis.get_output_cols`). `file` is always stored.
+        capacity (int): Initial number of files that can be stored without
+            growing the arrays.
+    """
+    def __init__(self, fields: List[str], capacity: int = 1024) -> None:
+        self._fields = [f for f in fields if f != "file"]
+        self._size = 0
+        self._capacity = max(1, capacity)
+
+        self._paths = bytearray()
+        self._path_offsets = np.zeros(self._capacity + 1, dtype=np.int64)
+
+        self._scalars: Dict[str, np.ndarray] = {}
+        self._nulls: Dict[str, np.ndarray] = {}
+        self._channels: Dict[str, np.ndarray] = {}
+        self._channel_offsets: Dict[str, np.ndarray] = {}
+        self._codes: Dict[str, np.ndarray] = {}
+        self._categories: Dict[str, List[Optional[str]]] = {}
+        self._sha256 = None
+
+        for field in self._fields:
+            if field in _SCALAR_DTYPES:
+                self._scalars[field] = np.zeros(
+                    self._capacity,
+                    dtype=_SCALAR_DTYPES[field]
+                )
+                self._nulls[field] = np.zeros(self._capacity, dtype=np.bool_)
+
+            elif field in _CHANNEL_FIELDS:
+                # NOTE: The values of file `idx` are
+                # `values[offsets[idx]:offsets[idx + 1]]`. Missing fields
+                # (e.g. invalid files) have no values and are flagged as null
+                self._channels[field] = np.zeros(
+                    self._capacity,
+                    dtype=np.float64
+                )
+                self._channel_offsets[field] = np.zeros(
+                    self._capacity + 1,
+                    dtype=np.int64
+                )
+                self._nulls[field] = np.zeros(self._capacity, dtype=np.bool_)
+
+            elif field in _CATEGORICAL_FIELDS:
+                self._codes[field] = np.zeros(self._capacity, dtype=np.int16)
+                self._categories[field] = []
+
+            elif field == "sha256":
+                self._sha256 = np.zeros(
+                    (self._capacity, _SHA256_NUM_BYTES),
+                    dtype=np.uint8
+                )
+                self._nulls[field] = np.zeros(self._capacity, dtype=np.bool_)
+
+            else:
+                raise ValueError(f"Unsupported field '{field}'")
+
+    @classmethod
+    def from_polars(cls, df: pl.DataFrame) -> ResultStore:
+        """Creates a store from a `pl.DataFrame` with the same columns
+        returned by `to_polars`.
+
+        Args:
+            df (pl.DataFrame): One row per file. It must contain a `file`
+                column, and columns that are not supported fields are
+                ignored.
+
+        Returns:
+            ResultStore: Store containing all rows of `df`.
+        """
+        if "file" not in df.columns:
+            raise ValueError("No 'file' column found")
+
+        fields = [
+            c for c in df.columns
+            if c in _SCALAR_DTYPES
+            or c in _CHANNEL_FIELDS
+            or c in _CATEGORICAL_FIELDS
+            or c in ("file", "sha256")
+        ]
+        import polars as pl
+
+        # NOTE: Columns are converted at once instead of appending one row
+        # at a time, since stored results may contain millions of files
+        size = len(df)
+        store = cls(fields, capacity=size)
+
+        paths = [
+            f.encode("utf-8", errors="surrogateescape")
+            for f in df.get_column("file").to_list()
+        ]
+        store._paths = bytearray(b"".join(paths))
+        np.cumsum(
+            [len(p) for p in paths],
+            out=store._path_offsets[1:size + 1]
+        )
+
+        for field, a in store._scalars.items():
+            series = df.get_column(field)
+            store._nulls[field][:size] = series.is_null().to_numpy()
+            a[:size] = series.fill_null(0).to_numpy().astype(a.dtype)
+
+        for field in store._channels:
+            series = df.get_column(field)
+            lens = series.list.len()
+            store._nulls[field][:size] = lens.is_null().to_numpy()
+            np.cumsum(
+                lens.fill_null(0).to_numpy(),
+                out=store._channel_offsets[field][1:size + 1]
+            )
+
+            # NOTE: Empty and missing lists are left out before exploding,
+            # so that each exploded value belongs to a list
+            store._channels[field] = (
+                series.filter(lens > 0)
+                .list.explode()
+                .cast(pl.Float64)
+                .fill_null(np.nan)
+                .to_numpy()
+                .astype(np.float64)
+            )
+
+        for field, a in store._codes.items():
+            categories = store._categories[field]
+            codes = {}
+
+            for idx, value in enumerate(df.get_column(field).to_list()):
+                if value not in codes:
+                    codes[value] = len(categories)
+                    categories.append(value)
+
+                a[idx] = codes[value]
+
+        if store._sha256 is not None:
+            for idx, sha256 in enumerate(df.get_column("sha256").to_list()):
+                if sha256 is None:
+                    store._nulls["sha256"][idx] = True
+
+                else:
+                    store._sha256[idx] = np.frombuffer(
+                        bytes.fromhex(sha256),
+                        dtype=np.uint8
+                    )
+
+        store._size = size
+
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, idx: int) -> dict:
+        return self.get_record(idx)
+
+    def __iter__(self) -> Iterator[dict]:
+        for idx in range(self._size):
+            yield self.get_record(idx)
+
+    @property
+    def fields(self) -> List[str]:
+        """Stored fields."""
+        return ["file", *self._fields]
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the stored results, including unused
+        capacity."""
+        arrays = [
+            self._path_offsets,
+            *self._scalars.values(),
+            *self._nulls.values(),
+            *self._channels.values(),
+            *self._channel_offsets.values(),
+            *self._codes.values()
+        ]
+
+        if self._sha256 is not None:
+            arrays.append(self._sha256)
+
+        return len(self._paths) + sum(a.nbytes for a in arrays)
+
+    def _grow(self, capacity: int) -> None:
+        """Grows all arrays to a new capacity.
+
+        Args:
+            capacity (int): New number of files that can be stored.
+        """
+        def _resize(a: np.ndarray, fill_value=0) -> np.ndarray:
+            b = np.full((capacity, *a.shape[1:]), fill_value, dtype=a.dtype)
+            b[:self._size] = a[:self._size]
+            return b
+
+        self._path_offsets = np.concatenate(
+            [
+                self._path_offsets,
+                np.zeros(capacity - self._capacity, dtype=np.int64)
+            ]
+        )
+
+        for d in (self._scalars, self._nulls, self._codes):
+            for field, a in d.items():
+                d[field] = _resize(a)
+
+        for field, offsets in self._channel_offsets.items():
+            self._channel_offsets[field] = np.concatenate(
+                [offsets, np.zeros(capacity - self._capacity, dtype=np.int64)]
+            )
+
+        if self._sha256 is not None:
+            self._sha256 = _resize(self._sha256)
+
+        self._capacity = capacity
+
+    def _reserve_values(self, field: str, num_values: int) -> None:
+        """Grows the values of a per-channel field so that at least
+        `num_values` values fit in it.
+
+        Args:
+            field (str): Per-channel field.
+            num_values (int): Number of values to fit.
+        """
+        a = self._channels[field]
+
+        if num_values > len(a):
+            b = np.zeros(max(num_values, 2 * len(a)), dtype=a.dtype)
+            b[:len(a)] = a
+            self._channels[field] = b
+
+    def _get_code(self, field: str, value: Optional[str]) -> int:
+        """Returns the integer code of a categorical value, adding it to the
+        categories of the field if needed.
+
+        Args:
+            field (str): Categorical field.
+            value (Optional[str]): Value.
+
+        Returns:
+            int: Integer code.
+        """
+        categories = self._categories[field]
+
+        try:
+            return categories.index(value)
+
+        except ValueError:
+            categories.append(value)
+            return len(categories) - 1
+
+    def append(self, record: dict) -> None:
+        """Appends the results of a file.
+
+        Args:
+            record (dict): File results. Fields that are not stored are
+                ignored, and stored fields that are missing or `None` are
+                stored as missing values.
+        """
+        if self._size == self._capacity:
+            self._grow(2 * self._capacity)
+
+        idx = self._size
+        path = record["file"].encode("utf-8", errors="surrogateescape")
+        self._paths += path
+        self._path_offsets[idx + 1] = self._path_offsets[idx] + len(path)
+
+        for field, a in self._scalars.items():
+            value = record.get(field)
+
+            if value is None:
+                self._nulls[field][idx] = True
+
+            else:
+                a[idx] = value
+
+        for field, offsets in self._channel_offsets.items():
+            values = record.get(field)
+            start = offsets[idx]
+
+            if values is None:
+                self._nulls[field][idx] = True
+                offsets[idx + 1] = start
+                continue
+
+            stop = start + len(values)
+            self._reserve_values(field, stop)
+            self._channels[field][start:stop] = values
+            offsets[idx + 1] = stop
+
+        for field, a in self._codes.items():
+            a[idx] = self._get_code(field, record.get(field))
+
+        if self._sha256 is not None:
+            sha256 = record.get("sha256")
+
+            if sha256 is None:
+                self._nulls["sha256"][idx] = True
+
+            else:
+                self._sha256[idx] = np.frombuffer(
+                    bytes.fromhex(sha256),
+                    dtype=np.uint8
+                )
+
+        self._size += 1
+
+    def get_file(self, idx: int) -> str:
+        """Returns the path of a stored file.
+
+        Args:
+            idx (int): File index.
+
+        Returns:
+            str: File path.
+        """
+        start, end = self._path_offsets[idx], self._path_offsets[idx + 1]
+        return self._paths[start:end].decode(
+            "utf-8",
+            errors="surrogateescape"
+        )
+
+    def _get_channel_values(self, field: str, idx: int) -> np.ndarray:
+        """Returns the values of a per-channel field of a stored file.
+
+        Args:
+            field (str): Per-channel field.
+            idx (int): File index.
+
+        Returns:
+            np.ndarray: Values of the field (one per channel).
+        """
+        offsets = self._channel_offsets[field]
+        return self._channels[field][offsets[idx]:offsets[idx + 1]]
+
+    def get_record(self, idx: int) -> dict:
+        """Returns the results of a file in the same format they were
+        appended.
+
+        Args:
+            idx (int): File index.
+
+        Returns:
+            dict: File results.
+        """
+        if idx < 0:
+            idx += self._size
+
+        if not 0 <= idx < self._size:
+            raise IndexError("ResultStore index out of range")
+
+        file = self.get_file(idx)
+        record = {"file": file, "filename": os.path.basename(file)}
+
+        for field in self._fields:
+            if field in self._scalars:
+                record[field] = (
+                    None if self._nulls[field][idx]
+                    else self._scalars[field][idx].item()
+                )
+
+            elif field in self._channels:
+                record[field] = (
+                    None if self._nulls[field][idx]
+                    else self._get_channel_values(field, idx).tolist()
+                )
+
+            elif field in self._codes:
+                record[field] = (
+                    self._categories[field][self._codes[field][idx]]
+                )
+
+            elif field == "sha256":
+                record[field] = (
+                    None if self._nulls[field][idx]
+                    else self._sha256[idx].tobytes().hex()
+                )
+
+        return record
+
+    def get_column(self, field: str) -> np.ndarray:
+        """Returns the values of a field for all stored files.
+
+        !!! note
+            Scalar fields are returned as views, so they should not be
+            modified. Missing numeric values are `0` (or NaN for floats and
+            per-channel fields), so check `is_invalid` when needed.
+
+        Args:
+            field (str): Field name.
+
+        Returns:
+            np.ndarray: Values of the field. Per-channel fields are returned
+                as `(num_files, num_channels)` `float64` arrays padded with
+                NaN, where `num_channels` is the largest number of channels
+                of any file,
+                `file`, `fmt` and `subtype` as object arrays and `sha256` as
+                `(num_files, 32)` byte arrays.
+        """
+        if field == "file":
+            return np.array(
+                [self.get_file(idx) for idx in range(self._size)],
+                dtype=object
+            )
+
+        elif field in self._scalars:
+            return self._scalars[field][:self._size]
+
+        elif field in self._channels:
+            offsets = self._channel_offsets[field][:self._size + 1]
+            lens = np.diff(offsets)
+            column = np.full(
+                (self._size, max(1, int(lens.max(initial=0)))),
+                np.nan,
+                dtype=np.float64
+            )
+            column[np.arange(column.shape[1]) < lens[:, None]] = (
+                self._channels[field][:offsets[-1]]
+            )
+            return column
+
+        elif field in self._codes:
+            categories = np.array(self._categories[field], dtype=object)
+            return categories[self._codes[field][:self._size]]
+
+        elif field == "sha256" and self._sha256 is not None:
+            return self._sha256[:self._size]
+
+        raise KeyError(f"Field '{field}' is not stored")
+
+    def to_polars(self) -> pl.DataFrame:
+        """Converts the stored results to a `pl.DataFrame`.
+
+        Returns:
+            pl.DataFrame: One row per stored file and one column per field.
+        """
+        import polars as pl
+
+        columns = {}
+
+        for field in self.fields:
+            if field in self._scalars:
+                series = pl.Series(field, self._scalars[field][:self._size])
+                nulls = np.flatnonzero(self._nulls[field][:self._size])
+
+                if len(nulls) > 0:
+                    series = series.scatter(nulls, None)
+
+                columns[field] = series
+
+            elif field in self._channels:
+                columns[field] = pl.Series(
+                    field,
+                    [
+                        None if self._nulls[field][idx]
+                        else self._get_channel_values(field, idx).tolist()
+                        for idx in range(self._size)
+                    ],
+                    dtype=pl.List(pl.Float64)
+                )
+
+            elif field == "sha256":
+                columns[field] = pl.Series(
+                    field,
+                    [
+                        None if is_null else h.tobytes().hex()
+                        for h, is_null in zip(
+                            self._sha256[:self._size],
+                            self._nulls[field][:self._size]
+                        )
+                    ],
+                    dtype=pl.String
+                )
+
+            else:
+                columns[field] = pl.Series(
+                    field,
+                    self.get_column(field).tolist(),
+                    dtype=pl.String
+                )
+
+        return pl.DataFrame(columns)
+
+
+def _parse_str_column(series: pl.Series) -> pl.Series:
+    """Parses a field written to a .csv file by `--csv`, where numbers,
+    booleans and per-channel lists are written as their `str` value.
+
+    Args:
+        series (pl.Series): String column named after a stored field.
+
+    Returns:
+        pl.Series: Column with the data type of the field.
+    """
+    import polars as pl
+
+    field = series.name
+
+    if field in _CHANNEL_FIELDS:
+        values = series.str.strip_chars("[]").str.split(", ")
+        return values.list.eval(
+            pl.element().filter(pl.element() != "")
+        ).cast(pl.List(pl.Float64))
+
+    elif field in _SCALAR_DTYPES:
+        dtype = np.dtype(_SCALAR_DTYPES[field])
+
+        if dtype.kind == "b":
+            return series == "True"
+
+        return series.cast(pl.Int64 if dtype.kind == "i" else pl.Float64)
+
+    return series
+
+
+def read_results_dataframe(file: str) -> pl.DataFrame:
+    """Reads results previously written to a .csv file (e.g. with the
+    `--csv` option) or to a .parquet file (e.g. from
+    `sndls.analysis.Analyzer.to_dataframe`) as a `pl.DataFrame`.
+
+    Args:
+        file (str): .csv or .parquet results file.
+
+    Returns:
+        pl.DataFrame: One row per file, with the same data types returned by
+            `ResultStore.to_polars`.
+
+    Raises:
+        ResultsError: If the file does not exist, has an unsupported
+            extension or cannot be parsed.
+    """
+    # NOTE: polars is only imported if needed since it is slow to import
+    import polars as pl
+
+    if not is_file_with_ext(file, ext=[".csv", ".parquet"]):
+        raise ResultsError(
+            f"Results file '{file}' not found or not a .csv or .parquet file"
+        )
+
+    try:
+        if is_file_with_ext(file, ext=".parquet"):
+            df = pl.read_parquet(file)
+
+        else:
+            # NOTE: All values are read as strings and parsed per field, so
+            # that missing and per-channel values are read back exactly
+            df = pl.read_csv(file, infer_schema=False)
+            df = df.with_columns(
+                _parse_str_column(df.get_column(c)) for c in df.columns
+            )
+
+    except (pl.exceptions.PolarsError, ValueError) as e:
+        raise ResultsError(
+            f"The following error occurred while reading '{file}': {e}"
+        ) from e
+
+    if "file" not in df.columns:
+        raise ResultsError(f"No 'file' column found in '{file}'")
+
+    return df
+
+
+def read_results(file: str) -> ResultStore:
+    """Reads results previously written to a .csv or .parquet file (see
+    `read_results_dataframe`).
+
+    Args:
+        file (str): .csv or .parquet results file.
+
+    Returns:
+        ResultStore: Stored results of each file.
+
+    Raises:
+        ResultsError: If the file does not exist, has an unsupported
+            extension or cannot be parsed.
+    """
+    return ResultStore.from_polars(read_results_dataframe(file))
@@ -0,0 +1,250 @@
+import io
+import os
+import tarfile
+from time import (
+    perf_counter,
+    time
+)
+from functools import partial
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait
+)
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union
+)
+from tqdm import tqdm
+
+
+def make_dst_dirs(dsts: Iterable[str]) -> Set[str]:
+    """Creates every destination folder once and lists its current content,
+    so that conflicts can be checked without querying the filesystem once
+    per file.
+
+    Args:
+        dsts (Iterable[str]): Destination files.
+
+    Returns:
+        Set[str]: Normalized paths of all entries already existing in the
+            destination folders.
+    """
+    existing = set()
+
+    for dir in sorted({os.path.dirname(os.path.normpath(d)) for d in dsts}):
+        os.makedirs(dir or ".", exist_ok=True)
+
+        with os.scandir(dir or ".") as it:
+            existing.update(
+                os.path.normpath(os.path.join(dir, e.name)) for e in it
+            )
+
+    return existing
+
+
+def run_transfers(
+        tasks: List[Tuple[str, Optional[str], int]],
+        fn: Callable[[str, Optional[str]], Any],
+        num_workers: int = 1,
+        on_done: Optional[Callable[[str, Optional[str], Any], None]] = None,
+        on_error: Optional[Callable[[str, Optional[str], Exception], None]] = (
+            None
+        ),
+        desc: Optional[str] = None,
+        colour: Optional[str] = None
+) -> Tuple[int, int, float]:
+    """Runs file transfers (copies, moves, removals, etc.) using a pool of
+    threads.
+
+    !!! note
+        `on_done` and `on_error` are always called from the calling thread,
+        so they can safely print to the terminal.
+
+    Args:
+        tasks (List[Tuple[str, Optional[str], int]]): Source file,
+            destination file (or `None` if not needed) and size in bytes of
+            each transfer.
+        fn (Callable): Function called as `fn(src, dst)` to perform each
+            transfer.
+        num_workers (int): Number of threads. If `1`, transfers are performed
+            sequentially in the calling thread.
+        on_done (Optional[Callable]): Function called as
+            `on_done(src, dst, result)` after each successful transfer.
+        on_error (Optional[Callable]): Function called as
+            `on_error(src, dst, exception)` after each failed transfer.
+        desc (Optional[str]): Progress bar description.
+        colour (Optional[str]): Progress bar color.
+
+    Returns:
+        Tuple[int, int, float]: Number of successful transfers, number of
+            bytes transferred and elapsed time in seconds.
+    """
+    done_files = 0
+    done_bytes = 0
+    start_time = perf_counter()
+
+    def _handle(task: Tuple[str, Optional[str], int], get_result: Callable):
+        nonlocal done_files, done_bytes
+        src, dst, size = task
+
+        try:
+            result = get_result()
+
+        except Exception as e:
+            if on_error is not None:
+                on_error(src, dst, e)
+
+            return
+
+        done_files += 1
+        done_bytes += size
+
+        if on_done is not None:
+            on_done(src, dst, result)
+
+    with tqdm(
+        total=len(tasks),
+        desc=desc,
+        leave=False,
+        unit="file",
+        colour=colour
+    ) as pbar:
+        if num_workers <= 1:
+            for task in tasks:
+                _handle(task, partial(fn, task[0], task[1]))
+                pbar.update(1)
+
+        else:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                pending = {}
+                tasks_iter = iter(tasks)
+
+                # NOTE: The number of in-flight transfers is bounded to avoid
+                # creating one future per file upfront
+                while True:
+                    for task in tasks_iter:
+                        pending[executor.submit(fn, task[0], task[1])] = task
+
+                        if len(pending) >= 4 * num_workers:
+                            break
+
+                    if len(pending) == 0:
+                        break
+
+                    completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in completed:
+                        _handle(pending.pop(future), future.result)
+                        pbar.update(1)
+
+    return done_files, done_bytes, perf_counter() - start_time
+
+
+def _set_tar_member_mtime(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    """Rounds the modification time of a `.tar` member to whole seconds, so
+    that it fits in the regular header and no extended header is written for
+    it.
+
+    Args:
+        info (tarfile.TarInfo): Member information.
+
+    Returns:
+        tarfile.TarInfo: `info` with an integer modification time.
+    """
+    info.mtime = int(info.mtime)
+    return info
+
+
+def get_tar_member_size(size: int, name: Optional[str] = None) -> int:
+    """Returns the number of bytes a file of `size` bytes takes inside a
+    `.tar` archive, including its header and padding.
+
+    Args:
+        size (int): File size in bytes.
+        name (Optional[str]): Name of the member inside the archive. If
+            given, the size includes the extended (PAX) header written for
+            long or non-ASCII names. Otherwise a single header block is
+            assumed.
+
+    Returns:
+        int: Size in bytes of the `.tar` member.
+    """
+    if name is None:
+        header_size = tarfile.BLOCKSIZE
+
+    else:
+        info = tarfile.TarInfo(name=name)
+        info.size = size
+        header_size = len(
+            info.tobuf(
+                tarfile.DEFAULT_FORMAT,
+                tarfile.ENCODING,
+                "surrogateescape"
+            )
+        )
+
+    return header_size + -(-size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+
+def get_tar_size(members_size: int) -> int:
+    """Returns the size in bytes of a `.tar` archive whose members take
+    `members_size` bytes (see `get_tar_member_size`), including the
+    end-of-archive blocks and the padding of the last record.
+
+    Args:
+        members_size (int): Total size in bytes of the members.
+
+    Returns:
+        int: Size in bytes of the `.tar` archive.
+    """
+    return -(-(members_size + 2 * tarfile.BLOCKSIZE) // tarfile.RECORDSIZE) * (
+        tarfile.RECORDSIZE
+    )
+
+
+def write_tar(
+        dst: str,
+        members: Iterable[Tuple[str, Union[str, bytes]]]
+) -> None:
+    """Writes a `.tar` archive. Files are streamed from disk into the
+    archive without staging. The archive is written to a temporary file that
+    is renamed once complete, so interrupted writes do not leave truncated
+    archives behind.
+
+    Args:
+        dst (str): Output `.tar` file.
+        members (Iterable[Tuple[str, Union[str, bytes]]]): Name of each
+            member inside the archive and its content, given as a path to the
+            file to be added or as `bytes`.
+    """
+    tmp_dst = f"{dst}.tmp"
+
+    try:
+        with tarfile.open(tmp_dst, "w", dereference=True) as tar:
+            for name, content in members:
+                if isinstance(content, bytes):
+                    info = tarfile.TarInfo(name=name)
+                    info.size = len(content)
+                    info.mtime = int(time())
+                    tar.addfile(info, io.BytesIO(content))
+
+                else:
+                    tar.add(
+                        content,
+                        arcname=name,
+                        recursive=False,
+                        filter=_set_tar_member_mtime
+                    )
+
+        os.replace(tmp_dst, dst)
+
+    finally:
+        if os.path.isfile(tmp_dst):
+            os.remove(tmp_dst)
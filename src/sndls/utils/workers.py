@@ -0,0 +1,236 @@
+import queue
+import signal
+import multiprocessing as mp
+from contextlib import suppress
+from multiprocessing.connection import Connection
+from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+from .exceptions import (
+    WorkerCrashedError,
+    WorkerTimeoutError
+)
+
+
+def _worker_main(conn: Connection) -> None:
+    """Runs the tasks received through `conn` until `None` is received or
+    the connection is closed, and sends back their results.
+
+    Args:
+        conn (Connection): Connection to the supervising process.
+    """
+    # NOTE: Interrupts are handled by the supervising process, which
+    # terminates its workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    while True:
+        try:
+            task = conn.recv()
+
+        except (EOFError, OSError):
+            return
+
+        if task is None:
+            return
+
+        fn, args = task
+
+        # NOTE: Tasks without arguments only load the module of `fn` (see
+        # `WorkerPool._start_worker`)
+        if args is None:
+            conn.send((True, None))
+            continue
+
+        try:
+            result = (True, fn(*args))
+
+        except Exception as e:
+            result = (False, e)
+
+        try:
+            conn.send(result)
+
+        except Exception as e:
+            # NOTE: Results or exceptions that cannot be pickled are sent as
+            # a plain error instead
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker(NamedTuple):
+    process: mp.Process
+    conn: Connection
+
+
+class WorkerPool:
+    """Pool of supervised worker processes that run one task at a time with
+    a timeout, isolating the calling process from tasks that hang or crash
+    (e.g. a decoder stuck in an infinite loop or a segmentation fault).
+
+    Workers are started when first needed and reused across tasks. A worker
+    whose task times out is killed, and a worker that dies while running a
+    task is discarded. In both cases a new worker replaces it on the next
+    task, so the pool keeps running at full size.
+
+    `run` can be called from several threads at once: each call takes an
+    idle worker, waiting until one is available.
+
+    !!! note
+        Workers are started with the `spawn` method, since forking a process
+        that runs several threads is not safe. Tasks and their results must
+        be picklable, and functions must be defined at module level.
+
+    Args:
+        num_workers (int): Number of worker processes.
+    """
+    def __init__(self, num_workers: int = 1) -> None:
+        self.num_workers = max(1, num_workers)
+        self._ctx = mp.get_context("spawn")
+        self._idle: queue.SimpleQueue = queue.SimpleQueue()
+        self._workers: List[_Worker] = []
+
+        # NOTE: None stands for a worker that is not running yet
+        for _ in range(self.num_workers):
+            self._idle.put(None)
+
+    def _start_worker(self, fn: Callable) -> _Worker:
+        """Starts a new worker process and waits until it has imported the
+        module of `fn`, so that the start-up time of the worker does not
+        count towards the timeout of its first task.
+
+        Args:
+            fn (Callable): Function the worker is going to run.
+
+        Returns:
+            _Worker: Worker process and connection to it.
+
+        Raises:
+            WorkerCrashedError: If the worker process dies while starting.
+        """
+        conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn,),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, conn)
+        self._workers.append(worker)
+
+        try:
+            conn.send((fn, None))
+            conn.recv()
+
+        except (EOFError, OSError):
+            exitcode = self._kill_worker(worker)
+            raise WorkerCrashedError(
+                f"worker process crashed while starting (exit code "
+                f"{exitcode})"
+            )
+
+        return worker
+
+    def _kill_worker(self, worker: _Worker) -> Optional[int]:
+        """Kills a worker process and waits for it to exit.
+
+        Args:
+            worker (_Worker): Worker to kill.
+
+        Returns:
+            Optional[int]: Exit code of the worker.
+        """
+        if worker.process.is_alive():
+            worker.process.kill()
+
+        worker.process.join()
+        worker.conn.close()
+        self._workers.remove(worker)
+
+        return worker.process.exitcode
+
+    def run(
+            self,
+            fn: Callable,
+            args: Tuple = (),
+            timeout: Optional[float] = None
+    ) -> Any:
+        """Runs `fn(*args)` in a worker process.
+
+        Args:
+            fn (Callable): Module-level function to run.
+            args (Tuple): Arguments of `fn`.
+            timeout (Optional[float]): Maximum number of seconds to wait for
+                the result. If `None`, the result is waited for indefinitely.
+
+        Returns:
+            Any: Value returned by `fn`.
+
+        Raises:
+            WorkerTimeoutError: If `fn` does not return within `timeout`
+                seconds.
+            WorkerCrashedError: If the worker process dies while running
+                `fn`.
+            Exception: Any exception raised by `fn`.
+        """
+        worker = self._idle.get()
+
+        try:
+            if worker is not None and not worker.process.is_alive():
+                self._kill_worker(worker)
+                worker = None
+
+            if worker is None:
+                worker = self._start_worker(fn)
+
+            try:
+                worker.conn.send((fn, args))
+                is_ready = worker.conn.poll(
+                    None if timeout is None else max(0.0, timeout)
+                )
+
+            except OSError:
+                is_ready = True
+
+            if not is_ready:
+                self._kill_worker(worker)
+                worker = None
+                raise WorkerTimeoutError("worker process timed out")
+
+            try:
+                is_ok, result = worker.conn.recv()
+
+            except (EOFError, OSError):
+                exitcode = self._kill_worker(worker)
+                worker = None
+                raise WorkerCrashedError(
+                    f"worker process crashed (exit code {exitcode})"
+                )
+
+        finally:
+            self._idle.put(worker)
+
+        if not is_ok:
+            raise result
+
+        return result
+
+    def close(self) -> None:
+        """Stops all worker processes."""
+        for worker in list(self._workers):
+            with suppress(OSError):
+                worker.conn.send(None)
+
+        for worker in list(self._workers):
+            worker.process.join(timeout=1.0)
+            self._kill_worker(worker)
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
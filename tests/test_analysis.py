@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+import soundfile as sf
+import sndls.analysis
+from sndls.analysis import Analyzer
+
+
+@pytest.fixture
+def pcm_file(tmp_path):
+    fs = 16000
+    t = np.arange(fs) / fs
+    file = tmp_path / "pcm.wav"
+    sf.write(file, 0.3 * np.sin(2 * np.pi * 440 * t), fs, subtype="PCM_16")
+
+    return str(file)
+
+
+@pytest.mark.parametrize("probe", [False, True])
+def test_mmap_honors_float64_dtype(pcm_file, probe, monkeypatch):
+    dtypes = []
+    convert = sndls.analysis._convert_mapped_audio
+
+    def _convert(audio, options):
+        audio = convert(audio, options)
+        dtypes.append(audio.dtype)
+        return audio
+
+    monkeypatch.setattr(sndls.analysis, "_convert_mapped_audio", _convert)
+    options = {"dtype": "float64", "spectral_rolloff": 0.9, "probe": probe}
+    decoded = Analyzer(**options).analyze_file(pcm_file)
+    mapped = Analyzer(mmap=True, **options).analyze_file(pcm_file)
+
+    assert len(dtypes) > 0
+    assert all(dtype == np.float64 for dtype in dtypes)
+
+    for field in ("peak_db", "rms_db", "spectral_rolloff"):
+        assert mapped[field] == pytest.approx(decoded[field], abs=1e-9)
+
+
+def test_mmap_keeps_native_dtype_by_default(pcm_file):
+    decoded = Analyzer(dtype="native").analyze_file(pcm_file)
+    mapped = Analyzer(mmap=True).analyze_file(pcm_file)
+
+    assert mapped["peak_db"] == decoded["peak_db"]
+    assert mapped["rms_db"] == decoded["rms_db"]
@@ -0,0 +1,143 @@
+import csv
+import json
+import sys
+import numpy as np
+import pytest
+import soundfile as sf
+from sndls.cli.main import main
+
+
+def _run_cli(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["sndls", *map(str, args)])
+
+    try:
+        main()
+
+    except SystemExit as e:
+        assert e.code in (None, 0)
+
+
+@pytest.fixture
+def audio_dir(tmp_path):
+    fs = 16000
+    t = np.arange(fs) / fs
+    root = tmp_path / "audio"
+    root.mkdir()
+    sf.write(root / "a_low.wav", 0.5 * np.sin(2 * np.pi * 200 * t), fs)
+    sf.write(root / "b_high.wav", 0.5 * np.sin(2 * np.pi * 6000 * t), fs)
+    (root / "c_invalid.wav").write_bytes(b"not a wav file")
+
+    return root
+
+
+def test_spectral_rolloff_with_skip_invalid_files(
+        audio_dir,
+        tmp_path,
+        monkeypatch
+):
+    output = tmp_path / "output.csv"
+    _run_cli(
+        monkeypatch,
+        audio_dir,
+        "--skip-invalid-files",
+        "--spectral-rolloff", 0.9,
+        "--csv", output
+    )
+
+    with open(output) as f:
+        rows = {r["file"]: r for r in csv.DictReader(f)}
+
+    low = json.loads(rows[str(audio_dir / "a_low.wav")]["spectral_rolloff"])
+    high = json.loads(rows[str(audio_dir / "b_high.wav")]["spectral_rolloff"])
+
+    assert 150.0 < low[0] < 300.0
+    assert 5900.0 < high[0] < 6200.0
+    assert rows[str(audio_dir / "c_invalid.wav")]["is_invalid"] == "True"
+    assert rows[str(audio_dir / "c_invalid.wav")]["spectral_rolloff"] == ""
+
+
+class _EventStream:
+    def __init__(self, events):
+        self.events = events
+
+    def write(self, text):
+        if text.strip():
+            self.events.append("record")
+
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def test_spectral_rolloff_records_are_streamed(tmp_path, monkeypatch):
+    import sndls.cli.cmd
+
+    fs = 16000
+    rng = np.random.default_rng(0)
+    root = tmp_path / "clips"
+    root.mkdir()
+
+    # NOTE: Enough clips for the spectral rolloff batch to be flushed
+    # several times before the last one is analyzed
+    for idx in range(200):
+        x = 0.1 * rng.standard_normal(fs // 2)
+        sf.write(root / f"{idx:03d}.wav", x, fs)
+
+    events = []
+    analyze_file = sndls.cli.cmd._analyze_file
+
+    def _analyze_file(*args, **kwargs):
+        events.append("analyze")
+        return analyze_file(*args, **kwargs)
+
+    monkeypatch.setattr(sndls.cli.cmd, "_analyze_file", _analyze_file)
+    monkeypatch.setattr(sys, "stdout", _EventStream(events))
+    _run_cli(
+        monkeypatch,
+        root,
+        "--spectral-rolloff", 0.9,
+        "--format", "jsonl"
+    )
+
+    assert events.count("analyze") == 200
+    assert events.count("record") == 200
+
+    # NOTE: Records are output while files are still being analyzed
+    last_analyze = len(events) - 1 - events[::-1].index("analyze")
+    assert events.index("record") < last_analyze
+
+
+def test_from_results_matches_live_records(
+        audio_dir,
+        tmp_path,
+        monkeypatch,
+        capsys
+):
+    output = tmp_path / "output.csv"
+    options = ["--dtype", "native", "--spectral-rolloff", 0.9]
+    _run_cli(
+        monkeypatch,
+        audio_dir,
+        "--skip-invalid-files",
+        "--format", "jsonl",
+        "--csv", output,
+        *options
+    )
+    live = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    _run_cli(
+        monkeypatch,
+        output,
+        "--from-results",
+        "--format", "jsonl",
+        *options
+    )
+    stored = [
+        json.loads(line) for line in capsys.readouterr().out.splitlines()
+    ]
+
+    assert len(live) == 3
+    assert stored == live
@@ -0,0 +1,22 @@
+from sndls.utils.collections import partition_by_weight
+
+
+def test_partition_by_weight_balances_weights():
+    partitions = partition_by_weight([5.0, 4.0, 3.0, 3.0, 3.0], 2)
+
+    assert partitions == [[0, 3], [1, 2, 4]]
+
+
+def test_partition_by_weight_spreads_zero_weights():
+    partitions = partition_by_weight([0.0] * 6, 3)
+
+    assert partitions == [[0, 3], [1, 4], [2, 5]]
+
+
+def test_partition_by_weight_more_partitions_than_nonzero_items():
+    weights = [10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+    partitions = partition_by_weight(weights, 4)
+
+    assert sorted(idx for p in partitions for idx in p) == list(range(7))
+    assert [len(p) for p in partitions] == [1, 2, 2, 2]
+    assert [0] in partitions
@@ -0,0 +1,59 @@
+import errno
+import fcntl
+import os
+import pytest
+from sndls.utils.io import _reflink_file, copy_file
+
+
+def _raise_not_supported(*args, **kwargs):
+    raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+
+def test_reflink_keeps_existing_destination(tmp_path):
+    src = tmp_path / "src.wav"
+    dst = tmp_path / "dst.wav"
+    src.write_bytes(b"source")
+    dst.write_bytes(b"existing")
+
+    with pytest.raises(FileExistsError):
+        _reflink_file(str(src), str(dst))
+
+    assert dst.read_bytes() == b"existing"
+
+
+def test_copy_file_reflink_keeps_existing_destination(tmp_path):
+    src = tmp_path / "src.wav"
+    dst = tmp_path / "dst.wav"
+    src.write_bytes(b"source")
+    dst.write_bytes(b"existing")
+
+    with pytest.raises(FileExistsError):
+        copy_file(str(src), str(dst), mode="reflink")
+
+    assert dst.read_bytes() == b"existing"
+
+
+def test_reflink_removes_created_destination_on_failure(
+        tmp_path,
+        monkeypatch
+):
+    src = tmp_path / "src.wav"
+    dst = tmp_path / "dst.wav"
+    src.write_bytes(b"source")
+    monkeypatch.setattr(fcntl, "ioctl", _raise_not_supported)
+
+    with pytest.raises(OSError) as e:
+        _reflink_file(str(src), str(dst))
+
+    assert e.value.errno == errno.EOPNOTSUPP
+    assert not os.path.exists(dst)
+
+
+def test_copy_file_reflink_falls_back_to_copy(tmp_path, monkeypatch):
+    src = tmp_path / "src.wav"
+    dst = tmp_path / "dst.wav"
+    src.write_bytes(b"source")
+    monkeypatch.setattr(fcntl, "ioctl", _raise_not_supported)
+
+    assert copy_file(str(src), str(dst), mode="reflink") == "copy"
+    assert dst.read_bytes() == b"source"
@@ -0,0 +1,42 @@
+import tracemalloc
+import pytest
+from sndls.utils.memory import MemoryTracker
+
+
+@pytest.fixture(autouse=True)
+def _stop_tracemalloc():
+    is_tracing = tracemalloc.is_tracing()
+    yield
+
+    # NOTE: MemoryTracker starts tracemalloc and leaves it running
+    if not is_tracing:
+        tracemalloc.stop()
+
+
+def _run_stage(memory, name, file=None):
+    start = memory.start()
+    data = bytearray(4 * 1024 ** 2)
+    memory.stop(name, start, file=file)
+
+    return data
+
+
+def test_memory_tracker_per_stage():
+    memory = MemoryTracker(trace_allocations=True)
+    _run_stage(memory, "decode", file="a.wav")
+    _run_stage(memory, "stats", file="a.wav")
+
+    assert [name for name, _ in memory.get_stats()] == ["decode", "stats"]
+    assert [usage["file"] for usage in memory.get_top_files()] == ["a.wav"]
+    assert memory.get_peak_alloc() >= 4 * 1024 ** 2
+
+
+def test_memory_tracker_process_wide_only():
+    memory = MemoryTracker(trace_allocations=True, per_stage=False)
+    _run_stage(memory, "decode", file="a.wav")
+    _run_stage(memory, "decode", file="b.wav")
+
+    assert memory.get_stats() == []
+    assert memory.get_top_files() == []
+    assert memory.get_peak_rss() > 0
+    assert memory.get_peak_alloc() >= 4 * 1024 ** 2
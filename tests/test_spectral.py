@@ -0,0 +1,67 @@
+import tracemalloc
+import numpy as np
+import pytest
+from sndls.utils.audio import spectral_rolloff
+from sndls.utils.spectral import SpectralRolloffBatch
+
+
+@pytest.mark.parametrize("shape", [(3, 4000), (2, 2, 4000)])
+def test_spectral_rolloff_multichannel_matches_mono(shape):
+    x = np.random.default_rng(0).standard_normal(shape).astype(np.float32)
+    flat_x = x.reshape(-1, shape[-1])
+    expected = np.stack(
+        [spectral_rolloff(c, 16000, 512, 128) for c in flat_x]
+    ).reshape(*shape[:-1], 1, -1)
+
+    for max_frames in (1, 7, 1024):
+        result = spectral_rolloff(x, 16000, 512, 128, max_frames=max_frames)
+
+        assert np.array_equal(result, expected)
+
+
+def test_spectral_rolloff_multichannel_memory():
+    fs = 16000
+    fft_size = 1024
+    x = np.random.default_rng(0).standard_normal(
+        (8, 10 * fs)
+    ).astype(np.float32)
+
+    is_tracing = tracemalloc.is_tracing()
+
+    if not is_tracing:
+        tracemalloc.start()
+
+    try:
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        spectral_rolloff(x, fs, fft_size, fft_size // 4, max_frames=64)
+        peak = tracemalloc.get_traced_memory()[1] - start
+
+    finally:
+        if not is_tracing:
+            tracemalloc.stop()
+
+    # NOTE: The overlapping frames of all channels take 4 times the size of
+    # x, while only the zero-padded copy of x and one block of frames are
+    # expected to be allocated
+    assert peak < 2 * x.nbytes
+
+
+def test_spectral_rolloff_batch_multichannel():
+    rng = np.random.default_rng(0)
+    signals = [
+        rng.standard_normal(shape).astype(np.float32)
+        for shape in [(2, 3000), (1, 500), (4, 2000)]
+    ]
+    batch = SpectralRolloffBatch(512, 128, max_frames=128)
+    results = []
+
+    for x in signals:
+        batch.add(x, 16000, results.append)
+
+    batch.flush()
+
+    assert len(results) == len(signals)
+
+    for x, result in zip(signals, results):
+        assert np.array_equal(result, spectral_rolloff(x, 16000, 512, 128))
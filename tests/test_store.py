@@ -0,0 +1,76 @@
+import numpy as np
+from sndls.utils.store import ResultStore
+
+_FIELDS = ["file", "num_channels", "peak_db", "is_invalid"]
+
+
+def _make_records():
+    return [
+        {"file": "mono.wav", "num_channels": 1, "peak_db": [-1.0 / 3.0]},
+        {"file": "stereo.wav", "num_channels": 2, "peak_db": [-2.0, -3.25]},
+        {"file": "invalid.wav", "num_channels": 0, "is_invalid": True},
+        {
+            "file": "multi.wav",
+            "num_channels": 8,
+            "peak_db": [-0.5 * c for c in range(8)]
+        },
+        {"file": "empty.wav", "num_channels": 0, "peak_db": []}
+    ]
+
+
+def test_result_store_channel_fields_roundtrip():
+    store = ResultStore(_FIELDS, capacity=1)
+    records = _make_records()
+
+    for record in records:
+        store.append(record)
+
+    assert len(store) == len(records)
+
+    for record, stored in zip(records, store):
+        assert stored["file"] == record["file"]
+        assert stored["peak_db"] == record.get("peak_db")
+
+
+def test_result_store_channel_fields_are_ragged():
+    store = ResultStore(_FIELDS, capacity=1024)
+    store.append({"file": "multi.wav", "peak_db": [0.0] * 64})
+    nbytes = store.nbytes
+
+    for idx in range(1000):
+        store.append({"file": "mono.wav", "peak_db": [-1.0]})
+
+    # NOTE: Mono files only add their own value, offset and null flag
+    assert store.nbytes - nbytes < 1000 * (len("mono.wav") + 48)
+    assert store._channels["peak_db"].dtype == np.float64
+
+
+def test_result_store_channel_column_is_padded():
+    store = ResultStore(_FIELDS)
+
+    for record in _make_records():
+        store.append(record)
+
+    column = store.get_column("peak_db")
+
+    assert column.shape == (5, 8)
+    assert column[1, :2].tolist() == [-2.0, -3.25]
+    assert np.isnan(column[1, 2:]).all()
+    assert np.isnan(column[2]).all()
+    assert column[3].tolist() == [-0.5 * c for c in range(8)]
+
+
+def test_result_store_polars_roundtrip():
+    store = ResultStore(_FIELDS)
+
+    for record in _make_records():
+        store.append(record)
+
+    restored = ResultStore.from_polars(store.to_polars())
+
+    assert list(restored) == list(store)
+
+    restored.append({"file": "new.wav", "peak_db": [-4.0, -5.0]})
+
+    assert restored[-1]["peak_db"] == [-4.0, -5.0]
+    assert restored[3]["peak_db"] == [-0.5 * c for c in range(8)]
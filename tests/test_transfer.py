@@ -0,0 +1,49 @@
+import tarfile
+from sndls.utils.transfer import (
+    get_tar_member_size,
+    get_tar_size,
+    write_tar
+)
+
+
+def test_get_tar_member_size_matches_archive(tmp_path):
+    audio = tmp_path / "audio.wav"
+    audio.write_bytes(b"\0" * 1500)
+    long_key = "/".join(["nested_folder"] * 12) + "/clip_ñ"
+    members = [
+        ("short.wav", str(audio)),
+        (f"{long_key}.wav", str(audio)),
+        (f"{long_key}.json", b'{"fs": 16000}' * 100)
+    ]
+    dst = tmp_path / "shard.tar"
+    write_tar(str(dst), members)
+
+    with tarfile.open(dst) as tar:
+        infos = tar.getmembers()
+
+    assert [i.name for i in infos] == [name for name, _ in members]
+
+    for info in infos:
+        data_size = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        assert get_tar_member_size(info.size, name=info.name) == (
+            info.offset_data - info.offset + data_size
+        )
+
+
+def test_get_tar_member_size_long_name_adds_extended_header():
+    name = "a" * 200 + ".json"
+
+    assert get_tar_member_size(10, name=name) > get_tar_member_size(10)
+    assert get_tar_member_size(10, name="a.json") == get_tar_member_size(10)
+
+
+def test_get_tar_size_matches_archive(tmp_path):
+    members = [(f"{idx}.json", b"x" * 700) for idx in range(30)]
+    dst = tmp_path / "shard.tar"
+    write_tar(str(dst), members)
+    members_size = sum(
+        get_tar_member_size(len(content), name=name)
+        for name, content in members
+    )
+
+    assert get_tar_size(members_size) == dst.stat().st_size